@@ -1,9 +1,10 @@
 """Expose API routers for the FastAPI application."""
-from . import chat, customization, events, itinerary, maps, storage, weather
+from . import chat, customization, destinations, events, itinerary, maps, storage, weather
 
 __all__ = [
     "chat",
     "customization",
+    "destinations",
     "events",
     "itinerary",
     "maps",
@@ -2,24 +2,132 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+import json
+import logging
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict
 
-from app.services.chat import chat_response
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+from app.services.chat import chat_response, chat_response_stream
+from app.services.chat_sessions import (
+    create_chat_session,
+    get_chat_session,
+    record_turn,
+    serialize_session,
+    session_context,
+    session_history,
+)
+
+LOGGER = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Chat"])
 
 
+@router.post("/chat/sessions", status_code=status.HTTP_201_CREATED)
+async def start_chat_session(payload: dict) -> dict:
+    """Start a server-side chat session bound to a saved itinerary."""
+
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="user_id is required.")
+    session_id = await create_chat_session(user_id, payload.get("itinerary_id"))
+    return {"session_id": session_id}
+
+
+@router.get("/chat/sessions/{session_id}")
+async def read_chat_session(session_id: str) -> dict:
+    """Return a chat session's running summary and recent turns."""
+
+    session = await get_chat_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat session not found.")
+    return jsonable_encoder(serialize_session(session))
+
+
+async def _chat_inputs(payload: dict) -> Dict[str, Any]:
+    """Resolve the context, summary and history for a chat request.
+
+    With a ``session_id`` the itinerary and earlier turns come from the server
+    so the client only sends the new message.
+    """
+
+    context = payload.get("context", {})
+    session_id = payload.get("session_id")
+    if not session_id:
+        return {"context": context, "summary": "", "history": [], "session": None}
+
+    session = await get_chat_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chat session not found.")
+    return {
+        "context": {**context, **await session_context(session)},
+        "summary": session.get("summary", ""),
+        "history": session_history(session),
+        "session": session,
+    }
+
+
 @router.post("/chat")
 async def chat(payload: dict) -> dict:
     """Send a message to the AI travel companion and receive a response."""
 
     message = payload.get("message", "")
-    context = payload.get("context", {})
+    inputs = await _chat_inputs(payload)
     try:
-        response = await chat_response(message, context)
+        response = await chat_response(
+            message, inputs["context"], summary=inputs["summary"], history=inputs["history"]
+        )
     except Exception as exc:  # pragma: no cover - defensive
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Unable to contact the travel companion at this time.",
         ) from exc
+    if inputs["session"] is not None:
+        await record_turn(inputs["session"]["_id"], message, response["message"])
     return response
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(payload: dict, request: Request) -> StreamingResponse:
+    """Stream the travel companion's reply as server-sent events.
+
+    Emits ``token`` events as text arrives and a final ``done`` event. When the
+    client disconnects the upstream OpenAI request is closed.
+    """
+
+    message = payload.get("message", "")
+    inputs = await _chat_inputs(payload)
+
+    async def _events() -> AsyncIterator[str]:
+        tokens = chat_response_stream(
+            message, inputs["context"], summary=inputs["summary"], history=inputs["history"]
+        )
+        reply = []
+        try:
+            async with aclosing(tokens):
+                async for token in tokens:
+                    if await request.is_disconnected():
+                        LOGGER.info("Chat client disconnected; cancelling upstream stream")
+                        return
+                    reply.append(token)
+                    yield _sse("token", {"token": token})
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.warning("Streaming chat reply failed: %s", exc)
+            yield _sse("error", {"detail": "Unable to contact the travel companion at this time."})
+            return
+        if inputs["session"] is not None:
+            await record_turn(inputs["session"]["_id"], message, "".join(reply))
+        yield _sse("done", {})
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
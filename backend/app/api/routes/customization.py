@@ -3,15 +3,15 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict
 
 from fastapi import APIRouter, HTTPException, status
+from fastapi.encoders import jsonable_encoder
 
 from app.models.itinerary import Itinerary
 from app.services.chat import itinerary_adjustment_prompt
-from app.services.events import fetch_events
+from app.services.context import gather_trip_context
 from app.services.openai_client import adjust_itinerary
-from app.services.weather import fetch_weather_forecast
+from app.services.storage import get_itinerary, update_itinerary
 
 LOGGER = logging.getLogger(__name__)
 
@@ -20,33 +20,50 @@ router = APIRouter(tags=["Customization"])
 
 @router.post("/customize-trip", response_model=Itinerary)
 async def customize_trip(payload: dict) -> Itinerary:
-    """Regenerate an itinerary based on user feedback and persona adjustments."""
+    """Regenerate an itinerary based on user feedback and persona adjustments.
+
+    Set ``mode`` to ``"patch"`` to apply only the model's activity changes. When
+    ``itinerary_id`` and ``user_id`` are given, the saved itinerary is loaded,
+    customized, and its updated plans are stored back.
+    """
 
     feedback = payload.get("feedback", "")
-    itinerary_payload = payload.get("itinerary", {})
+    mode = payload.get("mode", "full")
+    itinerary_id = payload.get("itinerary_id")
+    user_id = payload.get("user_id", "demo-user")
+    if itinerary_id:
+        itinerary_payload = await get_itinerary(user_id, itinerary_id)
+        if itinerary_payload is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found.")
+    else:
+        itinerary_payload = payload.get("itinerary", {})
     prompt = await itinerary_adjustment_prompt(feedback, itinerary_payload)
 
     destination = str(itinerary_payload.get("destination") or payload.get("destination", ""))
     start_date = str(itinerary_payload.get("start_date") or payload.get("start_date", ""))
     end_date = str(itinerary_payload.get("end_date") or payload.get("end_date", ""))
 
-    context: Dict[str, Any] = {"prompt": prompt}
-    try:
-        context["weather"] = await fetch_weather_forecast(destination, start_date, end_date)
-    except Exception as exc:  # pragma: no cover - defensive logging
-        LOGGER.warning("Weather lookup failed during customization: %s", exc)
-
-    try:
-        context["events"] = await fetch_events(destination, start_date, end_date)
-    except Exception as exc:  # pragma: no cover - defensive logging
-        LOGGER.warning("Event lookup failed during customization: %s", exc)
+    context = await gather_trip_context(destination, start_date, end_date)
+    context["prompt"] = prompt
 
     try:
-        itinerary_data = await adjust_itinerary(itinerary_payload, feedback, context=context)
+        itinerary_data = await adjust_itinerary(itinerary_payload, feedback, context=context, mode=mode)
     except Exception as exc:  # pragma: no cover - defensive
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Unable to customize itinerary at this time.",
         ) from exc
 
-    return Itinerary(**itinerary_data)
+    itinerary_data["timed_out_sources"] = context["timed_out_sources"]
+    itinerary = Itinerary(**itinerary_data)
+    if itinerary_id:
+        await update_itinerary(
+            user_id,
+            itinerary_id,
+            {
+                "summary": itinerary.summary,
+                "change_note": itinerary.change_note,
+                "daily_plans": jsonable_encoder(itinerary.daily_plans),
+            },
+        )
+    return itinerary
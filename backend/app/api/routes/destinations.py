@@ -0,0 +1,29 @@
+"""Routes for destination autocomplete."""
+from fastapi import APIRouter, Query
+
+from app.services.places import get_place_index
+
+router = APIRouter(tags=["Destinations"])
+
+
+@router.get("/destinations/suggest")
+async def suggest_destinations(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far"),
+    limit: int = Query(8, ge=1, le=20, description="Maximum suggestions"),
+) -> dict:
+    """Suggest known destinations whose name starts with the typed text, most popular first."""
+
+    places = get_place_index().suggest(q, limit)
+    return {
+        "suggestions": [
+            {
+                "id": place.id,
+                "name": place.name,
+                "country": place.country,
+                "country_code": place.country_code,
+                "label": place.label,
+                "coordinates": {"lat": place.lat, "lng": place.lon},
+            }
+            for place in places
+        ]
+    }
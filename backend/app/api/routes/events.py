@@ -2,6 +2,7 @@
 from fastapi import APIRouter, Query
 
 from app.services.events import fetch_events
+from app.services.warmer import record_destination
 
 router = APIRouter(tags=["Events"])
 
@@ -14,5 +15,6 @@ async def get_events(
 ) -> dict:
     """Fetch live events for the travel destination."""
 
+    record_destination(destination)
     events = await fetch_events(destination, start_date, end_date)
     return {"events": events}
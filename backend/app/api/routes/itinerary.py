@@ -2,46 +2,129 @@
 
 from __future__ import annotations
 
+import json
 import logging
-from typing import Any, Dict
+from typing import AsyncIterator
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pymongo.errors import PyMongoError
 
+from app.core.config import settings
 from app.models.itinerary import Itinerary
-from app.services.events import fetch_events
-from app.services.openai_client import generate_itinerary
-from app.services.weather import fetch_weather_forecast
+from app.services.context import gather_trip_context
+from app.services.generation import get_generation
+from app.services.itinerary_cache import generate_itinerary_cached
+from app.services.jobs import enqueue_itinerary_job, get_job, validate_callback_url
+from app.services.openai_client import stream_itinerary
+from app.services.warmer import record_destination
 
 LOGGER = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Itinerary"])
 
 
-@router.post("/plan-trip", response_model=Itinerary)
-async def plan_trip(payload: dict) -> Itinerary:
-    """Generate a new itinerary using OpenAI function calling with contextual data."""
+@router.post(
+    "/plan-trip",
+    response_model=Itinerary,
+    responses={status.HTTP_202_ACCEPTED: {"description": "Job queued when async=true"}},
+)
+async def plan_trip(
+    payload: dict,
+    run_async: bool = Query(False, alias="async", description="Queue generation as a background job"),
+) -> Itinerary | JSONResponse:
+    """Generate a new itinerary using OpenAI function calling with contextual data.
+
+    With ``async=true`` the request is queued and answered with a ``job_id`` to
+    poll at ``/jobs/{job_id}``; an optional HTTPS ``callback_url`` in the payload
+    is POSTed the result when the job finishes. Without MongoDB the itinerary is
+    generated synchronously instead.
+    """
     LOGGER.info("plan my trip")
+    record_destination(str(payload.get("destination", "")))
+    callback_url = payload.pop("callback_url", None)
+    if run_async and not settings.mongo_connection_string:
+        LOGGER.info("Job queue unavailable without MongoDB; generating synchronously")
+    elif run_async:
+        try:
+            if callback_url is not None:
+                callback_url = validate_callback_url(callback_url)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        try:
+            job_id = await enqueue_itinerary_job(payload, callback_url=callback_url)
+        except PyMongoError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Job queue is unavailable; retry without async.",
+            ) from exc
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"job_id": job_id, "status": "queued"},
+        )
+
     destination = str(payload.get("destination", ""))
     start_date = str(payload.get("start_date", ""))
     end_date = str(payload.get("end_date", ""))
 
-    context: Dict[str, Any] = {}
-    try:
-        context["weather"] = await fetch_weather_forecast(destination, start_date, end_date)
-    except Exception as exc:  # pragma: no cover - defensive logging
-        LOGGER.warning("Weather lookup failed: %s", exc)
-
-    try:
-        context["events"] = await fetch_events(destination, start_date, end_date)
-    except Exception as exc:  # pragma: no cover - defensive logging
-        LOGGER.warning("Event lookup failed: %s", exc)
+    context = await gather_trip_context(destination, start_date, end_date)
 
     try:
-        itinerary_data = await generate_itinerary(payload, context=context)
+        itinerary_data = await generate_itinerary_cached(payload, context=context)
     except Exception as exc:  # pragma: no cover - defensive
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail="Unable to generate itinerary at this time.",
         ) from exc
 
+    itinerary_data["timed_out_sources"] = context["timed_out_sources"]
     return Itinerary(**itinerary_data)
+
+
+@router.post("/plan-trip/stream")
+async def plan_trip_stream(payload: dict) -> StreamingResponse:
+    """Stream a new itinerary as NDJSON, emitting each day as soon as it is generated.
+
+    Lines carry ``{"type": "day"}`` for each validated day plan, then a final
+    ``{"type": "itinerary"}`` with the complete itinerary, or ``{"type": "error"}``.
+    """
+    destination = str(payload.get("destination", ""))
+    start_date = str(payload.get("start_date", ""))
+    end_date = str(payload.get("end_date", ""))
+    record_destination(destination)
+
+    context = await gather_trip_context(destination, start_date, end_date)
+
+    async def _lines() -> AsyncIterator[str]:
+        try:
+            async for kind, data in stream_itinerary(payload, context=context):
+                if kind == "itinerary":
+                    data["timed_out_sources"] = context["timed_out_sources"]
+                    data = Itinerary(**data)
+                yield json.dumps({"type": kind, "data": jsonable_encoder(data)}) + "\n"
+        except Exception as exc:  # pragma: no cover - defensive
+            LOGGER.warning("Streaming itinerary generation failed: %s", exc)
+            yield json.dumps({"type": "error", "detail": "Unable to generate itinerary at this time."}) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/plan-trip/{generation_id}")
+async def get_plan_generation(generation_id: str) -> dict:
+    """Poll a background generation started when /plan-trip returned a provisional itinerary."""
+
+    generation = await get_generation(generation_id)
+    if generation is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Generation not found.")
+    return generation
+
+
+@router.get("/jobs/{job_id}")
+async def get_plan_job(job_id: str) -> dict:
+    """Return the status of a queued itinerary job and its itinerary once complete."""
+
+    job = await get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return job
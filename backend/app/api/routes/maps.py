@@ -4,6 +4,7 @@ from typing import List
 from fastapi import APIRouter, Query
 
 from app.services.maps import fetch_map_points
+from app.services.warmer import record_destination
 
 router = APIRouter(tags=["Maps"])
 
@@ -12,8 +13,10 @@ router = APIRouter(tags=["Maps"])
 async def get_map_data(
     destination: str = Query(..., description="Destination name"),
     categories: List[str] | None = Query(None, description="Optional list of categories"),
+    limit: int | None = Query(None, ge=1, le=60, description="Maximum pins per category"),
 ) -> dict:
     """Fetch map pins for a destination."""
 
-    pins = await fetch_map_points(destination, categories)
+    record_destination(destination)
+    pins = await fetch_map_points(destination, categories, limit=limit)
     return {"pins": pins}
@@ -1,10 +1,26 @@
 """Routes for saving and retrieving itineraries."""
-from fastapi import APIRouter
+import json
+import re
+import secrets
+from datetime import datetime
+from typing import AsyncIterator
 
-from app.services.storage import list_itineraries, save_itinerary
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services.storage import (
+    bulk_save_itineraries,
+    get_itinerary,
+    iter_itineraries,
+    list_itinerary_page,
+    save_itinerary,
+)
 
 router = APIRouter(tags=["Storage"])
 
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
 
 @router.post("/save")
 async def save_trip(payload: dict) -> dict:
@@ -17,9 +33,100 @@ async def save_trip(payload: dict) -> dict:
     return {"itinerary_id": itinerary_id}
 
 
+@router.post("/save/bulk")
+async def save_trips_bulk(payload: dict) -> dict:
+    """Insert or upsert many itineraries in a single round trip.
+
+    Itineraries with a ``trip_id`` are upserted per user; the response lists a
+    status for each submitted itinerary in order.
+    """
+
+    itineraries = payload.get("itineraries", [])
+    if not isinstance(itineraries, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="itineraries must be a list.")
+    if len(itineraries) > settings.bulk_save_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_save_max_items} itineraries may be saved per request.",
+        )
+    user_id = payload.get("user_id", "demo-user")
+    for itinerary in itineraries:
+        if isinstance(itinerary, dict):
+            itinerary["user_id"] = user_id
+            itinerary.setdefault("daily_plans", [])
+    results = await bulk_save_itineraries(itineraries)
+    return {"results": results}
+
+
 @router.get("/trips/{user_id}")
-async def get_trips(user_id: str) -> dict:
-    """List saved itineraries for a user."""
+async def get_trips(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100, description="Maximum trips per page"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    full: bool = Query(False, description="Return full documents instead of summaries"),
+) -> dict:
+    """List a page of saved itineraries for a user, newest first."""
+
+    try:
+        return await list_itinerary_page(user_id, limit=limit, cursor=cursor, full=full)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/trips/{user_id}/{itinerary_id}")
+async def get_trip(user_id: str, itinerary_id: str) -> dict:
+    """Fetch a single saved itinerary with all daily plans."""
+
+    trip = await get_itinerary(user_id, itinerary_id)
+    if trip is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found.")
+    return {"trip": trip}
+
+
+def _safe_filename_part(value: str) -> str:
+    """Reduce ``value`` to characters that are safe inside a quoted header filename."""
+
+    return _UNSAFE_FILENAME_CHARS.sub("_", value).strip("._")[:64] or "user"
+
+
+def _ndjson_response(documents: AsyncIterator[dict], filename: str) -> StreamingResponse:
+    async def _lines() -> AsyncIterator[str]:
+        async for document in documents:
+            yield json.dumps(document, default=str) + "\n"
+
+    return StreamingResponse(
+        _lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/export/trips/{user_id}")
+async def export_user_trips(user_id: str) -> StreamingResponse:
+    """Stream every saved itinerary for a user as NDJSON."""
+
+    return _ndjson_response(iter_itineraries(user_id=user_id), f"trips-{_safe_filename_part(user_id)}.ndjson")
+
+
+def _require_export_token(authorization: str | None = Header(None)) -> None:
+    """Allow the all-users export only with the configured admin bearer token."""
+
+    if not settings.export_admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.export_admin_token}"
+    if authorization is None or not secrets.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Export token required.")
+
+
+@router.get("/export/trips", dependencies=[Depends(_require_export_token)])
+async def export_all_trips(
+    since: datetime | None = Query(None, description="Only trips created at or after this time"),
+    until: datetime | None = Query(None, description="Only trips created before this time"),
+) -> StreamingResponse:
+    """Stream saved itineraries for all users as NDJSON, optionally bounded by creation time.
+
+    Intended for nightly jobs: requires ``Authorization: Bearer <export_admin_token>``
+    and is not served at all while no token is configured.
+    """
 
-    trips = await list_itineraries(user_id)
-    return {"trips": trips}
+    return _ndjson_response(iter_itineraries(since=since, until=until), "trips.ndjson")
@@ -1,6 +1,7 @@
 """Routes for weather-aware itinerary planning."""
 from fastapi import APIRouter, Query
 
+from app.services.warmer import record_destination
 from app.services.weather import fetch_weather_forecast
 
 router = APIRouter(tags=["Weather"])
@@ -14,5 +15,6 @@ async def get_weather(
 ) -> dict:
     """Return a weather forecast for the travel dates."""
 
+    record_destination(destination)
     forecast = await fetch_weather_forecast(destination, start_date, end_date)
     return {"forecast": forecast}
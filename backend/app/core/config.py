@@ -1,5 +1,7 @@
 """Application configuration and settings management."""
 from functools import lru_cache
+from typing import List
+
 from pydantic import BaseSettings, Field
 
 
@@ -10,11 +12,187 @@ class Settings(BaseSettings):
     openai_api_key: str = Field(default="", description="OpenAI API key for GPT access")
     mongo_connection_string: str = Field(default="", description="MongoDB Atlas connection URI")
     mongo_database: str = Field(default="trip_planner", description="MongoDB database name")
+    mongo_max_pool_size: int = Field(default=100, description="Maximum MongoDB connections in the pool")
+    mongo_min_pool_size: int = Field(default=0, description="MongoDB connections kept open when idle")
+    mongo_max_idle_time_ms: int = Field(
+        default=300_000, description="Milliseconds before an idle MongoDB connection is closed"
+    )
+    mongo_server_selection_timeout_ms: int = Field(
+        default=5_000, description="Milliseconds to wait for a reachable MongoDB server"
+    )
+    export_batch_size: int = Field(default=500, description="MongoDB cursor batch size for NDJSON exports")
+    export_admin_token: str = Field(
+        default="", description="Bearer token required by the all-users export; empty disables that endpoint"
+    )
+    bulk_save_max_items: int = Field(default=500, description="Maximum itineraries accepted by /save/bulk")
     weather_api_key: str = Field(default="", description="OpenWeatherMap API key")
     events_api_key: str = Field(default="", description="Ticketmaster/Eventbrite API key")
     maps_api_key: str = Field(default="", description="Google Maps Places API key")
     rapidapi_key: str = Field(default="", description="RapidAPI key for Airbnb or other services")
 
+    http_max_connections: int = Field(default=100, description="Maximum pooled connections per provider")
+    http_max_keepalive_connections: int = Field(
+        default=20, description="Maximum idle keep-alive connections per provider"
+    )
+    http_keepalive_expiry_seconds: float = Field(
+        default=30.0, description="Seconds an idle keep-alive connection is retained"
+    )
+    http2_enabled: bool = Field(default=True, description="Use HTTP/2 when the 'h2' package is installed")
+    openai_timeout_seconds: float = Field(default=30.0, description="Timeout for OpenAI requests")
+    openai_max_retries: int = Field(default=3, description="Retries for throttled or failed OpenAI calls")
+    openai_backoff_base_seconds: float = Field(default=0.5, description="Base delay for OpenAI retry backoff")
+    openai_backoff_max_seconds: float = Field(default=8.0, description="Longest single OpenAI retry delay")
+    openai_requests_per_minute: int = Field(default=500, description="Client-side OpenAI request budget")
+    openai_tokens_per_minute: int = Field(default=200_000, description="Client-side OpenAI token budget")
+    openai_max_throttle_seconds: float = Field(
+        default=5.0, description="Longest single wait while throttling to the OpenAI budget"
+    )
+    openai_circuit_failure_threshold: int = Field(
+        default=5, description="Consecutive OpenAI failures that open the circuit breaker"
+    )
+    openai_circuit_reset_seconds: float = Field(
+        default=30.0, description="Seconds the OpenAI circuit stays open before a trial call"
+    )
+    weather_timeout_seconds: float = Field(default=20.0, description="Timeout for OpenWeatherMap requests")
+    events_timeout_seconds: float = Field(default=20.0, description="Timeout for Ticketmaster requests")
+    maps_timeout_seconds: float = Field(default=15.0, description="Timeout for Google Places requests")
+    webhooks_timeout_seconds: float = Field(default=10.0, description="Timeout for job completion callbacks")
+
+    weather_context_deadline_seconds: float = Field(
+        default=4.0, description="Deadline for weather context during itinerary generation"
+    )
+    events_context_deadline_seconds: float = Field(
+        default=4.0, description="Deadline for event context during itinerary generation"
+    )
+
+    places_index_enabled: bool = Field(
+        default=True, description="Resolve destinations against the bundled gazetteer"
+    )
+    places_fuzzy_cutoff: float = Field(
+        default=0.88, description="Minimum similarity for a fuzzy gazetteer match"
+    )
+
+    routing_enabled: bool = Field(
+        default=True, description="Reorder each day's activities to shorten travel between them"
+    )
+    routing_speed_kmh: float = Field(
+        default=20.0, description="Average door-to-door city travel speed used for travel times"
+    )
+    routing_detour_factor: float = Field(
+        default=1.3, description="Ratio of street distance to straight-line distance"
+    )
+    routing_max_iterations: int = Field(
+        default=200, description="Most 2-opt improvements applied to each run of reorderable activities"
+    )
+    routing_anchor_categories: List[str] = Field(
+        default_factory=lambda: ["Eat", "Stay"],
+        description="Activity categories kept at their planned time, like meals and check-ins",
+    )
+
+    geocode_cache_size: int = Field(default=1024, description="Maximum destinations kept in the geocode cache")
+    geocode_cache_ttl_seconds: float = Field(
+        default=30 * 24 * 3600, description="Lifetime of a cached destination coordinate"
+    )
+    geocode_negative_ttl_seconds: float = Field(
+        default=600.0, description="How long a destination the geocoder could not find is remembered"
+    )
+    geocode_cache_persist: bool = Field(
+        default=True, description="Share geocode results through MongoDB when it is configured"
+    )
+    forecast_cache_size: int = Field(default=512, description="Maximum locations kept in the forecast cache")
+    forecast_cache_coordinate_precision: int = Field(
+        default=2, description="Decimal places used to round coordinates for forecast cache keys"
+    )
+    forecast_cache_grace_seconds: float = Field(
+        default=600.0, description="Delay after each 3-hourly forecast issue before refreshing"
+    )
+
+    events_horizon_days: int = Field(default=60, description="Days ahead of today stored per city for events")
+    events_page_size: int = Field(default=200, description="Ticketmaster results per page when prefetching")
+    events_max_pages: int = Field(default=5, description="Ticketmaster pages fetched per city horizon")
+    events_max_results: int = Field(default=50, description="Events returned for a single travel window")
+    events_refresh_seconds: float = Field(
+        default=3 * 3600, description="Age after which a city's stored events are refreshed in the background"
+    )
+    events_store_ttl_seconds: float = Field(
+        default=24 * 3600, description="Lifetime of a city's stored events in MongoDB"
+    )
+    events_cache_size: int = Field(default=256, description="Maximum cities kept in the in-process event cache")
+
+    maps_max_concurrency: int = Field(default=4, description="Concurrent Places searches per map request")
+    maps_results_per_category: int = Field(default=3, description="Default map pins returned per category")
+    maps_cache_size: int = Field(default=512, description="Maximum destinations kept in the map-pin cache")
+    maps_cache_ttl_seconds: float = Field(default=24 * 3600, description="Lifetime of cached map pins")
+    maps_page_token_delay_seconds: float = Field(
+        default=2.0, description="Wait before requesting a Places next_page_token"
+    )
+
+    warmer_enabled: bool = Field(default=True, description="Refresh upstream caches for popular destinations")
+    warmer_interval_seconds: float = Field(default=900.0, description="Delay between cache warmer runs")
+    warmer_top_destinations: int = Field(default=20, description="Destinations refreshed on each warmer run")
+    warmer_max_concurrency: int = Field(default=2, description="Concurrent refreshes during a warmer run")
+    warmer_refreshes_per_minute: float = Field(
+        default=30.0, description="Upper bound on refreshes the warmer starts per minute; 0 disables"
+    )
+    warmer_popularity_decay: float = Field(
+        default=0.5, description="Factor applied to destination request counts after each warmer run"
+    )
+    warmer_max_tracked_destinations: int = Field(
+        default=1000, description="Most destinations tracked; the least requested are evicted first"
+    )
+    warmer_seed_destinations: List[str] = Field(
+        default_factory=list, description="Destinations always warmed regardless of traffic"
+    )
+
+    prompt_max_context_tokens: int = Field(
+        default=3000, description="Estimated token budget for the context sent with each OpenAI call"
+    )
+    prompt_max_events: int = Field(default=10, description="Events included in a prompt after date filtering")
+    prompt_description_max_chars: int = Field(
+        default=200, description="Longest event or activity description sent to the model"
+    )
+
+    chat_history_window: int = Field(default=10, description="Recent chat messages sent to the model verbatim")
+    chat_summary_batch: int = Field(
+        default=10, description="Messages allowed beyond the window before older ones are summarized"
+    )
+    chat_summary_max_chars: int = Field(default=1500, description="Longest running conversation summary")
+    chat_session_ttl_seconds: float = Field(
+        default=30 * 24 * 3600, description="Idle time after which a chat session expires"
+    )
+
+    itinerary_cache_enabled: bool = Field(default=True, description="Reuse generated itineraries from MongoDB")
+    itinerary_cache_ttl_seconds: float = Field(
+        default=7 * 24 * 3600, description="Lifetime of a cached itinerary template"
+    )
+    itinerary_cache_redate: bool = Field(
+        default=True, description="Re-date cached templates onto new trip dates instead of regenerating"
+    )
+    itinerary_chunk_threshold_days: int = Field(
+        default=10, description="Trip length at which itineraries are generated in parallel chunks"
+    )
+    itinerary_chunk_days: int = Field(default=4, description="Days covered by each parallel generation chunk")
+    itinerary_latency_slo_seconds: float = Field(
+        default=12.0, description="Return a provisional itinerary when generation exceeds this; 0 disables"
+    )
+    itinerary_hedge_delay_seconds: float = Field(
+        default=0.0, description="Send a hedged second generation request after this delay; 0 disables"
+    )
+
+    job_workers: int = Field(default=4, description="Concurrent background itinerary jobs; 0 disables workers")
+    job_lease_seconds: float = Field(
+        default=300.0, description="Seconds before a running job is considered abandoned and reclaimed"
+    )
+    job_max_attempts: int = Field(default=3, description="Attempts before an itinerary job is marked failed")
+    job_poll_interval_seconds: float = Field(default=5.0, description="Idle worker poll interval for new jobs")
+    job_retention_seconds: float = Field(
+        default=7 * 24 * 3600, description="Lifetime of a finished itinerary job before MongoDB removes it"
+    )
+    job_callback_allowed_hosts: List[str] = Field(
+        default_factory=list,
+        description="Hosts job callbacks may be sent to; empty allows any public HTTPS host",
+    )
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
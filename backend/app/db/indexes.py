@@ -0,0 +1,62 @@
+"""MongoDB index bootstrap run at application startup."""
+import asyncio
+import logging
+from typing import Any, Dict, List, Tuple
+
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.session import get_mongo_client
+
+LOGGER = logging.getLogger(__name__)
+
+IndexSpec = Tuple[str, List[Tuple[str, int]], Dict[str, Any]]
+
+INDEXES: List[IndexSpec] = [
+    ("itineraries", [("user_id", ASCENDING), ("_id", DESCENDING)], {}),
+    ("itineraries", [("created_at", ASCENDING)], {}),
+    (
+        "itineraries",
+        [("user_id", ASCENDING), ("trip_id", ASCENDING)],
+        {"unique": True, "partialFilterExpression": {"trip_id": {"$exists": True}}},
+    ),
+    ("itinerary_cache", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ("itinerary_generations", [("created_at", ASCENDING)], {"expireAfterSeconds": 24 * 3600}),
+    ("city_events", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    (
+        "geocodes",
+        [("updated_at", ASCENDING)],
+        {"expireAfterSeconds": int(settings.geocode_cache_ttl_seconds)},
+    ),
+    ("itinerary_jobs", [("status", ASCENDING), ("created_at", ASCENDING)], {}),
+    (
+        "itinerary_jobs",
+        [("finished_at", ASCENDING)],
+        {"expireAfterSeconds": int(settings.job_retention_seconds)},
+    ),
+    (
+        "chat_sessions",
+        [("updated_at", ASCENDING)],
+        {"expireAfterSeconds": int(settings.chat_session_ttl_seconds)},
+    ),
+]
+
+
+async def _ensure_index(
+    database: Any, collection: str, keys: List[Tuple[str, int]], options: Dict[str, Any]
+) -> None:
+    try:
+        await database[collection].create_index(keys, **options)
+    except PyMongoError as exc:
+        LOGGER.warning("Failed to ensure index %s on %s: %s", keys, collection, exc)
+
+
+async def ensure_indexes() -> None:
+    """Create any missing indexes concurrently; failures are logged so startup can proceed.
+
+    Running them together bounds startup by one server-selection timeout when
+    MongoDB is unreachable.
+    """
+    database = get_mongo_client()[settings.mongo_database]
+    await asyncio.gather(*(_ensure_index(database, *spec) for spec in INDEXES))
@@ -3,7 +3,26 @@ from motor.motor_asyncio import AsyncIOMotorClient
 
 from app.core.config import settings
 
+_client: AsyncIOMotorClient | None = None
+
 
 def get_mongo_client() -> AsyncIOMotorClient:
-    """Create and return a MongoDB client instance."""
-    return AsyncIOMotorClient(settings.mongo_connection_string)
+    """Return the process-wide MongoDB client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(
+            settings.mongo_connection_string,
+            maxPoolSize=settings.mongo_max_pool_size,
+            minPoolSize=settings.mongo_min_pool_size,
+            maxIdleTimeMS=settings.mongo_max_idle_time_ms,
+            serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+        )
+    return _client
+
+
+def close_mongo_client() -> None:
+    """Close the shared MongoDB client and its connection pool."""
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
@@ -1,11 +1,47 @@
 """FastAPI application entry point for the AI Trip Planner backend."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
-from app.api.routes import itinerary, customization, events, weather, chat, maps, storage
+from app.api.routes import itinerary, customization, events, weather, chat, maps, storage, destinations
 from app.core.config import settings
+from app.db.indexes import ensure_indexes
+from app.db.session import close_mongo_client, get_mongo_client
+from app.services.cache import cache_stats
+from app.services.generation import shutdown_generations
+from app.services.http import http_clients
+from app.services.jobs import worker_pool
+from app.services.prompt import load_encoding, prompt_stats
+from app.services.resilience import resilience_stats
+from app.services.singleflight import singleflight_stats
+from app.services.warmer import cache_warmer
 from fastapi.middleware.cors import CORSMiddleware
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Open shared resources on startup and release them on shutdown."""
+    await http_clients.startup()
+    tokenizer = asyncio.create_task(load_encoding())
+    if settings.mongo_connection_string:
+        get_mongo_client()
+        await ensure_indexes()
+        if settings.job_workers > 0:
+            worker_pool.start(settings.job_workers)
+    if settings.warmer_enabled:
+        cache_warmer.start()
+    try:
+        yield
+    finally:
+        tokenizer.cancel()
+        await cache_warmer.stop()
+        await worker_pool.stop()
+        await shutdown_generations()
+        await http_clients.aclose()
+        close_mongo_client()
+
 
 def create_application() -> FastAPI:
     """Create and configure the FastAPI application instance."""
@@ -13,6 +49,7 @@ def create_application() -> FastAPI:
         title="AI Trip Planner",
         description="Backend services for the AI-powered trip planning experience.",
         version="0.1.0",
+        lifespan=lifespan,
     )
     application.add_middleware(
         CORSMiddleware,
@@ -31,6 +68,7 @@ def create_application() -> FastAPI:
     application.include_router(chat.router, prefix="/api")
     application.include_router(maps.router, prefix="/api")
     application.include_router(storage.router, prefix="/api")
+    application.include_router(destinations.router, prefix="/api")
 
     return application
 
@@ -43,3 +81,15 @@ app = create_application()
 async def health_check() -> dict[str, str]:
     """Simple health check endpoint to verify the service is running."""
     return {"status": "ok", "environment": settings.environment}
+
+
+@app.get("/metrics", tags=["Health"])
+async def metrics() -> dict:
+    """Expose in-process cache, coalescing, OpenAI, prompt size and cache warmer counters."""
+    return {
+        "caches": cache_stats(),
+        "coalescing": singleflight_stats(),
+        "openai": resilience_stats(),
+        "prompts": prompt_stats(),
+        "warmer": cache_warmer.stats(),
+    }
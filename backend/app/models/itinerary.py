@@ -1,6 +1,6 @@
 """Pydantic models representing itinerary data structures."""
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -14,6 +14,7 @@ class Activity(BaseModel):
     start_time: Optional[str] = Field(None, description="Planned start time")
     end_time: Optional[str] = Field(None, description="Planned end time")
     weather_advice: Optional[str] = Field(None, description="Guidance based on forecast")
+    coordinates: Optional[Dict[str, float]] = Field(None, description="Latitude and longitude as lat/lng")
 
 
 class DayPlan(BaseModel):
@@ -22,6 +23,9 @@ class DayPlan(BaseModel):
     date: date
     theme: Optional[str] = Field(None, description="Summary theme for the day")
     activities: List[Activity] = Field(default_factory=list)
+    travel_minutes: Optional[float] = Field(
+        None, description="Estimated travel time between the day's activities in visiting order"
+    )
 
 
 class Itinerary(BaseModel):
@@ -33,3 +37,10 @@ class Itinerary(BaseModel):
     persona: str
     summary: str
     daily_plans: List[DayPlan]
+    timed_out_sources: List[str] = Field(
+        default_factory=list, description="Context sources that missed their deadline"
+    )
+    provisional: bool = Field(False, description="Whether this is a placeholder pending full generation")
+    fallback: bool = Field(False, description="Whether any part of the plan is the offline template")
+    generation_id: Optional[str] = Field(None, description="Background generation to poll for the final plan")
+    change_note: Optional[str] = Field(None, description="The most recent customization applied to the plan")
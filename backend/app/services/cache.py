@@ -0,0 +1,103 @@
+"""In-process caching primitives shared by the integration services."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Tuple, TypeVar
+
+from app.services.places import resolve_place
+
+V = TypeVar("V")
+
+CACHE_REGISTRY: Dict[str, "TTLCache[Any]"] = {}
+
+
+class TTLCache(Generic[V]):
+    """A size-bounded LRU cache whose entries also expire after a time-to-live.
+
+    Entries may carry their own expiry via ``set(..., expires_at=...)`` for
+    data whose freshness follows an external schedule.
+    """
+
+    def __init__(self, name: str, *, maxsize: int, ttl: float) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        CACHE_REGISTRY[name] = self
+
+    def get(self, key: Hashable) -> V | None:
+        """Return the cached value for ``key`` or ``None`` when absent or expired."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V, *, expires_at: float | None = None) -> None:
+        """Store ``value`` and evict the least recently used entries beyond ``maxsize``."""
+
+        if expires_at is None:
+            expires_at = time.time() + self.ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def expires_in(self, key: Hashable) -> float | None:
+        """Return seconds until ``key`` expires, or ``None`` if absent, without counting a lookup."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        remaining = entry[0] - time.time()
+        return remaining if remaining > 0 else None
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and occupancy for monitoring."""
+
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def normalize_destination(destination: str) -> str:
+    """Return a lookup key for a destination that ignores case and incidental whitespace.
+
+    Destinations in the gazetteer share their canonical place id, so spellings
+    such as ``"paris"`` and ``"Paris, FR"`` hit the same cache entries.
+    """
+
+    place = resolve_place(destination)
+    if place is not None:
+        return place.id
+    parts = (" ".join(part.split()) for part in destination.casefold().split(","))
+    return ",".join(part for part in parts if part)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return statistics for every registered cache."""
+
+    return {name: cache.stats() for name, cache in CACHE_REGISTRY.items()}
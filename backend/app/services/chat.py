@@ -2,18 +2,36 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Sequence
 
-from app.services.openai_client import build_itinerary_prompt, generate_chat_reply
+from app.services.openai_client import build_itinerary_prompt, generate_chat_reply, stream_chat_reply
 
 
-async def chat_response(message: str, context: Dict[str, Any] | None = None) -> Dict[str, Any]:
+async def chat_response(
+    message: str,
+    context: Dict[str, Any] | None = None,
+    *,
+    summary: str = "",
+    history: Sequence[Dict[str, str]] = (),
+) -> Dict[str, Any]:
     """Return a chat response powered by OpenAI or deterministic fallback."""
 
-    reply = await generate_chat_reply(message, context=context)
+    reply = await generate_chat_reply(message, context=context, summary=summary, history=history)
     return {"message": reply}
 
 
+def chat_response_stream(
+    message: str,
+    context: Dict[str, Any] | None = None,
+    *,
+    summary: str = "",
+    history: Sequence[Dict[str, str]] = (),
+) -> AsyncIterator[str]:
+    """Return an async iterator of chat reply tokens."""
+
+    return stream_chat_reply(message, context=context, summary=summary, history=history)
+
+
 async def itinerary_adjustment_prompt(feedback: str, payload: Dict[str, Any]) -> str:
     """Generate a customization prompt using existing itinerary data and user feedback."""
 
@@ -0,0 +1,130 @@
+"""Server-side chat sessions with a rolling window of turns and a running summary."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Set
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.session import get_mongo_client
+from app.services.openai_client import summarize_conversation
+from app.services.storage import get_itinerary
+
+LOGGER = logging.getLogger(__name__)
+CHAT_SESSIONS_COLLECTION = "chat_sessions"
+
+_background_tasks: Set[asyncio.Task[None]] = set()
+
+
+def _sessions_collection():
+    return get_mongo_client()[settings.mongo_database][CHAT_SESSIONS_COLLECTION]
+
+
+async def create_chat_session(user_id: str, itinerary_id: str | None = None) -> str:
+    """Start a chat session, optionally bound to a saved itinerary."""
+
+    now = datetime.utcnow()
+    result = await _sessions_collection().insert_one(
+        {
+            "user_id": user_id,
+            "itinerary_id": itinerary_id,
+            "summary": "",
+            "summary_version": 0,
+            "turns": [],
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    return str(result.inserted_id)
+
+
+async def get_chat_session(session_id: str) -> Dict[str, Any] | None:
+    """Return a stored chat session, or ``None`` if it does not exist."""
+
+    if not ObjectId.is_valid(session_id):
+        return None
+    return await _sessions_collection().find_one({"_id": ObjectId(session_id)})
+
+
+async def session_context(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Load the saved itinerary a session refers to as chat context."""
+
+    if not session.get("itinerary_id"):
+        return {}
+    itinerary = await get_itinerary(session["user_id"], session["itinerary_id"])
+    return {"itinerary": itinerary} if itinerary else {}
+
+
+def session_history(session: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Return the recent turns of a session as chat messages."""
+
+    limit = settings.chat_history_window + settings.chat_summary_batch
+    return [{"role": turn["role"], "content": turn["content"]} for turn in session.get("turns", [])[-limit:]]
+
+
+def serialize_session(session: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a session into a JSON-friendly view."""
+
+    return {
+        "session_id": str(session["_id"]),
+        "user_id": session.get("user_id"),
+        "itinerary_id": session.get("itinerary_id"),
+        "summary": session.get("summary", ""),
+        "turns": [
+            {"role": turn["role"], "content": turn["content"], "at": turn.get("at")}
+            for turn in session.get("turns", [])
+        ],
+        "updated_at": session.get("updated_at"),
+    }
+
+
+async def record_turn(session_id: ObjectId, message: str, reply: str) -> None:
+    """Append a user message and its reply, compressing older turns when the window overflows."""
+
+    now = datetime.utcnow()
+    turns = [
+        {"id": ObjectId(), "role": "user", "content": message, "at": now},
+        {"id": ObjectId(), "role": "assistant", "content": reply, "at": now},
+    ]
+    try:
+        session = await _sessions_collection().find_one_and_update(
+            {"_id": session_id},
+            {"$push": {"turns": {"$each": turns}}, "$set": {"updated_at": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+    except PyMongoError as exc:
+        LOGGER.warning("Failed to record chat turn for session %s: %s", session_id, exc)
+        return
+
+    if session and len(session["turns"]) > settings.chat_history_window + settings.chat_summary_batch:
+        task = asyncio.create_task(_compress_session(session))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+async def _compress_session(session: Dict[str, Any]) -> None:
+    """Fold all but the most recent ``chat_history_window`` turns into the summary."""
+
+    older = session["turns"][: -settings.chat_history_window or None]
+    if not older:
+        return
+    messages = [{"role": turn["role"], "content": turn["content"]} for turn in older]
+    summary = await summarize_conversation(session.get("summary", ""), messages)
+    try:
+        # The version check lets a concurrent compression of the same turns win cleanly.
+        await _sessions_collection().update_one(
+            {"_id": session["_id"], "summary_version": session.get("summary_version", 0)},
+            {
+                "$set": {"summary": summary},
+                "$inc": {"summary_version": 1},
+                "$pull": {"turns": {"id": {"$in": [turn["id"] for turn in older]}}},
+            },
+        )
+    except PyMongoError as exc:
+        LOGGER.warning("Failed to store chat summary for session %s: %s", session["_id"], exc)
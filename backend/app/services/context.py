@@ -0,0 +1,74 @@
+"""Concurrent assembly of contextual data used for itinerary generation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from app.core.config import settings
+from app.services.events import fetch_events
+from app.services.weather import fetch_weather_forecast
+
+LOGGER = logging.getLogger(__name__)
+
+ContextProvider = Callable[[str, str, str], Awaitable[Any]]
+
+CONTEXT_PROVIDERS: Dict[str, ContextProvider] = {
+    "weather": fetch_weather_forecast,
+    "events": fetch_events,
+}
+
+
+async def _run_provider(
+    name: str,
+    destination: str,
+    start_date: str,
+    end_date: str,
+) -> Tuple[str, Any, bool]:
+    """Run a single provider under its deadline, returning ``(name, value, timed_out)``."""
+
+    provider = CONTEXT_PROVIDERS[name]
+    deadline = float(getattr(settings, f"{name}_context_deadline_seconds"))
+    try:
+        value = await asyncio.wait_for(provider(destination, start_date, end_date), timeout=deadline)
+    except asyncio.TimeoutError:
+        LOGGER.warning("%s lookup exceeded its %.1fs deadline", name.capitalize(), deadline)
+        return name, None, True
+    except Exception as exc:  # pragma: no cover - defensive logging
+        LOGGER.warning("%s lookup failed: %s", name.capitalize(), exc)
+        return name, None, False
+    return name, value, False
+
+
+async def gather_trip_context(
+    destination: str,
+    start_date: str,
+    end_date: str,
+    *,
+    sources: Iterable[str] | None = None,
+) -> Dict[str, Any]:
+    """Fetch all requested context sources concurrently and return whatever arrived in time.
+
+    The returned mapping contains one key per source that produced data plus
+    ``timed_out_sources`` listing the providers that missed their deadline.
+    """
+
+    names = list(sources) if sources is not None else list(CONTEXT_PROVIDERS)
+    unknown = [name for name in names if name not in CONTEXT_PROVIDERS]
+    if unknown:
+        raise ValueError(f"Unknown context source(s): {', '.join(unknown)}")
+
+    results = await asyncio.gather(
+        *(_run_provider(name, destination, start_date, end_date) for name in names)
+    )
+
+    context: Dict[str, Any] = {}
+    timed_out: List[str] = []
+    for name, value, did_time_out in results:
+        if did_time_out:
+            timed_out.append(name)
+        elif value is not None:
+            context[name] = value
+    context["timed_out_sources"] = timed_out
+    return context
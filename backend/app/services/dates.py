@@ -0,0 +1,23 @@
+"""Date parsing helpers shared by the itinerary services."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Any
+
+
+def coerce_date(value: Any, *, default: date | None = None) -> date:
+    """Convert a string/date input into a ``date`` instance."""
+
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "")).date()
+        except ValueError:
+            pass
+    if default is not None:
+        return default
+    return datetime.utcnow().date()
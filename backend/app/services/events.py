@@ -2,16 +2,36 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime
-from typing import Any, Dict, List
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Set, Tuple
 
 import httpx
+from pymongo.errors import PyMongoError
 
 from app.core.config import settings
+from app.db.session import get_mongo_client
+from app.services.cache import TTLCache, normalize_destination
+from app.services.http import get_http_client
+from app.services.places import resolve_place
+from app.services.singleflight import SingleFlight
 
 LOGGER = logging.getLogger(__name__)
 TICKETMASTER_URL = "https://app.ticketmaster.com/discovery/v2/events.json"
+# Ticketmaster refuses to page beyond the 1000th result of a query.
+TICKETMASTER_MAX_RESULTS = 1000
+EVENTS_COLLECTION = "city_events"
+
+events_flight = SingleFlight("events")
+city_events_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    "events",
+    maxsize=settings.events_cache_size,
+    ttl=settings.events_refresh_seconds,
+)
+
+_background_tasks: Set[asyncio.Task[Any]] = set()
 
 
 def _format_ticketmaster_date(value: str, *, end: bool = False) -> str:
@@ -28,20 +48,138 @@ def _format_ticketmaster_date(value: str, *, end: bool = False) -> str:
     return parsed.strftime(f"%Y-%m-%dT{time_part}Z")
 
 
-async def fetch_events(destination: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-    """Fetch live events for the travel window using the Ticketmaster Discovery API."""
+def _parse_day(value: str) -> date | None:
+    try:
+        return datetime.fromisoformat(value).date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _city_for(destination: str) -> str:
+    """Return the canonical label for known places, else the text before the first comma."""
+
+    place = resolve_place(destination)
+    if place is not None:
+        return place.label
+    return destination.split(",")[0].strip() if destination else destination
+
+
+def _location_params(city: str) -> Dict[str, str]:
+    place = resolve_place(city)
+    if place is None:
+        return {"city": city}
+    return {"city": place.name, "countryCode": place.country_code}
+
+
+async def fetch_events(
+    destination: str,
+    start_date: str,
+    end_date: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> List[Dict[str, Any]]:
+    """Fetch live events for the travel window using the Ticketmaster Discovery API.
+
+    Windows inside the rolling ``events_horizon_days`` horizon are sliced from
+    the city's stored event list; other windows are queried directly.
+    """
 
     if not settings.events_api_key:
         return []
 
-    city = destination.split(",")[0].strip() if destination else destination
+    city = _city_for(destination)
+    start, end = _parse_day(start_date), _parse_day(end_date)
+    today = datetime.utcnow().date()
+    if (
+        city
+        and start is not None
+        and end is not None
+        and today <= start <= end <= today + timedelta(days=settings.events_horizon_days)
+    ):
+        stored = await _city_events(city, client=client)
+        if stored is not None and end.isoformat() <= stored["horizon_end"]:
+            return _slice_events(stored["events"], start, end)
+
+    key = (normalize_destination(city), start_date, end_date)
+    return await events_flight.do(key, lambda: _fetch_events(city, start_date, end_date, client=client))
+
+
+def _slice_events(events: Iterable[Dict[str, Any]], start: date, end: date) -> List[Dict[str, Any]]:
+    """Return up to ``events_max_results`` events starting within ``start``..``end``."""
+
+    first, last = start.isoformat(), end.isoformat()
+    sliced = [event for event in events if first <= str(event.get("start_time") or "")[:10] <= last]
+    return sliced[: settings.events_max_results]
+
+
+def _venue_coordinates(venue: Dict[str, Any]) -> Dict[str, float] | None:
+    location = venue.get("location") or {}
+    try:
+        return {"lat": float(location["latitude"]), "lng": float(location["longitude"])}
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _normalize_event(item: Dict[str, Any]) -> Dict[str, Any]:
+    dates = item.get("dates", {}).get("start", {})
+    venues = item.get("_embedded", {}).get("venues", [])
+    venue = venues[0] if venues else {}
+    return {
+        "title": item.get("name"),
+        "description": item.get("info") or item.get("pleaseNote"),
+        "venue": venue.get("name"),
+        "address": venue.get("address", {}).get("line1"),
+        "coordinates": _venue_coordinates(venue),
+        "start_time": dates.get("dateTime") or dates.get("localDate"),
+        "url": item.get("url"),
+    }
+
+
+async def _query_ticketmaster(
+    client: httpx.AsyncClient,
+    params: Dict[str, Any],
+    *,
+    max_pages: int,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Return normalized events from up to ``max_pages`` result pages and whether none were left out.
+
+    The first page reports the page count; the remaining pages are fetched
+    concurrently and concatenated in order.
+    """
+
+    page_size = int(params["size"])
+    max_pages = min(max_pages, TICKETMASTER_MAX_RESULTS // page_size)
+
+    async def _page(number: int) -> Dict[str, Any]:
+        response = await client.get(TICKETMASTER_URL, params={**params, "page": number})
+        response.raise_for_status()
+        return response.json()
+
+    first = await _page(0)
+    total_pages = int(first.get("page", {}).get("totalPages") or 1)
+    rest = await asyncio.gather(*(_page(number) for number in range(1, min(total_pages, max_pages))))
+
+    events: List[Dict[str, Any]] = []
+    for payload in (first, *rest):
+        events.extend(_normalize_event(item) for item in payload.get("_embedded", {}).get("events", []))
+    return events, total_pages <= max_pages
+
+
+async def _fetch_events(
+    city: str,
+    start_date: str,
+    end_date: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> List[Dict[str, Any]]:
+    """Query Ticketmaster for a city's events in one date window."""
 
     params = {
         "apikey": settings.events_api_key,
         "locale": "*",
         "sort": "date,asc",
-        "size": 25,
-        "city": city,
+        "size": settings.events_max_results,
+        **_location_params(city),
         "startDateTime": _format_ticketmaster_date(start_date, end=False),
         "endDateTime": _format_ticketmaster_date(end_date, end=True),
     }
@@ -51,31 +189,154 @@ async def fetch_events(destination: str, start_date: str, end_date: str) -> List
     if not params["endDateTime"]:
         params.pop("endDateTime")
 
-    async with httpx.AsyncClient(timeout=httpx.Timeout(20.0)) as client:
+    client = client or get_http_client("events")
+    try:
+        events, _ = await _query_ticketmaster(client, params, max_pages=1)
+        return events
+    except httpx.HTTPError as exc:
+        LOGGER.warning("Event lookup failed: %s", exc)
+        return []
+
+
+def _covered_through(events: List[Dict[str, Any]], today: date) -> date:
+    """Return the last day fully covered by date-sorted ``events`` cut off at the page cap.
+
+    Later pages may hold more events on the last returned event's date, so the
+    horizon stops the day before it.
+    """
+
+    last = _parse_day(str(events[-1].get("start_time") or "")[:10]) if events else None
+    if last is None:
+        return today - timedelta(days=1)
+    return max(last - timedelta(days=1), today - timedelta(days=1))
+
+
+def _events_store_enabled() -> bool:
+    return bool(settings.mongo_connection_string)
+
+
+async def _load_city_events(key: str) -> Dict[str, Any] | None:
+    if not _events_store_enabled():
+        return None
+    collection = get_mongo_client()[settings.mongo_database][EVENTS_COLLECTION]
+    try:
+        return await collection.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+    except PyMongoError as exc:
+        LOGGER.warning("Event store lookup failed for %s: %s", key, exc)
+        return None
+
+
+async def _store_city_events(key: str, document: Dict[str, Any]) -> None:
+    if not _events_store_enabled():
+        return
+    collection = get_mongo_client()[settings.mongo_database][EVENTS_COLLECTION]
+    try:
+        await collection.replace_one({"_id": key}, document, upsert=True)
+    except PyMongoError as exc:
+        LOGGER.warning("Event store write failed for %s: %s", key, exc)
+
+
+async def refresh_city_events(city: str, *, client: httpx.AsyncClient | None = None) -> Dict[str, Any]:
+    """Fetch every event in the rolling horizon for ``city`` and store it."""
+
+    key = normalize_destination(city)
+
+    async def _refresh() -> Dict[str, Any]:
+        now = datetime.utcnow()
+        horizon_end = now.date() + timedelta(days=settings.events_horizon_days)
+        params = {
+            "apikey": settings.events_api_key,
+            "locale": "*",
+            "sort": "date,asc",
+            "size": settings.events_page_size,
+            **_location_params(city),
+            "startDateTime": _format_ticketmaster_date(now.date().isoformat()),
+            "endDateTime": _format_ticketmaster_date(horizon_end.isoformat(), end=True),
+        }
+        events, complete = await _query_ticketmaster(
+            client or get_http_client("events"), params, max_pages=settings.events_max_pages
+        )
+        if not complete:
+            horizon_end = _covered_through(events, now.date())
+            LOGGER.info("Event page cap reached for %s; horizon shortened to %s", city, horizon_end)
+        document = {
+            "_id": key,
+            "city": city,
+            "events": events,
+            "horizon_end": horizon_end.isoformat(),
+            "fetched_at": now,
+            "expires_at": now + timedelta(seconds=settings.events_store_ttl_seconds),
+        }
+        await _store_city_events(key, document)
+        _cache_city_events(key, document)
+        LOGGER.info("Stored %s events for %s through %s", len(events), city, horizon_end)
+        return document
+
+    return await events_flight.do(("horizon", key), _refresh)
+
+
+def _refresh_in_background(city: str) -> None:
+    async def _run() -> None:
         try:
-            response = await client.get(TICKETMASTER_URL, params=params)
-            response.raise_for_status()
+            await refresh_city_events(city)
         except httpx.HTTPError as exc:
-            LOGGER.warning("Event lookup failed: %s", exc)
-            return []
+            LOGGER.warning("Background event refresh for %s failed: %s", city, exc)
 
-    payload = response.json()
-    events_raw = payload.get("_embedded", {}).get("events", [])
+    task = asyncio.create_task(_run())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
-    events: List[Dict[str, Any]] = []
-    for item in events_raw:
-        dates = item.get("dates", {}).get("start", {})
-        venues = item.get("_embedded", {}).get("venues", [])
-        venue = venues[0] if venues else {}
-        events.append(
-            {
-                "title": item.get("name"),
-                "description": item.get("info") or item.get("pleaseNote"),
-                "venue": venue.get("name"),
-                "address": venue.get("address", {}).get("line1"),
-                "start_time": dates.get("dateTime") or dates.get("localDate"),
-                "url": item.get("url"),
-            }
-        )
 
-    return events
+def _cache_city_events(key: str, document: Dict[str, Any]) -> None:
+    """Cache a stored horizon in process until it is due for a refresh."""
+
+    age = (datetime.utcnow() - document["fetched_at"]).total_seconds()
+    if age < settings.events_refresh_seconds:
+        city_events_cache.set(key, document, expires_at=time.time() + settings.events_refresh_seconds - age)
+
+
+async def _city_events(city: str, *, client: httpx.AsyncClient | None = None) -> Dict[str, Any] | None:
+    """Return the stored horizon for ``city``, refreshing it when missing or stale.
+
+    Stale documents are served immediately while a background refresh runs.
+    """
+
+    key = normalize_destination(city)
+    document = city_events_cache.get(key)
+    if document is not None:
+        return document
+
+    document = await _load_city_events(key)
+    if document is None:
+        try:
+            return await refresh_city_events(city, client=client)
+        except httpx.HTTPError as exc:
+            LOGGER.warning("Event horizon fetch for %s failed: %s", city, exc)
+            return None
+
+    _cache_city_events(key, document)
+    if city_events_cache.expires_in(key) is None:
+        _refresh_in_background(city)
+    return document
+
+
+async def warm_city_events(destination: str, *, within: float) -> bool:
+    """Refresh the event horizon for ``destination`` unless it stays fresh beyond ``within`` seconds.
+
+    Returns whether an upstream fetch was made.
+    """
+
+    city = _city_for(destination)
+    if not settings.events_api_key or not city:
+        return False
+    key = normalize_destination(city)
+    if city_events_cache.expires_in(key) is None:
+        # Another worker process may already have stored a fresh horizon.
+        document = await _load_city_events(key)
+        if document is not None:
+            _cache_city_events(key, document)
+    remaining = city_events_cache.expires_in(key)
+    if remaining is not None and remaining > within:
+        return False
+    await refresh_city_events(city)
+    return True
@@ -0,0 +1,175 @@
+"""Latency-bounded itinerary generation with hedging and background completion."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict
+
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.session import get_mongo_client
+from app.services.openai_client import _fallback_itinerary, generate_itinerary
+
+LOGGER = logging.getLogger(__name__)
+GENERATIONS_COLLECTION = "itinerary_generations"
+
+# Background completions mapped to the generation each one is waiting on.
+_background_tasks: Dict[asyncio.Task[None], asyncio.Future[Dict[str, Any]]] = {}
+
+
+async def _hedged_generate(payload: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate an itinerary, firing a second request if the first is slower than the hedge delay."""
+
+    primary = asyncio.ensure_future(generate_itinerary(payload, context=context))
+    hedge_delay = settings.itinerary_hedge_delay_seconds
+    if hedge_delay <= 0:
+        return await primary
+
+    done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+    if done:
+        return primary.result()
+
+    LOGGER.info("Itinerary generation exceeded %.1fs; sending hedged request", hedge_delay)
+    pending = {primary, asyncio.ensure_future(generate_itinerary(payload, context=context))}
+    try:
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+            if not pending:
+                # Both attempts failed; surface the last error.
+                return next(iter(done)).result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _generations_collection():
+    return get_mongo_client()[settings.mongo_database][GENERATIONS_COLLECTION]
+
+
+async def _notify_complete(
+    itinerary: Dict[str, Any],
+    on_complete: Callable[[Dict[str, Any]], Awaitable[None]] | None,
+) -> None:
+    """Run ``on_complete`` unless ``itinerary`` fell back to the offline template."""
+
+    if on_complete is not None and not itinerary.get("fallback"):
+        await on_complete(itinerary)
+
+
+async def _complete_in_background(
+    generation_id: ObjectId,
+    task: asyncio.Future[Dict[str, Any]],
+    on_complete: Callable[[Dict[str, Any]], Awaitable[None]] | None,
+) -> None:
+    """Store the eventual result of a generation that missed its latency SLO."""
+
+    try:
+        itinerary = await task
+    except asyncio.CancelledError:
+        await _store_generation(generation_id, {"status": "failed", "error": "Cancelled during shutdown"})
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise
+        return
+    except Exception as exc:  # pragma: no cover - defensive logging
+        LOGGER.warning("Background itinerary generation %s failed: %s", generation_id, exc)
+        update: Dict[str, Any] = {"status": "failed", "error": str(exc)}
+    else:
+        update = {"status": "complete", "itinerary": itinerary}
+        await _notify_complete(itinerary, on_complete)
+    await _store_generation(generation_id, update)
+
+
+async def _store_generation(generation_id: ObjectId, update: Dict[str, Any]) -> None:
+    update["completed_at"] = datetime.utcnow()
+    try:
+        await _generations_collection().update_one({"_id": generation_id}, {"$set": update})
+    except PyMongoError as exc:
+        LOGGER.warning("Failed to store itinerary generation %s: %s", generation_id, exc)
+
+
+async def shutdown_generations() -> None:
+    """Cancel generations still completing in the background and wait for them to record their status."""
+
+    for generation in list(_background_tasks.values()):
+        generation.cancel()
+    await asyncio.gather(*list(_background_tasks), return_exceptions=True)
+
+
+async def generate_itinerary_within_slo(
+    payload: Dict[str, Any],
+    *,
+    context: Dict[str, Any] | None = None,
+    on_complete: Callable[[Dict[str, Any]], Awaitable[None]] | None = None,
+) -> Dict[str, Any]:
+    """Generate an itinerary, returning a provisional fallback if the latency SLO is missed.
+
+    When generation outlasts ``itinerary_latency_slo_seconds`` the deterministic
+    itinerary is returned flagged ``provisional`` with a ``generation_id``; the
+    real generation keeps running and is stored for retrieval via
+    :func:`get_generation`. ``on_complete`` runs with the final result unless it
+    is the offline fallback, whether it arrives in time or in the background.
+    """
+
+    context = context or {}
+    task = asyncio.ensure_future(_hedged_generate(payload, context))
+    slo = settings.itinerary_latency_slo_seconds
+    if slo <= 0 or not settings.openai_api_key or not settings.mongo_connection_string:
+        itinerary = await task
+    else:
+        done, _ = await asyncio.wait({task}, timeout=slo)
+        if not done:
+            return await _provisional_itinerary(payload, context, task, on_complete)
+        itinerary = task.result()
+
+    await _notify_complete(itinerary, on_complete)
+    return itinerary
+
+
+async def _provisional_itinerary(
+    payload: Dict[str, Any],
+    context: Dict[str, Any],
+    task: asyncio.Future[Dict[str, Any]],
+    on_complete: Callable[[Dict[str, Any]], Awaitable[None]] | None,
+) -> Dict[str, Any]:
+    generation_id = ObjectId()
+    try:
+        await _generations_collection().insert_one(
+            {"_id": generation_id, "status": "pending", "payload": payload, "created_at": datetime.utcnow()}
+        )
+    except PyMongoError as exc:
+        LOGGER.warning("Could not record pending generation; waiting for the model instead: %s", exc)
+        itinerary = await task
+        await _notify_complete(itinerary, on_complete)
+        return itinerary
+
+    LOGGER.info("Itinerary generation missed its SLO; returning provisional plan %s", generation_id)
+    background = asyncio.create_task(_complete_in_background(generation_id, task, on_complete))
+    _background_tasks[background] = task
+    background.add_done_callback(lambda done: _background_tasks.pop(done, None))
+
+    itinerary = _fallback_itinerary(payload, context=context)
+    itinerary["provisional"] = True
+    itinerary["generation_id"] = str(generation_id)
+    return itinerary
+
+
+async def get_generation(generation_id: str) -> Dict[str, Any] | None:
+    """Return the status and, once complete, the itinerary for a background generation."""
+
+    if not ObjectId.is_valid(generation_id):
+        return None
+    document = await _generations_collection().find_one(
+        {"_id": ObjectId(generation_id)}, {"status": 1, "itinerary": 1, "error": 1}
+    )
+    if not document:
+        return None
+    document["generation_id"] = str(document.pop("_id"))
+    return document
@@ -0,0 +1,80 @@
+"""Shared, pooled HTTP clients for outbound integrations."""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+from typing import Dict
+
+import httpx
+
+from app.core.config import Settings, settings
+
+LOGGER = logging.getLogger(__name__)
+
+PROVIDERS = ("openai", "weather", "events", "maps", "webhooks")
+
+
+def _http2_available() -> bool:
+    """Return whether the optional ``h2`` package required for HTTP/2 is installed."""
+
+    return importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientRegistry:
+    """Lazily create and share one ``httpx.AsyncClient`` per upstream provider."""
+
+    def __init__(self, config: Settings) -> None:
+        self._settings = config
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _timeout_for(self, provider: str) -> float:
+        return float(getattr(self._settings, f"{provider}_timeout_seconds"))
+
+    def _build_client(self, provider: str) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=self._settings.http_max_connections,
+            max_keepalive_connections=self._settings.http_max_keepalive_connections,
+            keepalive_expiry=self._settings.http_keepalive_expiry_seconds,
+        )
+        http2 = self._settings.http2_enabled and _http2_available()
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self._timeout_for(provider)),
+            limits=limits,
+            http2=http2,
+        )
+
+    def get(self, provider: str) -> httpx.AsyncClient:
+        """Return the pooled client for ``provider``, creating it on first use."""
+
+        if provider not in PROVIDERS:
+            raise KeyError(f"Unknown HTTP provider: {provider}")
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._build_client(provider)
+            self._clients[provider] = client
+        return client
+
+    async def startup(self) -> None:
+        """Eagerly create all provider clients so the first request pays no setup cost."""
+
+        for provider in PROVIDERS:
+            self.get(provider)
+        if self._settings.http2_enabled and not _http2_available():
+            LOGGER.info("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+
+    async def aclose(self) -> None:
+        """Close every pooled client and release its connections."""
+
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry(settings)
+
+
+def get_http_client(provider: str) -> httpx.AsyncClient:
+    """Return the shared pooled client for ``provider``."""
+
+    return http_clients.get(provider)
@@ -0,0 +1,162 @@
+"""Result cache for generated itineraries keyed on a canonical request fingerprint."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict
+
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.session import get_mongo_client
+from app.services.cache import normalize_destination
+from app.services.dates import coerce_date
+from app.services.generation import generate_itinerary_within_slo
+
+LOGGER = logging.getLogger(__name__)
+ITINERARY_CACHE_COLLECTION = "itinerary_cache"
+
+
+def _cache_enabled() -> bool:
+    return (
+        settings.itinerary_cache_enabled
+        and bool(settings.openai_api_key)
+        and bool(settings.mongo_connection_string)
+    )
+
+
+def _context_digest(context: Dict[str, Any]) -> str:
+    """Summarize the context that shapes generation while ignoring volatile details."""
+
+    events = sorted({str(event.get("title") or "").casefold() for event in context.get("events", [])})
+    conditions = [str(entry.get("condition") or "").casefold() for entry in context.get("weather", [])]
+    material = json.dumps({"events": events, "weather": conditions}, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def itinerary_fingerprint(payload: Dict[str, Any], context: Dict[str, Any]) -> str:
+    """Return a stable key for requests that should produce interchangeable itineraries."""
+
+    start = coerce_date(payload.get("start_date"))
+    end = coerce_date(payload.get("end_date"), default=start + timedelta(days=2))
+    canonical: Dict[str, Any] = {
+        "destination": normalize_destination(str(payload.get("destination") or "")),
+        "persona": " ".join(str(payload.get("persona") or "").casefold().split()),
+        "days": (end - start).days + 1,
+        "context": _context_digest(context),
+    }
+    if not settings.itinerary_cache_redate:
+        canonical["start_date"] = start.isoformat()
+    material = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def redate_itinerary(itinerary: Dict[str, Any], start_date: date) -> Dict[str, Any]:
+    """Shift a cached itinerary template so it begins on ``start_date``."""
+
+    updated = json.loads(json.dumps(itinerary, default=str))  # deep copy
+    old_start = coerce_date(updated.get("start_date"), default=start_date)
+    offset = start_date - old_start
+    if not offset:
+        return updated
+
+    old_end = coerce_date(updated.get("end_date"), default=old_start)
+    replacements = {
+        old_start.isoformat(): start_date.isoformat(),
+        old_end.isoformat(): (old_end + offset).isoformat(),
+    }
+    for day in updated.get("daily_plans", []):
+        old_day = coerce_date(day.get("date"), default=old_start)
+        new_day = (old_day + offset).isoformat()
+        day["date"] = new_day
+        for activity in day.get("activities", []):
+            for field in ("start_time", "end_time"):
+                value = activity.get(field)
+                if isinstance(value, str) and value.startswith(old_day.isoformat()):
+                    activity[field] = new_day + value[len(old_day.isoformat()) :]
+
+    updated["start_date"] = start_date.isoformat()
+    updated["end_date"] = (old_end + offset).isoformat()
+    summary = updated.get("summary") or ""
+    for old, new in replacements.items():
+        summary = summary.replace(old, new)
+    updated["summary"] = summary
+    return updated
+
+
+async def get_cached_itinerary(payload: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Return a cached itinerary re-dated onto the requested trip, if one is fresh."""
+
+    if not _cache_enabled():
+        return None
+    collection = get_mongo_client()[settings.mongo_database][ITINERARY_CACHE_COLLECTION]
+    fingerprint = itinerary_fingerprint(payload, context)
+    try:
+        document = await collection.find_one(
+            {"_id": fingerprint, "expires_at": {"$gt": datetime.utcnow()}}
+        )
+    except PyMongoError as exc:
+        LOGGER.warning("Itinerary cache lookup failed: %s", exc)
+        return None
+    if not document:
+        return None
+    return redate_itinerary(document["itinerary"], coerce_date(payload.get("start_date")))
+
+
+async def store_cached_itinerary(
+    payload: Dict[str, Any],
+    context: Dict[str, Any],
+    itinerary: Dict[str, Any],
+) -> None:
+    """Save a model-generated itinerary under the request fingerprint.
+
+    Fallback and provisional plans are not cached, so an upstream outage does
+    not pin the offline template to the trip for the cache lifetime.
+    """
+
+    if not _cache_enabled():
+        return
+    if itinerary.get("fallback") or itinerary.get("provisional"):
+        LOGGER.info("Not caching fallback itinerary for %s", payload.get("destination"))
+        return
+    collection = get_mongo_client()[settings.mongo_database][ITINERARY_CACHE_COLLECTION]
+    now = datetime.utcnow()
+    template = json.loads(json.dumps(itinerary, default=str))
+    template.pop("timed_out_sources", None)
+    try:
+        await collection.replace_one(
+            {"_id": itinerary_fingerprint(payload, context)},
+            {
+                "itinerary": template,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=settings.itinerary_cache_ttl_seconds),
+            },
+            upsert=True,
+        )
+    except PyMongoError as exc:
+        LOGGER.warning("Itinerary cache write failed: %s", exc)
+
+
+async def generate_itinerary_cached(
+    payload: Dict[str, Any],
+    *,
+    context: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """Serve an itinerary from the result cache, generating and caching it on a miss.
+
+    Generation is latency-bounded, so a miss may return a provisional itinerary
+    whose final version is cached once the background generation completes.
+    """
+
+    context = context or {}
+    cached = await get_cached_itinerary(payload, context)
+    if cached is not None:
+        return cached
+
+    async def _store(itinerary: Dict[str, Any]) -> None:
+        await store_cached_itinerary(payload, context, itinerary)
+
+    return await generate_itinerary_within_slo(payload, context=context, on_complete=_store)
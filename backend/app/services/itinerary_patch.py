@@ -0,0 +1,148 @@
+"""Patch operations for incremental itinerary customization."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, List
+
+LOGGER = logging.getLogger(__name__)
+
+_ACTIVITY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "description": {"type": "string"},
+        "category": {"type": "string"},
+        "location": {"type": ["string", "null"]},
+        "start_time": {"type": ["string", "null"]},
+        "end_time": {"type": ["string", "null"]},
+        "weather_advice": {"type": ["string", "null"]},
+    },
+    "required": ["name", "description", "category"],
+}
+
+OPENAI_PATCH_FUNCTION = {
+    "name": "patch_itinerary",
+    "description": "Return only the changes needed to apply the traveler's feedback",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "operations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "op": {"type": "string", "enum": ["add", "remove", "replace"]},
+                        "date": {"type": "string", "format": "date"},
+                        "index": {
+                            "type": ["integer", "null"],
+                            "description": "Zero-based activity position; append when omitted for add",
+                        },
+                        "activity": _ACTIVITY_SCHEMA,
+                    },
+                    "required": ["op", "date"],
+                },
+            },
+            "summary_note": {"type": "string", "description": "One sentence describing the change"},
+        },
+        "required": ["operations"],
+    },
+}
+
+
+def patch_outline(itinerary: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a compact, indexed view of an itinerary for patch prompts."""
+
+    return {
+        "destination": itinerary.get("destination"),
+        "persona": itinerary.get("persona"),
+        "days": [
+            {
+                "date": str(day.get("date")),
+                "theme": day.get("theme"),
+                "activities": [
+                    [index, activity.get("name"), activity.get("category"), activity.get("start_time")]
+                    for index, activity in enumerate(day.get("activities", []))
+                ],
+            }
+            for day in itinerary.get("daily_plans", [])
+        ],
+    }
+
+
+def _activity_index(activities: List[Dict[str, Any]], operation: Dict[str, Any]) -> int | None:
+    index = operation.get("index")
+    if isinstance(index, int) and 0 <= index < len(activities):
+        return index
+    name = (operation.get("activity") or {}).get("name")
+    for position, activity in enumerate(activities):
+        if name and activity.get("name") == name:
+            return position
+    return None
+
+
+class _DayEdits:
+    """Operations on one day, keyed by positions in its original activity list."""
+
+    def __init__(self, original: List[Dict[str, Any]]) -> None:
+        self.original = original
+        self.replacements: Dict[int, Dict[str, Any] | None] = {}
+        self.inserts: Dict[int, List[Dict[str, Any]]] = {}
+
+    def insert(self, index: Any, activity: Dict[str, Any]) -> None:
+        if not (isinstance(index, int) and 0 <= index <= len(self.original)):
+            index = len(self.original)
+        self.inserts.setdefault(index, []).append(activity)
+
+    def apply(self) -> List[Dict[str, Any]]:
+        activities: List[Dict[str, Any]] = []
+        for position, activity in enumerate(self.original):
+            activities.extend(self.inserts.get(position, []))
+            replacement = self.replacements.get(position, activity)
+            if replacement is not None:
+                activities.append(replacement)
+        activities.extend(self.inserts.get(len(self.original), []))
+        return activities
+
+
+def apply_itinerary_patch(itinerary: Dict[str, Any], operations: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply add/remove/replace activity operations to a copy of ``itinerary``.
+
+    Indices refer to the activities as listed in the outline the model saw, so
+    every operation is resolved against each day's original activities before
+    any is applied: ``add`` at index ``i`` inserts before original activity
+    ``i``. Operations that reference an unknown day or activity are skipped.
+    """
+
+    updated = json.loads(json.dumps(itinerary, default=str))  # deep copy
+    days = {str(day.get("date"))[:10]: day for day in updated.get("daily_plans", [])}
+    edits: Dict[str, _DayEdits] = {}
+
+    for operation in operations:
+        key = str(operation.get("date"))[:10]
+        day = days.get(key)
+        if day is None:
+            LOGGER.warning("Skipping patch operation for unknown day: %s", operation)
+            continue
+        day_edits = edits.setdefault(key, _DayEdits(day.setdefault("activities", [])))
+        op = operation.get("op")
+        activity = operation.get("activity")
+
+        if op == "add" and activity:
+            day_edits.insert(operation.get("index"), activity)
+            continue
+
+        position = _activity_index(day_edits.original, operation)
+        if position is None:
+            LOGGER.warning("Skipping patch operation for unknown activity: %s", operation)
+        elif op == "remove":
+            day_edits.replacements[position] = None
+        elif op == "replace" and activity:
+            day_edits.replacements[position] = activity
+        else:
+            LOGGER.warning("Skipping malformed patch operation: %s", operation)
+
+    for key, day_edits in edits.items():
+        days[key]["activities"] = day_edits.apply()
+    return updated
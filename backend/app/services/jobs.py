@@ -0,0 +1,252 @@
+"""MongoDB-backed job queue and worker pool for asynchronous itinerary generation."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+import httpx
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.db.session import get_mongo_client
+from app.models.itinerary import Itinerary
+from app.services.context import gather_trip_context
+from app.services.http import get_http_client
+from app.services.itinerary_cache import get_cached_itinerary, store_cached_itinerary
+from app.services.openai_client import generate_itinerary
+
+LOGGER = logging.getLogger(__name__)
+JOBS_COLLECTION = "itinerary_jobs"
+_PRIVATE_HOST_SUFFIXES = (".localhost", ".local", ".internal")
+
+
+def _jobs_collection():
+    return get_mongo_client()[settings.mongo_database][JOBS_COLLECTION]
+
+
+def validate_callback_url(url: Any) -> str:
+    """Return ``url`` if it is an acceptable job callback target, otherwise raise ``ValueError``.
+
+    Callbacks must use HTTPS without credentials. When ``job_callback_allowed_hosts``
+    is set the host must be listed; otherwise loopback, private and link-local
+    addresses and local host names are refused.
+    """
+
+    if not isinstance(url, str):
+        raise ValueError("callback_url must be a string.")
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").rstrip(".").lower()
+    if parts.scheme != "https" or not host or parts.username or parts.password:
+        raise ValueError("callback_url must be an https URL with a host and no credentials.")
+
+    allowed = {entry.strip().lower() for entry in settings.job_callback_allowed_hosts if entry.strip()}
+    if allowed:
+        if host not in allowed:
+            raise ValueError("callback_url host is not allowed.")
+        return url.strip()
+
+    if host == "localhost" or host.endswith(_PRIVATE_HOST_SUFFIXES):
+        raise ValueError("callback_url host is not allowed.")
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return url.strip()
+    if not address.is_global:
+        raise ValueError("callback_url host is not allowed.")
+    return url.strip()
+
+
+async def enqueue_itinerary_job(payload: Dict[str, Any], *, callback_url: str | None = None) -> str:
+    """Persist a queued itinerary job and wake an idle worker."""
+
+    now = datetime.utcnow()
+    result = await _jobs_collection().insert_one(
+        {
+            "status": "queued",
+            "payload": payload,
+            "callback_url": callback_url,
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+    )
+    worker_pool.notify()
+    return str(result.inserted_id)
+
+
+async def get_job(job_id: str) -> Dict[str, Any] | None:
+    """Return the public status of a job, including its itinerary once complete."""
+
+    if not ObjectId.is_valid(job_id):
+        return None
+    document = await _jobs_collection().find_one(
+        {"_id": ObjectId(job_id)},
+        {"status": 1, "attempts": 1, "itinerary": 1, "error": 1, "created_at": 1, "updated_at": 1},
+    )
+    if not document:
+        return None
+    document["job_id"] = str(document.pop("_id"))
+    return document
+
+
+async def _run_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Assemble context and generate a validated itinerary for a job payload."""
+
+    destination = str(payload.get("destination", ""))
+    start_date = str(payload.get("start_date", ""))
+    end_date = str(payload.get("end_date", ""))
+    context = await gather_trip_context(destination, start_date, end_date)
+
+    itinerary = await get_cached_itinerary(payload, context)
+    if itinerary is None:
+        itinerary = await generate_itinerary(payload, context=context)
+        if not itinerary.get("fallback"):
+            await store_cached_itinerary(payload, context, itinerary)
+    itinerary["timed_out_sources"] = context["timed_out_sources"]
+    return json.loads(Itinerary(**itinerary).json())
+
+
+async def _send_callback(job_id: str, url: str, body: Dict[str, Any]) -> None:
+    try:
+        response = await get_http_client("webhooks").post(url, json={"job_id": job_id, **body})
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        LOGGER.warning("Callback for job %s to %s failed: %s", job_id, url, exc)
+
+
+class JobWorkerPool:
+    """A fixed number of asyncio workers that claim jobs with an expiring lease.
+
+    Jobs left ``running`` by a crashed or restarted process are reclaimed once
+    their lease expires, up to ``job_max_attempts`` attempts; after that an idle
+    worker sweeps them to ``failed``.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: List[asyncio.Task[None]] = []
+        self._wakeup: asyncio.Event | None = None
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def start(self, concurrency: int) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(index, self._wakeup)) for index in range(concurrency)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    async def _claim(self) -> Dict[str, Any] | None:
+        now = datetime.utcnow()
+        return await _jobs_collection().find_one_and_update(
+            {
+                "attempts": {"$lt": settings.job_max_attempts},
+                "$or": [
+                    {"status": "queued"},
+                    {"status": "running", "lease_expires_at": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "status": "running",
+                    "lease_expires_at": now + timedelta(seconds=settings.job_lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _sweep(self) -> int:
+        """Fail jobs whose lease expired on their final attempt, notifying their callbacks."""
+
+        swept = 0
+        while True:
+            now = datetime.utcnow()
+            job = await _jobs_collection().find_one_and_update(
+                {
+                    "status": "running",
+                    "lease_expires_at": {"$lt": now},
+                    "attempts": {"$gte": settings.job_max_attempts},
+                },
+                {
+                    "$set": {
+                        "status": "failed",
+                        "error": "Job lease expired on its final attempt.",
+                        "updated_at": now,
+                        "finished_at": now,
+                    },
+                    "$unset": {"lease_expires_at": ""},
+                },
+                return_document=ReturnDocument.AFTER,
+            )
+            if job is None:
+                return swept
+            swept += 1
+            LOGGER.warning("Itinerary job %s abandoned after %s attempts", job["_id"], job["attempts"])
+            if job.get("callback_url"):
+                body = {"status": "failed", "itinerary": None, "error": job["error"]}
+                await _send_callback(str(job["_id"]), job["callback_url"], body)
+
+    async def _finish(self, job: Dict[str, Any], update: Dict[str, Any]) -> None:
+        update["updated_at"] = datetime.utcnow()
+        finished = update["status"] in ("complete", "failed")
+        if finished:
+            update["finished_at"] = update["updated_at"]
+        await _jobs_collection().update_one(
+            {"_id": job["_id"]}, {"$set": update, "$unset": {"lease_expires_at": ""}}
+        )
+        if job.get("callback_url") and finished:
+            body = {key: update.get(key) for key in ("status", "itinerary", "error")}
+            await _send_callback(str(job["_id"]), job["callback_url"], body)
+
+    async def _process(self, job: Dict[str, Any]) -> None:
+        try:
+            itinerary = await _run_job(job["payload"])
+        except Exception as exc:  # pragma: no cover - defensive logging
+            LOGGER.warning("Itinerary job %s failed: %s", job["_id"], exc)
+            retry = job["attempts"] < settings.job_max_attempts
+            await self._finish(job, {"status": "queued" if retry else "failed", "error": str(exc)})
+            return
+        await self._finish(job, {"status": "complete", "itinerary": itinerary})
+
+    async def _worker(self, index: int, wakeup: asyncio.Event) -> None:
+        while True:
+            # Clear before claiming so a job enqueued during the claim still wakes this worker.
+            wakeup.clear()
+            try:
+                job = await self._claim()
+                if job is None and index == 0:
+                    await self._sweep()
+            except PyMongoError as exc:
+                LOGGER.warning("Job worker %s could not claim work: %s", index, exc)
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=settings.job_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(job)
+            except PyMongoError as exc:
+                LOGGER.warning("Job worker %s could not record job %s: %s", index, job["_id"], exc)
+
+
+worker_pool = JobWorkerPool()
@@ -2,23 +2,44 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any, Dict, List
 
 import httpx
 
 from app.core.config import settings
+from app.services.cache import TTLCache, normalize_destination
+from app.services.http import get_http_client
+from app.services.places import place_query, resolve_place
+from app.services.singleflight import SingleFlight
 
 LOGGER = logging.getLogger(__name__)
 PLACES_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
 
+DEFAULT_CATEGORIES = ["Explore", "Eat", "Stay"]
+
+maps_flight = SingleFlight("maps")
+map_pins_cache: TTLCache[List[Dict[str, Any]]] = TTLCache(
+    "maps",
+    maxsize=settings.maps_cache_size,
+    ttl=settings.maps_cache_ttl_seconds,
+)
+
+
+def _copy_pins(pins: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return independent copies of ``pins`` so callers never share the cached lists or coordinates."""
+
+    return [{**pin, "coordinates": dict(pin["coordinates"])} for pin in pins]
+
 
 def _fallback_points(destination: str, categories: List[str]) -> List[Dict[str, Any]]:
     """Return deterministic fallback points when API access is unavailable."""
 
+    place = resolve_place(destination)
     base_coordinates = {
-        "lat": 41.3851,
-        "lng": 2.1734,
+        "lat": place.lat if place else 41.3851,
+        "lng": place.lon if place else 2.1734,
     }
     return [
         {
@@ -31,44 +52,129 @@ def _fallback_points(destination: str, categories: List[str]) -> List[Dict[str,
     ]
 
 
-async def fetch_map_points(destination: str, categories: List[str] | None = None) -> List[Dict[str, Any]]:
-    """Search for map pins using Google Places Text Search with graceful fallback."""
+async def fetch_map_points(
+    destination: str,
+    categories: List[str] | None = None,
+    *,
+    limit: int | None = None,
+    client: httpx.AsyncClient | None = None,
+) -> List[Dict[str, Any]]:
+    """Search for map pins using Google Places Text Search with graceful fallback.
+
+    ``limit`` caps the pins returned per category; values above one result page
+    follow ``next_page_token`` pagination.
+    """
 
     if not destination:
         return []
 
-    categories = categories or ["Explore", "Eat", "Stay"]
+    categories = categories or DEFAULT_CATEGORIES
+    limit = limit or settings.maps_results_per_category
 
     if not settings.maps_api_key:
         return _fallback_points(destination, categories)
 
+    key = _map_cache_key(destination, categories, limit)
+    pins = map_pins_cache.get(key)
+    if pins is None:
+        # Coalesced callers all receive the same list, so each gets its own copy.
+        pins = await maps_flight.do(
+            key, lambda: _fetch_map_points(destination, categories, limit=limit, client=client)
+        )
+    return _copy_pins(pins)
+
+
+def _map_cache_key(destination: str, categories: List[str], limit: int) -> tuple[str, tuple[str, ...], int]:
+    return normalize_destination(destination), tuple(categories), limit
+
+
+async def warm_map_points(destination: str, *, within: float) -> bool:
+    """Refresh the default map pins for ``destination`` unless cached beyond ``within`` seconds.
+
+    Returns whether an upstream search was made.
+    """
+
+    if not settings.maps_api_key or not destination:
+        return False
+    limit = settings.maps_results_per_category
+    key = _map_cache_key(destination, DEFAULT_CATEGORIES, limit)
+    remaining = map_pins_cache.expires_in(key)
+    if remaining is not None and remaining > within:
+        return False
+    await maps_flight.do(
+        ("warm", *key), lambda: _fetch_map_points(destination, DEFAULT_CATEGORIES, limit=limit)
+    )
+    return True
+
+
+def _place_to_pin(place: Dict[str, Any], category: str) -> Dict[str, Any] | None:
+    location = place.get("geometry", {}).get("location")
+    if not location:
+        return None
+    return {
+        "name": place.get("name"),
+        "category": category,
+        "coordinates": {"lat": location.get("lat"), "lng": location.get("lng")},
+        "description": place.get("formatted_address") or place.get("vicinity"),
+        "rating": place.get("rating"),
+    }
+
+
+async def _search_category(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    destination: str,
+    category: str,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """Collect up to ``limit`` pins for one category, paging while more are needed."""
+
     pins: List[Dict[str, Any]] = []
-    async with httpx.AsyncClient(timeout=httpx.Timeout(15.0)) as client:
-        for category in categories:
-            params = {"query": f"{category} in {destination}", "key": settings.maps_api_key}
+    params = {"query": f"{category} in {place_query(destination)}", "key": settings.maps_api_key}
+    while True:
+        async with semaphore:
             try:
                 response = await client.get(PLACES_URL, params=params)
                 response.raise_for_status()
             except httpx.HTTPError as exc:
                 LOGGER.warning("Map lookup failed for %s: %s", category, exc)
-                continue
+                return pins
 
-            payload = response.json()
-            for place in payload.get("results", [])[:3]:
-                location = place.get("geometry", {}).get("location")
-                if not location:
-                    continue
-                pins.append(
-                    {
-                        "name": place.get("name"),
-                        "category": category,
-                        "coordinates": {"lat": location.get("lat"), "lng": location.get("lng")},
-                        "description": place.get("formatted_address") or place.get("vicinity"),
-                        "rating": place.get("rating"),
-                    }
-                )
+        payload = response.json()
+        for place in payload.get("results", []):
+            pin = _place_to_pin(place, category)
+            if pin is None:
+                continue
+            pins.append(pin)
+            if len(pins) >= limit:
+                return pins
+
+        page_token = payload.get("next_page_token")
+        if not page_token:
+            return pins
+        # Google only activates a page token a short while after issuing it.
+        await asyncio.sleep(settings.maps_page_token_delay_seconds)
+        params = {"pagetoken": page_token, "key": settings.maps_api_key}
+
+
+async def _fetch_map_points(
+    destination: str,
+    categories: List[str],
+    *,
+    limit: int,
+    client: httpx.AsyncClient | None = None,
+) -> List[Dict[str, Any]]:
+    """Run the Places text searches for all categories concurrently and collect pins in order."""
+
+    client = client or get_http_client("maps")
+    semaphore = asyncio.Semaphore(settings.maps_max_concurrency)
+    results = await asyncio.gather(
+        *(_search_category(client, semaphore, destination, category, limit) for category in categories)
+    )
+    pins = [pin for category_pins in results for pin in category_pins]
 
     if pins:
+        map_pins_cache.set(_map_cache_key(destination, categories, limit), _copy_pins(pins))
         return pins
 
     return _fallback_points(destination, categories)
@@ -2,14 +2,31 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, Iterable, List, Sequence
+from contextlib import aclosing
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Sequence, Tuple
 
 import httpx
 
 from app.core.config import settings
+from app.models.itinerary import DayPlan, Itinerary
+from app.services.dates import coerce_date
+from app.services.http import get_http_client
+from app.services.itinerary_patch import OPENAI_PATCH_FUNCTION, apply_itinerary_patch, patch_outline
+from app.services.prompt import (
+    build_user_content,
+    compact_context,
+    compact_events,
+    compact_itinerary,
+    context_in_window,
+    record_request_tokens,
+)
+from app.services.resilience import CircuitOpenError, send_with_resilience
+from app.services.routing import activity_key, optimize_day_route, optimize_itinerary_routes
+from app.services.stream_parser import JSONArrayItemStream
 
 LOGGER = logging.getLogger(__name__)
 OPENAI_MODEL = "gpt-4o-mini"
@@ -41,6 +58,10 @@ OPENAI_ITINERARY_FUNCTION = {
                                     "start_time": {"type": ["string", "null"]},
                                     "end_time": {"type": ["string", "null"]},
                                     "weather_advice": {"type": ["string", "null"]},
+                                    "coordinates": {
+                                        "type": ["object", "null"],
+                                        "properties": {"lat": {"type": "number"}, "lng": {"type": "number"}},
+                                    },
                                 },
                                 "required": ["name", "description", "category"],
                             },
@@ -66,18 +87,23 @@ def build_itinerary_prompt(payload: Dict[str, Any]) -> str:
     return (
         "You are an expert travel planner. Create a JSON itinerary that matches the user's "
         f"persona of {persona} for a trip to {destination} between {start_date} and {end_date}. "
-        "Balance activities across Eat, Explore, and Stay categories, and provide short summaries."
+        "Balance activities across Eat, Explore, and Stay categories, and provide short summaries. "
+        "Give each activity its approximate coordinates."
     )
 
 
-async def _call_openai_chat(
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+
+def _chat_request(
     messages: Sequence[Dict[str, Any]],
     *,
-    functions: Sequence[Dict[str, Any]] | None = None,
-    function_call: Dict[str, str] | None = None,
-    temperature: float = 0.7,
-) -> Dict[str, Any]:
-    """Call the OpenAI chat completions endpoint and return the raw payload."""
+    functions: Sequence[Dict[str, Any]] | None,
+    function_call: Dict[str, str] | None,
+    temperature: float,
+    stream: bool = False,
+) -> tuple[Dict[str, str], Dict[str, Any]]:
+    """Build the headers and JSON body for a chat completions request."""
 
     if not settings.openai_api_key:
         raise RuntimeError("OpenAI API key is not configured.")
@@ -92,37 +118,77 @@ async def _call_openai_chat(
         payload["functions"] = list(functions)
     if function_call:
         payload["function_call"] = function_call
+    if stream:
+        payload["stream"] = True
 
     headers = {
         "Authorization": f"Bearer {settings.openai_api_key}",
         "Content-Type": "application/json",
     }
+    return headers, payload
+
+
+async def _call_openai_chat(
+    messages: Sequence[Dict[str, Any]],
+    *,
+    functions: Sequence[Dict[str, Any]] | None = None,
+    function_call: Dict[str, str] | None = None,
+    temperature: float = 0.7,
+    client: httpx.AsyncClient | None = None,
+) -> Dict[str, Any]:
+    """Call the OpenAI chat completions endpoint and return the raw payload."""
+
+    headers, payload = _chat_request(
+        messages, functions=functions, function_call=function_call, temperature=temperature
+    )
+
+    client = client or get_http_client("openai")
+    response = await send_with_resilience(
+        lambda: client.post(OPENAI_CHAT_URL, headers=headers, json=payload),
+        estimated_tokens=record_request_tokens(payload),
+    )
+    return response.json()
 
-    async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-        response = await client.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json=payload,
-        )
-        response.raise_for_status()
-        return response.json()
 
+async def _stream_openai_chat(
+    messages: Sequence[Dict[str, Any]],
+    *,
+    functions: Sequence[Dict[str, Any]] | None = None,
+    function_call: Dict[str, str] | None = None,
+    temperature: float = 0.7,
+    client: httpx.AsyncClient | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Call the chat completions endpoint with ``stream=True`` and yield each choice delta."""
 
-def _coerce_date(value: Any, *, default: date | None = None) -> date:
-    """Convert a string/date input into a ``date`` instance."""
+    headers, payload = _chat_request(
+        messages,
+        functions=functions,
+        function_call=function_call,
+        temperature=temperature,
+        stream=True,
+    )
 
-    if isinstance(value, date):
-        return value
-    if isinstance(value, datetime):
-        return value.date()
-    if isinstance(value, str) and value:
-        try:
-            return datetime.fromisoformat(value.replace("Z", "")).date()
-        except ValueError:
-            pass
-    if default is not None:
-        return default
-    return datetime.utcnow().date()
+    client = client or get_http_client("openai")
+    response = await send_with_resilience(
+        lambda: client.send(
+            client.build_request("POST", OPENAI_CHAT_URL, headers=headers, json=payload), stream=True
+        ),
+        estimated_tokens=record_request_tokens(payload),
+    )
+    try:
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            for choice in chunk.get("choices", []):
+                delta = choice.get("delta")
+                if delta:
+                    yield delta
+    finally:
+        await response.aclose()
 
 
 def _date_range(start: date, end: date) -> Iterable[date]:
@@ -159,6 +225,7 @@ def _event_activity(event: Dict[str, Any]) -> Dict[str, Any]:
         "start_time": start_time,
         "end_time": None,
         "weather_advice": None,
+        "coordinates": event.get("coordinates"),
     }
 
 
@@ -223,8 +290,8 @@ def _fallback_itinerary(
     context = context or {}
     destination = payload.get("destination", "Destination")
     persona = payload.get("persona", "Adventurer")
-    start_date = _coerce_date(payload.get("start_date"))
-    end_date = _coerce_date(payload.get("end_date"), default=start_date + timedelta(days=2))
+    start_date = coerce_date(payload.get("start_date"))
+    end_date = coerce_date(payload.get("end_date"), default=start_date + timedelta(days=2))
 
     events = context.get("events", [])
     weather = {str(item.get("date")): item for item in context.get("weather", [])}
@@ -277,14 +344,16 @@ def _fallback_itinerary(
     if weather:
         summary_parts.append("Weather insights are woven into daily suggestions.")
 
-    return {
+    itinerary = {
         "destination": destination,
         "start_date": start_date.isoformat(),
         "end_date": end_date.isoformat(),
         "persona": persona,
         "summary": " ".join(summary_parts),
         "daily_plans": daily_plans,
+        "fallback": True,
     }
+    return optimize_itinerary_routes(itinerary, events=events)
 
 
 def _fallback_adjustment(
@@ -340,45 +409,80 @@ def _fallback_adjustment(
                 },
             )
 
-    summary = updated.get("summary", "")
-    modifier_sentence = (
+    # Only the latest note is kept so repeated customizations do not grow the saved plan.
+    updated["change_note"] = (
         f"Feedback applied: {feedback}. Persona focus remains {persona}."
         if feedback
         else f"Persona focus remains {persona}."
     )
-    updated["summary"] = summary + (" " if summary else "") + modifier_sentence
     return updated
 
 
+def _itinerary_messages(payload: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Build the chat messages requesting a new itinerary."""
+
+    start_date = coerce_date(payload.get("start_date"))
+    end_date = coerce_date(payload.get("end_date"), default=start_date + timedelta(days=2))
+    return [
+        {"role": "system", "content": build_itinerary_prompt(payload)},
+        {
+            "role": "user",
+            "content": build_user_content({
+                "trip_preferences": payload,
+                **compact_context(context, start_date, end_date),
+            }),
+        },
+    ]
+
+
+def _finalize_itinerary(
+    itinerary: Dict[str, Any],
+    payload: Dict[str, Any],
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Fill trip metadata the model may omit, note highlighted events and order each day's route."""
+
+    itinerary.setdefault("destination", payload.get("destination"))
+    itinerary.setdefault("persona", payload.get("persona"))
+    itinerary.setdefault("start_date", payload.get("start_date"))
+    itinerary.setdefault("end_date", payload.get("end_date"))
+    if context.get("events"):
+        itinerary.setdefault("summary", "")
+        itinerary["summary"] += (
+            " " if itinerary["summary"] else ""
+        ) + f"Includes {len(context['events'])} highlighted events."
+    return optimize_itinerary_routes(itinerary, events=context.get("events", []))
+
+
 async def generate_itinerary(
     payload: Dict[str, Any],
     *,
     context: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
-    """Generate an itinerary using OpenAI with a deterministic fallback."""
+    """Generate an itinerary using OpenAI with a deterministic fallback.
+
+    Trips of at least ``itinerary_chunk_threshold_days`` are generated as
+    concurrent date-range chunks and merged.
+    """
 
     context = context or {}
     if not settings.openai_api_key:
         return _fallback_itinerary(payload, context=context)
 
-    system_prompt = build_itinerary_prompt(payload)
-    messages = [
-        {"role": "system", "content": system_prompt},
-        {
-            "role": "user",
-            "content": json.dumps({
-                "trip_preferences": payload,
-                "weather": context.get("weather", []),
-                "events": context.get("events", []),
-            }),
-        },
-    ]
+    start_date = coerce_date(payload.get("start_date"))
+    end_date = coerce_date(payload.get("end_date"), default=start_date + timedelta(days=2))
+    if (end_date - start_date).days + 1 >= settings.itinerary_chunk_threshold_days:
+        return await _generate_itinerary_chunked(payload, context, start_date, end_date)
 
-    response = await _call_openai_chat(
-        messages,
-        functions=[OPENAI_ITINERARY_FUNCTION],
-        function_call={"name": OPENAI_ITINERARY_FUNCTION["name"]},
-    )
+    try:
+        response = await _call_openai_chat(
+            _itinerary_messages(payload, context),
+            functions=[OPENAI_ITINERARY_FUNCTION],
+            function_call={"name": OPENAI_ITINERARY_FUNCTION["name"]},
+        )
+    except CircuitOpenError:
+        LOGGER.warning("OpenAI circuit is open; serving fallback itinerary")
+        return _fallback_itinerary(payload, context=context)
 
     try:
         choice = response["choices"][0]
@@ -388,16 +492,222 @@ async def generate_itinerary(
         LOGGER.exception("Failed to parse OpenAI itinerary response; falling back", exc_info=exc)
         return _fallback_itinerary(payload, context=context)
 
-    itinerary.setdefault("destination", payload.get("destination"))
-    itinerary.setdefault("persona", payload.get("persona"))
-    itinerary.setdefault("start_date", payload.get("start_date"))
-    itinerary.setdefault("end_date", payload.get("end_date"))
-    if context.get("events"):
-        itinerary.setdefault("summary", "")
-        itinerary["summary"] += (
-            " " if itinerary["summary"] else ""
-        ) + f"Includes {len(context['events'])} highlighted events."
-    return itinerary
+    return _finalize_itinerary(itinerary, payload, context)
+
+
+async def _generate_chunk(
+    payload: Dict[str, Any],
+    context: Dict[str, Any],
+    chunk_start: date,
+    chunk_end: date,
+    part: int,
+    parts: int,
+    *,
+    constraints: Dict[str, Any],
+) -> Tuple[Dict[str, Any], bool]:
+    """Generate one date-range chunk, returning ``(itinerary, generated_by_model)``.
+
+    ``constraints`` are the trip-level constraints shared by every chunk.
+    """
+
+    chunk_payload = {**payload, "start_date": chunk_start.isoformat(), "end_date": chunk_end.isoformat()}
+    chunk_context = context_in_window(context, chunk_start, chunk_end)
+    messages = _itinerary_messages(chunk_payload, chunk_context)
+    messages[0]["content"] += (
+        f" This is part {part} of {parts} of a longer trip from {payload.get('start_date')} to "
+        f"{payload.get('end_date')}; the other parts are planned at the same time, so plan only these "
+        "dates, leave the events listed for other parts to them, and keep the whole trip within any "
+        "budget in the trip constraints."
+    )
+    constraints = {**constraints, "this_part": part}
+    content = build_user_content({"trip_constraints": constraints}, trim=())
+    messages.append({"role": "user", "content": content})
+
+    try:
+        response = await _call_openai_chat(
+            messages,
+            functions=[OPENAI_ITINERARY_FUNCTION],
+            function_call={"name": OPENAI_ITINERARY_FUNCTION["name"]},
+        )
+        arguments = response["choices"][0]["message"]["function_call"]["arguments"]
+        return json.loads(arguments), True
+    except (CircuitOpenError, httpx.HTTPError, KeyError, IndexError, json.JSONDecodeError) as exc:
+        LOGGER.warning("Itinerary chunk %s/%s failed; using fallback: %s", part, parts, exc)
+        return _fallback_itinerary(chunk_payload, context=chunk_context), False
+
+
+def _trip_constraints(
+    payload: Dict[str, Any],
+    context: Dict[str, Any],
+    bounds: Sequence[Tuple[date, date]],
+) -> Dict[str, Any]:
+    """Return the constraints every chunk shares, built without a model call.
+
+    Each part lists the events in its dates so the other parts leave them alone.
+    """
+
+    parts = []
+    for part, (chunk_start, chunk_end) in enumerate(bounds, start=1):
+        events = context_in_window(context, chunk_start, chunk_end)["events"]
+        parts.append(
+            {
+                "part": part,
+                "start_date": chunk_start.isoformat(),
+                "end_date": chunk_end.isoformat(),
+                "events": [event.get("title") for event in events[: settings.prompt_max_events]],
+            }
+        )
+    return {
+        "trip_start_date": payload.get("start_date"),
+        "trip_end_date": payload.get("end_date"),
+        "persona": payload.get("persona"),
+        "budget": payload.get("budget"),
+        "parts": parts,
+    }
+
+
+async def _generate_itinerary_chunked(
+    payload: Dict[str, Any],
+    context: Dict[str, Any],
+    start_date: date,
+    end_date: date,
+) -> Dict[str, Any]:
+    """Generate a long itinerary in date chunks and merge them in date order.
+
+    Every chunk is requested at once with the same trip-level constraints, so
+    latency follows the slowest chunk; activities repeated across chunks are
+    dropped while merging.
+    """
+
+    chunk_days = max(1, settings.itinerary_chunk_days)
+    bounds: List[Tuple[date, date]] = []
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        bounds.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+
+    constraints = _trip_constraints(payload, context, bounds)
+    chunks = await asyncio.gather(
+        *(
+            _generate_chunk(payload, context, *chunk_bounds, part, len(bounds), constraints=constraints)
+            for part, chunk_bounds in enumerate(bounds, start=1)
+        )
+    )
+
+    seen: set[str] = set()
+    daily_plans: List[Dict[str, Any]] = []
+    for chunk, generated in chunks:
+        chunk_keys: set[str] = set()
+        for day in chunk.get("daily_plans", []):
+            if generated:
+                # Chunks cannot see each other, so drop repeats of earlier chunks' picks
+                # unless that would leave the day empty.
+                activities = day.get("activities", [])
+                unique = [
+                    activity for activity in activities if activity_key(activity.get("name")) not in seen
+                ]
+                day["activities"] = unique or activities
+                chunk_keys.update(activity_key(activity.get("name")) for activity in day["activities"])
+            daily_plans.append(day)
+        seen |= chunk_keys
+
+    itinerary = {
+        "destination": chunks[0][0].get("destination") or payload.get("destination"),
+        "persona": payload.get("persona"),
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "summary": _chunked_summary(payload, chunks, bounds, start_date, end_date),
+        "daily_plans": daily_plans,
+        "fallback": not all(generated for _, generated in chunks),
+    }
+    return _finalize_itinerary(itinerary, payload, context)
+
+
+def _chunked_summary(
+    payload: Dict[str, Any],
+    chunks: Sequence[Tuple[Dict[str, Any], bool]],
+    bounds: Sequence[Tuple[date, date]],
+    start_date: date,
+    end_date: date,
+) -> str:
+    """Describe the whole trip from every chunk's summary, labelled with its dates."""
+
+    parts = [
+        f"{payload.get('persona') or 'Traveler'} itinerary for {payload.get('destination')} "
+        f"from {start_date.isoformat()} to {end_date.isoformat()}."
+    ]
+    for (chunk, _), (chunk_start, chunk_end) in zip(chunks, bounds):
+        summary = " ".join(str(chunk.get("summary") or "").split())
+        if summary:
+            parts.append(f"{chunk_start.isoformat()} to {chunk_end.isoformat()}: {summary}")
+    return " ".join(parts)
+
+
+async def stream_itinerary(
+    payload: Dict[str, Any],
+    *,
+    context: Dict[str, Any] | None = None,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Generate an itinerary incrementally.
+
+    Yields ``("day", DayPlan)`` as soon as each day of the streamed function
+    call is complete and valid, route-ordered exactly as the final itinerary
+    orders it, followed by one ``("itinerary", dict)`` holding the full result,
+    which is authoritative if it differs from the days sent.
+    """
+
+    context = context or {}
+    destination = str(payload.get("destination") or "")
+    events = context.get("events", [])
+    if not settings.openai_api_key:
+        itinerary = _fallback_itinerary(payload, context=context)
+        for day in itinerary["daily_plans"]:
+            yield "day", DayPlan(**day)
+        yield "itinerary", itinerary
+        return
+
+    parser = JSONArrayItemStream("daily_plans")
+    deltas = _stream_openai_chat(
+        _itinerary_messages(payload, context),
+        functions=[OPENAI_ITINERARY_FUNCTION],
+        function_call={"name": OPENAI_ITINERARY_FUNCTION["name"]},
+    )
+    try:
+        async for delta in deltas:
+            fragment = (delta.get("function_call") or {}).get("arguments")
+            if not fragment:
+                continue
+            for raw_day in parser.feed(fragment):
+                try:
+                    day = optimize_day_route(json.loads(raw_day), destination=destination, events=events)
+                    yield "day", DayPlan(**day)
+                except (json.JSONDecodeError, ValueError) as exc:
+                    LOGGER.warning("Skipping invalid streamed day plan: %s", exc)
+    except CircuitOpenError:
+        LOGGER.warning("OpenAI circuit is open; streaming fallback itinerary")
+        itinerary = _fallback_itinerary(payload, context=context)
+        for day in itinerary["daily_plans"]:
+            yield "day", DayPlan(**day)
+        yield "itinerary", itinerary
+        return
+
+    try:
+        itinerary = json.loads(parser.text)
+    except json.JSONDecodeError as exc:  # pragma: no cover - defensive
+        LOGGER.exception("Failed to parse streamed itinerary; falling back", exc_info=exc)
+        yield "itinerary", _fallback_itinerary(payload, context=context)
+        return
+
+    yield "itinerary", _finalize_itinerary(itinerary, payload, context)
+
+
+def _itinerary_window_context(itinerary: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact the customization context to the dates the itinerary covers."""
+
+    start_date = coerce_date(itinerary.get("start_date"))
+    end_date = coerce_date(itinerary.get("end_date"), default=start_date)
+    return compact_context(context, start_date, end_date)
 
 
 async def adjust_itinerary(
@@ -405,8 +715,13 @@ async def adjust_itinerary(
     feedback: str,
     *,
     context: Dict[str, Any] | None = None,
+    mode: str = "full",
 ) -> Dict[str, Any]:
-    """Customize an existing itinerary using GPT with graceful fallback."""
+    """Customize an existing itinerary using GPT with graceful fallback.
+
+    ``mode="patch"`` asks the model for add/remove/replace operations only and
+    applies them locally, so output size follows the change rather than the trip.
+    """
 
     context = context or {}
     context.setdefault("feedback", feedback)
@@ -414,25 +729,31 @@ async def adjust_itinerary(
     if not settings.openai_api_key:
         return _fallback_adjustment(itinerary, feedback, context=context)
 
+    if mode == "patch":
+        return await _patch_itinerary(itinerary, feedback, context=context)
+
     prompt = context.get("prompt") or build_itinerary_prompt(itinerary)
     messages = [
         {"role": "system", "content": prompt},
         {
             "role": "user",
-            "content": json.dumps({
-                "current_itinerary": itinerary,
+            "content": build_user_content({
+                "current_itinerary": compact_itinerary(itinerary),
                 "feedback": feedback,
-                "events": context.get("events", []),
-                "weather": context.get("weather", []),
+                **_itinerary_window_context(itinerary, context),
             }),
         },
     ]
 
-    response = await _call_openai_chat(
-        messages,
-        functions=[OPENAI_ITINERARY_FUNCTION],
-        function_call={"name": OPENAI_ITINERARY_FUNCTION["name"]},
-    )
+    try:
+        response = await _call_openai_chat(
+            messages,
+            functions=[OPENAI_ITINERARY_FUNCTION],
+            function_call={"name": OPENAI_ITINERARY_FUNCTION["name"]},
+        )
+    except CircuitOpenError:
+        LOGGER.warning("OpenAI circuit is open; applying fallback adjustment")
+        return _fallback_adjustment(itinerary, feedback, context=context)
 
     try:
         choice = response["choices"][0]
@@ -447,9 +768,57 @@ async def adjust_itinerary(
     adjusted.setdefault("end_date", itinerary.get("end_date"))
     adjusted.setdefault("destination", itinerary.get("destination"))
     adjusted.setdefault("summary", itinerary.get("summary", ""))
-    adjusted["summary"] += (
-        " " if adjusted["summary"] else ""
-    ) + f"Feedback applied: {feedback}."
+    adjusted["change_note"] = f"Feedback applied: {feedback}."
+    return adjusted
+
+
+async def _patch_itinerary(
+    itinerary: Dict[str, Any],
+    feedback: str,
+    *,
+    context: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Request patch operations for ``feedback`` and apply them to ``itinerary``."""
+
+    prompt = context.get("prompt") or build_itinerary_prompt(itinerary)
+    messages = [
+        {
+            "role": "system",
+            "content": prompt
+            + " Return only the activity operations needed; activities are referenced by day date and index.",
+        },
+        {
+            "role": "user",
+            "content": build_user_content({
+                "itinerary_outline": patch_outline(itinerary),
+                "feedback": feedback,
+                **_itinerary_window_context(itinerary, context),
+            }),
+        },
+    ]
+
+    try:
+        response = await _call_openai_chat(
+            messages,
+            functions=[OPENAI_PATCH_FUNCTION],
+            function_call={"name": OPENAI_PATCH_FUNCTION["name"]},
+        )
+    except CircuitOpenError:
+        LOGGER.warning("OpenAI circuit is open; applying fallback adjustment")
+        return _fallback_adjustment(itinerary, feedback, context=context)
+
+    try:
+        choice = response["choices"][0]
+        arguments = choice["message"]["function_call"]["arguments"]
+        patch = json.loads(arguments)
+        adjusted = apply_itinerary_patch(itinerary, patch.get("operations", []))
+        Itinerary(**adjusted)
+    except (KeyError, IndexError, json.JSONDecodeError, ValueError) as exc:  # pragma: no cover - defensive
+        LOGGER.exception("Failed to apply itinerary patch; falling back", exc_info=exc)
+        return _fallback_adjustment(itinerary, feedback, context=context)
+
+    # Replace rather than append so repeated customizations do not grow the saved plan.
+    adjusted["change_note"] = patch.get("summary_note") or f"Feedback applied: {feedback}."
     return adjusted
 
 
@@ -476,12 +845,33 @@ def _fallback_chat_message(message: str, context: Dict[str, Any]) -> str:
     )
 
 
-async def generate_chat_reply(message: str, context: Dict[str, Any] | None = None) -> str:
-    """Return a GPT-powered chat reply with deterministic fallback."""
+def _compact_chat_context(context: Dict[str, Any]) -> Dict[str, Any]:
+    """Trim the chat context to what a companion reply needs."""
 
-    context = context or {}
-    if not settings.openai_api_key:
-        return _fallback_chat_message(message, context)
+    compacted = dict(context)
+    itinerary = context.get("itinerary")
+    if isinstance(itinerary, dict):
+        compacted["itinerary"] = compact_itinerary(itinerary)
+        start_date = coerce_date(itinerary.get("start_date"))
+        end_date = coerce_date(itinerary.get("end_date"), default=start_date)
+        compacted.update(compact_context(context, start_date, end_date))
+    elif isinstance(context.get("events"), list):
+        compacted["events"] = compact_events(context["events"])
+    return compacted
+
+
+def _chat_messages(
+    message: str,
+    context: Dict[str, Any],
+    *,
+    summary: str = "",
+    history: Sequence[Dict[str, str]] = (),
+) -> List[Dict[str, Any]]:
+    """Build the chat messages for a travel companion reply.
+
+    ``summary`` condenses earlier turns of a session and ``history`` carries
+    the recent turns verbatim as ``{"role", "content"}`` pairs.
+    """
 
     itinerary = context.get("itinerary")
     persona = itinerary.get("persona") if isinstance(itinerary, dict) else None
@@ -492,18 +882,112 @@ async def generate_chat_reply(message: str, context: Dict[str, Any] | None = Non
     if persona:
         system_prompt += f" Adopt the tone of a {persona} guide."
 
-    messages = [
-        {"role": "system", "content": system_prompt},
+    messages: List[Dict[str, Any]] = [{"role": "system", "content": system_prompt}]
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the conversation so far: {summary}"})
+    messages.extend({"role": turn["role"], "content": turn["content"]} for turn in history)
+    messages.append(
         {
             "role": "user",
-            "content": json.dumps({"message": message, "context": context}),
-        },
-    ]
+            "content": build_user_content({"message": message, **_compact_chat_context(context)}),
+        }
+    )
+    return messages
+
+
+async def generate_chat_reply(
+    message: str,
+    context: Dict[str, Any] | None = None,
+    *,
+    summary: str = "",
+    history: Sequence[Dict[str, str]] = (),
+) -> str:
+    """Return a GPT-powered chat reply with deterministic fallback."""
 
-    response = await _call_openai_chat(messages, temperature=0.6)
+    context = context or {}
+    if not settings.openai_api_key:
+        return _fallback_chat_message(message, context)
+
+    try:
+        response = await _call_openai_chat(
+            _chat_messages(message, context, summary=summary, history=history), temperature=0.6
+        )
+    except CircuitOpenError:
+        LOGGER.warning("OpenAI circuit is open; using fallback chat reply")
+        return _fallback_chat_message(message, context)
 
     try:
         return response["choices"][0]["message"]["content"].strip()
     except (KeyError, IndexError):  # pragma: no cover - defensive
         LOGGER.exception("OpenAI chat response missing content; using fallback")
         return _fallback_chat_message(message, context)
+
+
+async def stream_chat_reply(
+    message: str,
+    context: Dict[str, Any] | None = None,
+    *,
+    summary: str = "",
+    history: Sequence[Dict[str, str]] = (),
+) -> AsyncIterator[str]:
+    """Yield a GPT-powered chat reply token by token with deterministic fallback.
+
+    Closing the generator early closes the upstream response, which stops the
+    OpenAI generation.
+    """
+
+    context = context or {}
+    if not settings.openai_api_key:
+        yield _fallback_chat_message(message, context)
+        return
+
+    deltas = _stream_openai_chat(
+        _chat_messages(message, context, summary=summary, history=history), temperature=0.6
+    )
+    try:
+        async with aclosing(deltas):
+            async for delta in deltas:
+                content = delta.get("content")
+                if content:
+                    yield content
+    except CircuitOpenError:
+        LOGGER.warning("OpenAI circuit is open; using fallback chat reply")
+        yield _fallback_chat_message(message, context)
+
+
+def _fallback_conversation_summary(summary: str, turns: Sequence[Dict[str, str]]) -> str:
+    questions = "; ".join(turn["content"] for turn in turns if turn.get("role") == "user")
+    combined = (summary + " " if summary else "") + (f"Traveler asked about: {questions}." if questions else "")
+    limit = settings.chat_summary_max_chars
+    return combined if len(combined) <= limit else "…" + combined[-limit:]
+
+
+async def summarize_conversation(summary: str, turns: Sequence[Dict[str, str]]) -> str:
+    """Fold ``turns`` into the running conversation ``summary``."""
+
+    if not settings.openai_api_key:
+        return _fallback_conversation_summary(summary, turns)
+
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "Update the running summary of a conversation between a traveler and their travel "
+                "companion. Keep decisions, preferences and open questions; drop pleasantries. "
+                f"Reply with the summary only, under {settings.chat_summary_max_chars} characters."
+            ),
+        },
+        {
+            "role": "user",
+            "content": build_user_content({"summary": summary, "new_turns": list(turns)}, trim=()),
+        },
+    ]
+    try:
+        response = await _call_openai_chat(messages, temperature=0.2)
+        updated = response["choices"][0]["message"]["content"].strip()
+    except (CircuitOpenError, httpx.HTTPError, KeyError, IndexError) as exc:
+        LOGGER.warning("Conversation summarization failed; using fallback: %s", exc)
+        return _fallback_conversation_summary(summary, turns)
+    limit = settings.chat_summary_max_chars
+    # The prompt asks for the limit but the model may not keep to it.
+    return updated if len(updated) <= limit else updated[: limit - 1].rsplit(" ", 1)[0] + "…"
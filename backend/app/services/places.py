@@ -0,0 +1,201 @@
+"""Canonical place index built from the bundled offline gazetteer."""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import difflib
+import logging
+import re
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+from app.core.config import settings
+
+LOGGER = logging.getLogger(__name__)
+PLACES_FILE = Path(__file__).resolve().parent.parent / "data" / "places.csv"
+
+_PUNCTUATION = re.compile(r"[^\w\s'-]+")
+
+# Common country names and abbreviations that differ from the gazetteer's.
+COUNTRY_ALIASES = {
+    "usa": "US",
+    "united states of america": "US",
+    "america": "US",
+    "uk": "GB",
+    "great britain": "GB",
+    "england": "GB",
+    "scotland": "GB",
+    "holland": "NL",
+    "the netherlands": "NL",
+    "uae": "AE",
+    "czech republic": "CZ",
+    "korea": "KR",
+}
+
+
+class Place(NamedTuple):
+    """A canonical destination from the gazetteer."""
+
+    id: str
+    name: str
+    country_code: str
+    country: str
+    lat: float
+    lon: float
+    population: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}, {self.country}"
+
+
+def fold(text: str) -> str:
+    """Return ``text`` lower-cased without accents, punctuation or repeated whitespace."""
+
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_PUNCTUATION.sub(" ", stripped).split())
+
+
+class PlaceIndex:
+    """Folded place names and aliases mapped to gazetteer rows.
+
+    Exact lookups are dictionary hits and unmatched names fall back to fuzzy
+    matching over the sorted keys. Autocomplete bisects a sorted array holding
+    every word-start suffix of each name, so ``"york"`` finds New York.
+    """
+
+    def __init__(self, places: List[Place], aliases: Dict[str, List[int]]) -> None:
+        self.places = places
+        self._by_key = aliases
+        self.keys = sorted(aliases)
+        suffixes: List[Tuple[str, int, int]] = []
+        for key, indexes in aliases.items():
+            words = key.split(" ")
+            for position in range(len(words)):
+                suffix = " ".join(words[position:])
+                suffixes.extend((suffix, position, index) for index in indexes)
+        suffixes.sort()
+        self._suffixes = [suffix for suffix, _, _ in suffixes]
+        self._suffix_entries = [(position, index) for _, position, index in suffixes]
+        self._countries: Dict[str, str] = dict(COUNTRY_ALIASES)
+        for place in places:
+            self._countries[fold(place.country)] = place.country_code
+            self._countries[fold(place.country_code)] = place.country_code
+
+    @classmethod
+    def load(cls, path: Path = PLACES_FILE) -> "PlaceIndex":
+        places: List[Place] = []
+        aliases: Dict[str, List[int]] = {}
+        with path.open(encoding="utf-8", newline="") as handle:
+            for row in csv.DictReader(handle):
+                index = len(places)
+                places.append(
+                    Place(
+                        id=row["id"],
+                        name=row["name"],
+                        country_code=row["country_code"],
+                        country=row["country"],
+                        lat=float(row["latitude"]),
+                        lon=float(row["longitude"]),
+                        population=int(row["population"] or 0),
+                    )
+                )
+                names = [row["name"], *filter(None, (row["aliases"] or "").split("|"))]
+                for name in names:
+                    entries = aliases.setdefault(fold(name), [])
+                    if index not in entries:
+                        entries.append(index)
+        LOGGER.info("Loaded %s places from %s", len(places), path.name)
+        return cls(places, aliases)
+
+    def candidates(self, key: str) -> List[Place]:
+        """Return the places whose name or alias folds to ``key``, most populous first."""
+
+        places = [self.places[index] for index in self._by_key.get(key, [])]
+        return sorted(places, key=lambda place: place.population, reverse=True)
+
+    def suggest(self, query: str, limit: int) -> List[Place]:
+        """Return up to ``limit`` places with a name or alias word starting with ``query``.
+
+        Matches at the start of a name rank before matches on a later word;
+        within each group more populous places come first.
+        """
+
+        prefix = fold(query)
+        if not prefix:
+            return []
+        best: Dict[int, int] = {}
+        start = bisect.bisect_left(self._suffixes, prefix)
+        for offset in range(start, len(self._suffixes)):
+            if not self._suffixes[offset].startswith(prefix):
+                break
+            position, index = self._suffix_entries[offset]
+            best[index] = min(position, best.get(index, position))
+        ranked = sorted(best, key=lambda index: (best[index] > 0, -self.places[index].population))
+        return [self.places[index] for index in ranked[:limit]]
+
+    def country_code(self, text: str) -> str | None:
+        return self._countries.get(fold(text))
+
+    def _match(self, name: str, country_code: str | None) -> Place | None:
+        key = fold(name)
+        places = self.candidates(key)
+        if not places and len(key) >= 4:
+            close = difflib.get_close_matches(key, self.keys, n=1, cutoff=settings.places_fuzzy_cutoff)
+            places = self.candidates(close[0]) if close else []
+        if country_code:
+            places = [place for place in places if place.country_code == country_code]
+        return places[0] if places else None
+
+    def resolve(self, destination: str) -> Place | None:
+        """Resolve free text such as ``"paris"``, ``"Paris, FR"`` or ``"Paris France"``.
+
+        A trailing country (after a comma or as the final words) must agree with
+        the match; otherwise the destination is treated as unknown.
+        """
+
+        parts = [part.strip() for part in destination.split(",") if part.strip()]
+        if not parts:
+            return None
+        name, qualifiers = parts[0], parts[1:]
+        if qualifiers:
+            country_code = self.country_code(qualifiers[-1])
+            # A state or region we cannot check may name a different place, e.g. "Paris, Texas".
+            return self._match(name, country_code) if country_code else None
+
+        place = self._match(name, None)
+        if place is not None:
+            return place
+        words = name.split()
+        for split in range(len(words) - 1, 0, -1):
+            country_code = self.country_code(" ".join(words[split:]))
+            if country_code:
+                return self._match(" ".join(words[:split]), country_code)
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_place_index() -> PlaceIndex:
+    """Load the gazetteer on first use and share it for the process lifetime."""
+
+    return PlaceIndex.load()
+
+
+@lru_cache(maxsize=4096)
+def resolve_place(destination: str) -> Place | None:
+    """Return the canonical place for ``destination``, or ``None`` if it is not in the gazetteer."""
+
+    if not destination or not settings.places_index_enabled:
+        return None
+    return get_place_index().resolve(destination)
+
+
+def place_query(destination: str) -> str:
+    """Return the text to send upstream for ``destination``: its canonical label when known."""
+
+    place = resolve_place(destination)
+    return place.label if place else " ".join(destination.split())
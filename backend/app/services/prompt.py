@@ -0,0 +1,221 @@
+"""Compact prompt context and estimate input tokens for OpenAI calls."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Sequence
+
+from app.core.config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+# Event fields worth sending to the model; links and ids only cost tokens.
+PROMPT_EVENT_FIELDS = ("title", "description", "venue", "address", "start_time")
+
+# Per-message framing overhead used by the chat completions format.
+_TOKENS_PER_MESSAGE = 3
+_TOKENS_PER_REPLY = 3
+
+PROMPT_STATS: Dict[str, int] = {
+    "requests": 0,
+    "estimated_input_tokens": 0,
+    "max_input_tokens": 0,
+    "trimmed_items": 0,
+    "over_budget": 0,
+}
+
+
+_ENCODING: Any = None
+
+
+def _load_encoding() -> Any:
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as exc:  # pragma: no cover - encoding files unavailable offline
+        LOGGER.info("tiktoken encoding unavailable; estimating tokens heuristically: %s", exc)
+        return None
+
+
+async def load_encoding() -> None:
+    """Load the ``tiktoken`` encoding in a worker thread.
+
+    The first load may download the BPE file, so it must never run on the event
+    loop; until it finishes tokens are estimated heuristically.
+    """
+
+    global _ENCODING
+    if _ENCODING is None:
+        _ENCODING = await asyncio.to_thread(_load_encoding)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the tokens in ``text`` with ``tiktoken`` once loaded, else ~4 characters each."""
+
+    encoding = _ENCODING
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def estimate_request_tokens(payload: Dict[str, Any]) -> int:
+    """Estimate the input tokens of a chat completions request body."""
+
+    tokens = _TOKENS_PER_REPLY
+    for message in payload.get("messages", []):
+        tokens += _TOKENS_PER_MESSAGE + estimate_tokens(str(message.get("content") or ""))
+    if payload.get("functions"):
+        tokens += estimate_tokens(compact_json(payload["functions"]))
+    return tokens
+
+
+def record_request_tokens(payload: Dict[str, Any]) -> int:
+    """Estimate, log and count the input tokens of an outgoing request."""
+
+    tokens = estimate_request_tokens(payload)
+    PROMPT_STATS["requests"] += 1
+    PROMPT_STATS["estimated_input_tokens"] += tokens
+    PROMPT_STATS["max_input_tokens"] = max(PROMPT_STATS["max_input_tokens"], tokens)
+    LOGGER.info("OpenAI request estimated at %s input tokens", tokens)
+    return tokens
+
+
+def _prune(value: Any) -> Any:
+    """Drop empty fields recursively and render dates as ISO strings."""
+
+    if isinstance(value, dict):
+        pruned = {key: _prune(item) for key, item in value.items()}
+        return {key: item for key, item in pruned.items() if item not in (None, "", [], {})}
+    if isinstance(value, (list, tuple)):
+        return [item for item in (_prune(item) for item in value) if item not in (None, "", [], {})]
+    if isinstance(value, (date, timedelta)):
+        return str(value)
+    return value
+
+
+def _truncate(text: Any) -> Any:
+    limit = settings.prompt_description_max_chars
+    if not isinstance(text, str) or len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0].rstrip(",.;:") + "…"
+
+
+def compact_json(value: Any) -> str:
+    """Serialize ``value`` without whitespace or null fields."""
+
+    return json.dumps(_prune(value), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _window(start: date, end: date) -> set[str]:
+    return {(start + timedelta(days=offset)).isoformat() for offset in range((end - start).days + 1)}
+
+
+def context_in_window(context: Dict[str, Any], start: date, end: date) -> Dict[str, Any]:
+    """Return the weather and events that fall within ``start``..``end``."""
+
+    window = _window(start, end)
+    return {
+        "weather": [entry for entry in context.get("weather", []) if str(entry.get("date")) in window],
+        "events": [
+            event
+            for event in context.get("events", [])
+            if not event.get("start_time") or str(event["start_time"])[:10] in window
+        ],
+    }
+
+
+def compact_events(events: Iterable[Dict[str, Any]]) -> list[Dict[str, Any]]:
+    """Keep the prompt-relevant fields of up to ``prompt_max_events`` events."""
+
+    compacted = []
+    for event in list(events)[: settings.prompt_max_events]:
+        item = {field: event.get(field) for field in PROMPT_EVENT_FIELDS}
+        item["description"] = _truncate(item["description"])
+        compacted.append(item)
+    return compacted
+
+
+def compact_itinerary(itinerary: Dict[str, Any]) -> Dict[str, Any]:
+    """Return ``itinerary`` with truncated activity descriptions and no empty fields."""
+
+    compacted = dict(itinerary)
+    compacted.pop("timed_out_sources", None)
+    compacted["daily_plans"] = [
+        {
+            **day,
+            "activities": [
+                {**activity, "description": _truncate(activity.get("description"))}
+                for activity in day.get("activities", [])
+            ],
+        }
+        for day in itinerary.get("daily_plans", [])
+    ]
+    return compacted
+
+
+def compact_context(context: Dict[str, Any], start: date, end: date) -> Dict[str, Any]:
+    """Trim weather and events to the travel window and compact each event."""
+
+    windowed = context_in_window(context, start, end)
+    return {"weather": windowed["weather"], "events": compact_events(windowed["events"])}
+
+
+def build_user_content(
+    document: Dict[str, Any],
+    *,
+    trim: Sequence[str] = ("events", "weather"),
+    budget: int | None = None,
+) -> str:
+    """Serialize ``document`` compactly within the prompt token budget.
+
+    Items are dropped from the end of the ``trim`` lists, in order, until the
+    estimate fits ``prompt_max_context_tokens``. Each item is sized once and the
+    estimate scaled down by its share of the text as it is dropped, so the
+    document is serialized at most twice.
+    """
+
+    budget = settings.prompt_max_context_tokens if budget is None else budget
+    document = _prune(document)
+    content = compact_json(document)
+    tokens = estimate_tokens(content)
+    full_tokens, full_length = tokens, max(len(content), 1)
+    length = len(content)
+    dropped = 0
+    for key in trim:
+        items = document.get(key)
+        if tokens <= budget or not isinstance(items, list):
+            continue
+        # One extra character per item for the separating comma.
+        sizes = [len(compact_json(item)) + 1 for item in items]
+        while tokens > budget and items:
+            items.pop()
+            length -= sizes.pop()
+            tokens = full_tokens * length // full_length
+            dropped += 1
+
+    if dropped:
+        content = compact_json(document)
+        tokens = estimate_tokens(content)
+        PROMPT_STATS["trimmed_items"] += dropped
+        LOGGER.info("Trimmed %s context items to fit the %s token prompt budget", dropped, budget)
+    if tokens > budget:
+        PROMPT_STATS["over_budget"] += 1
+        LOGGER.warning("Prompt context is ~%s tokens, above the %s token budget", tokens, budget)
+    return content
+
+
+def prompt_stats() -> Dict[str, Any]:
+    """Return prompt size counters for monitoring."""
+
+    requests = PROMPT_STATS["requests"]
+    return {
+        **PROMPT_STATS,
+        "avg_input_tokens": round(PROMPT_STATS["estimated_input_tokens"] / requests, 1) if requests else 0.0,
+        "tokenizer": "tiktoken" if _ENCODING is not None else "heuristic",
+    }
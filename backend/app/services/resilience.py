@@ -0,0 +1,271 @@
+"""Retry, rate-limit and circuit-breaker policies for the OpenAI client."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict
+
+import httpx
+
+from app.core.config import settings
+
+LOGGER = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker is rejecting calls to a degraded provider."""
+
+
+class CircuitBreaker:
+    """Open after consecutive failed calls and allow a single trial call after a cool-down."""
+
+    def __init__(self, *, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Return whether a call may proceed, admitting one trial call when half-open.
+
+        The caller admitted as the trial must call :meth:`release_trial` once it
+        finishes, whatever the outcome.
+        """
+
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release_trial(self) -> None:
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                LOGGER.warning("OpenAI circuit opened after %s consecutive failures", self.failures)
+            self.opened_at = time.monotonic()
+
+
+class _Bucket:
+    """A token bucket refilled continuously up to a per-minute capacity."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.capacity / 60.0)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) * 60.0 / self.capacity
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+
+def _parse_duration(value: str | None) -> float | None:
+    """Parse OpenAI reset durations such as ``"20ms"``, ``"1s"`` or ``"6m0s"``."""
+
+    if not value:
+        return None
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class RateLimiter:
+    """Client-side request and token budget, tightened by provider rate-limit headers."""
+
+    def __init__(self, *, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self.requests = _Bucket(requests_per_minute)
+        self.tokens = _Bucket(tokens_per_minute)
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait until both budgets admit a request of ``estimated_tokens``."""
+
+        async with self._lock:
+            while True:
+                delay = max(
+                    self.blocked_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(estimated_tokens),
+                )
+                if delay <= 0:
+                    break
+                self.throttled += 1
+                await asyncio.sleep(min(delay, settings.openai_max_throttle_seconds))
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+
+    def update(self, headers: httpx.Headers) -> None:
+        """Pause new calls until reset when the provider reports an exhausted budget."""
+
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None or not remaining.isdigit() or int(remaining) > 0:
+                continue
+            reset = _parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            if reset:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + reset)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after-ms")
+    if value and value.replace(".", "", 1).isdigit():
+        return float(value) / 1000.0
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    """Full-jitter exponential backoff for the zero-based ``attempt``."""
+
+    ceiling = min(settings.openai_backoff_max_seconds, settings.openai_backoff_base_seconds * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+openai_breaker = CircuitBreaker(
+    failure_threshold=settings.openai_circuit_failure_threshold,
+    reset_timeout=settings.openai_circuit_reset_seconds,
+)
+openai_limiter = RateLimiter(
+    requests_per_minute=settings.openai_requests_per_minute,
+    tokens_per_minute=settings.openai_tokens_per_minute,
+)
+
+
+async def send_with_resilience(
+    send: Callable[[], Awaitable[httpx.Response]],
+    *,
+    estimated_tokens: int,
+) -> httpx.Response:
+    """Send an OpenAI request with budget throttling, retries and circuit breaking.
+
+    Retryable statuses and transport errors are retried with ``Retry-After`` or
+    jittered exponential backoff; the final failure is raised as ``httpx.HTTPError``.
+    Raises ``CircuitOpenError`` without calling the provider while the circuit is open.
+    The breaker counts one failure per call once its retries are exhausted, and
+    a cancelled call records nothing but still frees the half-open trial slot.
+    """
+
+    trial = openai_breaker.state == "half-open"
+    if not openai_breaker.allow():
+        raise CircuitOpenError("OpenAI is temporarily unavailable.")
+    try:
+        response = await _send_with_retries(send, estimated_tokens=estimated_tokens)
+    except httpx.HTTPStatusError as exc:
+        # Client errors still prove the provider is answering, so they count as healthy.
+        if exc.response.status_code in RETRYABLE_STATUS_CODES:
+            openai_breaker.record_failure()
+        else:
+            openai_breaker.record_success()
+        raise
+    except httpx.TransportError:
+        openai_breaker.record_failure()
+        raise
+    finally:
+        if trial:
+            openai_breaker.release_trial()
+    openai_breaker.record_success()
+    return response
+
+
+async def _send_with_retries(
+    send: Callable[[], Awaitable[httpx.Response]],
+    *,
+    estimated_tokens: int,
+) -> httpx.Response:
+    attempts = settings.openai_max_retries + 1
+    for attempt in range(attempts):
+        if attempt and openai_breaker.state == "open":
+            # Other calls opened the circuit meanwhile; stop adding load.
+            raise CircuitOpenError("OpenAI is temporarily unavailable.")
+        await openai_limiter.acquire(estimated_tokens)
+
+        try:
+            response = await send()
+        except httpx.TransportError as exc:
+            if attempt == attempts - 1:
+                raise
+            delay = _backoff(attempt)
+            LOGGER.warning("OpenAI request failed (%s); retrying in %.2fs", exc, delay)
+            await asyncio.sleep(delay)
+            continue
+
+        openai_limiter.update(response.headers)
+        if response.status_code not in RETRYABLE_STATUS_CODES:
+            if response.is_error:
+                await response.aclose()
+                response.raise_for_status()
+            return response
+
+        await response.aclose()
+        if attempt == attempts - 1:
+            response.raise_for_status()
+        delay = _retry_after(response)
+        if delay is None:
+            delay = _backoff(attempt)
+        delay = min(delay, settings.openai_backoff_max_seconds)
+        LOGGER.warning("OpenAI returned %s; retrying in %.2fs", response.status_code, delay)
+        await asyncio.sleep(delay)
+
+    raise RuntimeError("unreachable")  # pragma: no cover
+
+
+def resilience_stats() -> Dict[str, Any]:
+    """Return breaker and throttling state for monitoring."""
+
+    return {
+        "circuit": openai_breaker.state,
+        "consecutive_failures": openai_breaker.failures,
+        "throttled": openai_limiter.throttled,
+    }
@@ -0,0 +1,241 @@
+"""Route-aware ordering of each day's activities using a travel-time matrix."""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.places import resolve_place
+
+LOGGER = logging.getLogger(__name__)
+EARTH_RADIUS_KM = 6371.0088
+
+
+def activity_key(name: Any) -> str:
+    """Return ``name`` folded for matching activities and events regardless of case or spacing."""
+
+    return " ".join(str(name or "").casefold().split())
+
+
+def _valid_coordinates(value: Any) -> Dict[str, float] | None:
+    if not isinstance(value, dict):
+        return None
+    try:
+        lat, lng = float(value["lat"]), float(value["lng"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return {"lat": lat, "lng": lng}
+
+
+def travel_time_matrix(coordinates: np.ndarray) -> np.ndarray:
+    """Return estimated travel minutes between every pair of ``(lat, lng)`` rows.
+
+    Great-circle distances are scaled by ``routing_detour_factor`` to approximate
+    street distance and converted at ``routing_speed_kmh``.
+    """
+
+    radians = np.radians(coordinates)
+    lat, lng = radians[:, 0:1], radians[:, 1:2]
+    half_chord = (
+        np.sin((lat - lat.T) / 2) ** 2 + np.cos(lat) * np.cos(lat.T) * np.sin((lng - lng.T) / 2) ** 2
+    )
+    kilometres = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(half_chord, 0.0, 1.0)))
+    return kilometres * settings.routing_detour_factor / settings.routing_speed_kmh * 60.0
+
+
+def _two_opt(path: List[int], matrix: np.ndarray, left: int, right: int) -> List[int]:
+    """Improve ``path`` between the fixed ``left`` and ``right`` nodes by segment reversals.
+
+    Every candidate reversal is scored at once from the four edges it changes;
+    the best improving one is applied until none remains.
+    """
+
+    if len(path) < 2:
+        return path
+    route = np.array([left, *path, right])
+    first, last = np.triu_indices(len(path), 1)
+    first, last = first + 1, last + 1
+    for _ in range(settings.routing_max_iterations):
+        gain = (
+            matrix[route[first - 1], route[last]]
+            + matrix[route[first], route[last + 1]]
+            - matrix[route[first - 1], route[first]]
+            - matrix[route[last], route[last + 1]]
+        )
+        best = int(np.argmin(gain))
+        if gain[best] >= -1e-9:
+            break
+        i, j = first[best], last[best]
+        route[i : j + 1] = route[i : j + 1][::-1]
+    return route[1:-1].tolist()
+
+
+def order_stops(matrix: np.ndarray, anchored: Sequence[bool]) -> List[int]:
+    """Return a visiting order of the stops in ``matrix``, keeping anchored stops in place.
+
+    Free stops are placed into the free positions nearest-neighbour first and
+    each run of free positions between anchors is then refined with 2-opt.
+    """
+
+    count = len(anchored)
+    # An extra node at zero distance from every stop stands in for the open ends of the day.
+    padded = np.zeros((count + 1, count + 1))
+    padded[:count, :count] = matrix
+    open_end = count
+
+    remaining = [stop for stop in range(count) if not anchored[stop]]
+    order: List[int] = []
+    previous: int | None = None
+    for position in range(count):
+        if anchored[position]:
+            stop = position
+        elif previous is None:
+            stop = position
+        else:
+            stop = min(remaining, key=lambda candidate: matrix[previous, candidate])
+        if not anchored[position]:
+            remaining.remove(stop)
+        order.append(stop)
+        previous = stop
+
+    refined: List[int] = []
+    run: List[int] = []
+    left = open_end
+    for position, stop in enumerate(order):
+        if anchored[position]:
+            refined.extend(_two_opt(run, padded, left, stop))
+            refined.append(stop)
+            run, left = [], stop
+        else:
+            run.append(stop)
+    refined.extend(_two_opt(run, padded, left, open_end))
+    return refined
+
+
+def _route_minutes(matrix: np.ndarray, order: Sequence[int]) -> float:
+    stops = np.asarray(order)
+    return float(matrix[stops[:-1], stops[1:]].sum())
+
+
+def _event_details(events: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    return {activity_key(event.get("title")): event for event in events if event.get("title")}
+
+
+def _locate(activity: Dict[str, Any], event: Dict[str, Any] | None) -> Dict[str, float] | None:
+    """Return coordinates from the activity, its matching event, or a known place in its location."""
+
+    coordinates = _valid_coordinates(activity.get("coordinates"))
+    if coordinates is None and event is not None:
+        coordinates = _valid_coordinates(event.get("coordinates"))
+    if coordinates is None and activity.get("location"):
+        place = resolve_place(str(activity["location"]))
+        if place is not None:
+            coordinates = {"lat": place.lat, "lng": place.lon}
+    return coordinates
+
+
+def _is_anchored(activity: Dict[str, Any], event: Dict[str, Any] | None) -> bool:
+    """Return whether ``activity`` must keep its slot: a timed event or an anchor category."""
+
+    if event is not None and "T" in str(activity.get("start_time") or event.get("start_time") or ""):
+        return True
+    return str(activity.get("category") or "").casefold() in {
+        category.casefold() for category in settings.routing_anchor_categories
+    }
+
+
+def optimize_day(
+    day: Dict[str, Any],
+    *,
+    events: Dict[str, Dict[str, Any]],
+    default: Dict[str, float] | None,
+) -> Dict[str, Any]:
+    """Reorder ``day``'s activities to shorten travel and record its ``travel_minutes``.
+
+    Fixed-time events, anchor categories and activities that cannot be placed
+    keep their position; the other activities trade places and take over the
+    time slots of the positions they move into, so the day stays chronological.
+    """
+
+    activities: List[Dict[str, Any]] = list(day.get("activities") or [])
+    if all(activity.get("start_time") for activity in activities):
+        activities.sort(key=lambda activity: str(activity["start_time"]))
+
+    located: List[int] = []
+    anchored: List[bool] = []
+    points: List[List[float]] = []
+    for position, activity in enumerate(activities):
+        event = events.get(activity_key(activity.get("name")))
+        coordinates = _locate(activity, event)
+        if coordinates is not None:
+            activity["coordinates"] = coordinates
+        else:
+            # Unplaced activities are routed from the destination centre but not pinned there.
+            coordinates = default
+        if coordinates is None:
+            continue
+        located.append(position)
+        anchored.append(_is_anchored(activity, event))
+        points.append([coordinates["lat"], coordinates["lng"]])
+
+    day["activities"] = activities
+    if len(located) < 2:
+        day["travel_minutes"] = None
+        return day
+
+    matrix = travel_time_matrix(np.array(points))
+    order = order_stops(matrix, anchored)
+    slots = [
+        (activities[position].get("start_time"), activities[position].get("end_time"))
+        for position in located
+    ]
+    reordered = [activities[located[stop]] for stop in order]
+    for slot, position, activity, fixed in zip(slots, located, reordered, anchored):
+        if not fixed:
+            activity["start_time"], activity["end_time"] = slot
+        activities[position] = activity
+    day["travel_minutes"] = round(_route_minutes(matrix, order), 1)
+    return day
+
+
+def optimize_day_route(
+    day: Dict[str, Any],
+    *,
+    destination: str,
+    events: Iterable[Dict[str, Any]] = (),
+) -> Dict[str, Any]:
+    """Reorder one day plan in place for shorter travel between its activities.
+
+    Activities without coordinates are placed at the destination's gazetteer
+    coordinates when it is a known place.
+    """
+
+    if not settings.routing_enabled:
+        return day
+
+    place = resolve_place(destination)
+    default = {"lat": place.lat, "lng": place.lon} if place else None
+    try:
+        optimize_day(day, events=_event_details(events), default=default)
+    except (TypeError, ValueError) as exc:  # pragma: no cover - defensive
+        LOGGER.warning("Route optimization skipped for %s: %s", day.get("date"), exc)
+    return day
+
+
+def optimize_itinerary_routes(
+    itinerary: Dict[str, Any],
+    *,
+    events: Iterable[Dict[str, Any]] = (),
+) -> Dict[str, Any]:
+    """Reorder every day of ``itinerary`` in place with :func:`optimize_day_route`."""
+
+    destination = str(itinerary.get("destination") or "")
+    events = list(events)
+    for day in itinerary.get("daily_plans") or []:
+        optimize_day_route(day, destination=destination, events=events)
+    return itinerary
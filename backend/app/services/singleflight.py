@@ -0,0 +1,61 @@
+"""Request coalescing so concurrent identical upstream lookups share one call."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_REGISTRY: Dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """Deduplicate in-flight coroutine calls that share the same key.
+
+    The first caller for a key starts the call; callers arriving while it is
+    still running await the same result instead of issuing their own request.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: Dict[Hashable, asyncio.Future[Any]] = {}
+        SINGLEFLIGHT_REGISTRY[name] = self
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``func()``, sharing it with concurrent callers for ``key``."""
+
+        self.calls += 1
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(func())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._release(key, done))
+        # Shield so a cancelled caller does not cancel the call other waiters depend on.
+        return await asyncio.shield(future)
+
+    def _release(self, key: Hashable, future: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved when every waiter has gone away.
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call and coalescing counters for monitoring."""
+
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
+
+
+def singleflight_stats() -> Dict[str, Dict[str, Any]]:
+    """Return statistics for every registered single-flight group."""
+
+    return {name: group.stats() for name, group in SINGLEFLIGHT_REGISTRY.items()}
@@ -1,12 +1,26 @@
 """Persistence helpers for itineraries."""
-from typing import Any, Dict, List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Tuple
 
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DESCENDING, InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from app.core.config import settings
 from app.db.session import get_mongo_client
 
+DUPLICATE_KEY_ERROR = 11000
+
+SUMMARY_PROJECTION = {
+    "destination": 1,
+    "start_date": 1,
+    "end_date": 1,
+    "persona": 1,
+    "summary": 1,
+    "created_at": 1,
+}
+
 
 def _serialize_document(document: Dict[str, Any]) -> Dict[str, Any]:
     """Convert MongoDB specific fields into JSON-friendly values."""
@@ -16,17 +30,195 @@ def _serialize_document(document: Dict[str, Any]) -> Dict[str, Any]:
     return serialized
 
 
+def _prepare_write(data: Dict[str, Any], now: datetime) -> Tuple[Dict[str, Any] | None, Dict[str, Any]]:
+    """Return ``(filter, update)`` for trips with a ``trip_id`` or ``(None, document)`` to insert."""
+    document = {key: value for key, value in data.items() if key not in ("_id", "id", "created_at")}
+    if document.get("trip_id"):
+        upsert_filter = {"user_id": document.get("user_id"), "trip_id": document["trip_id"]}
+        update = {"$set": {**document, "updated_at": now}, "$setOnInsert": {"created_at": now}}
+        return upsert_filter, update
+    return None, {**document, "_id": ObjectId(), "created_at": now}
+
+
 async def save_itinerary(data: Dict[str, Any]) -> str:
-    """Persist itinerary data and return the inserted document ID."""
+    """Persist itinerary data and return its document ID.
+
+    Itineraries carrying a client-supplied ``trip_id`` replace the user's
+    previous save of that trip instead of creating a duplicate.
+    """
     client: AsyncIOMotorClient = get_mongo_client()
     collection = client[settings.mongo_database]["itineraries"]
-    result = await collection.insert_one(data)
-    return str(result.inserted_id)
+    upsert_filter, document = _prepare_write(data, datetime.utcnow())
+    if upsert_filter is None:
+        result = await collection.insert_one(document)
+        return str(result.inserted_id)
+    try:
+        saved = await _upsert_trip(collection, upsert_filter, document)
+    except DuplicateKeyError:
+        # A concurrent save inserted the trip first; this attempt now matches and updates it.
+        saved = await _upsert_trip(collection, upsert_filter, document)
+    return str(saved["_id"])
+
+
+async def _upsert_trip(
+    collection: Any,
+    upsert_filter: Dict[str, Any],
+    update: Dict[str, Any],
+) -> Dict[str, Any]:
+    return await collection.find_one_and_update(
+        upsert_filter,
+        update,
+        upsert=True,
+        projection={"_id": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def _bulk_write(collection: Any, operations: List[Any]) -> Dict[str, Any]:
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        return result.bulk_api_result
+    except BulkWriteError as exc:
+        return exc.details
+
+
+async def bulk_save_itineraries(itineraries: List[Any]) -> List[Dict[str, Any]]:
+    """Insert or upsert many itineraries in one unordered bulk write.
+
+    Returns one status entry per input, in order: ``created`` with the new
+    ``itinerary_id``, ``updated`` with the ``user_id`` and ``trip_id`` that key
+    the existing trip (bulk writes do not report matched ids, and fetching
+    them would cost another round trip), or ``error`` with a message. Upserts
+    that lose a race with a concurrent insert of the same trip are retried
+    once as updates.
+    """
+    if not itineraries:
+        return []
+    client: AsyncIOMotorClient = get_mongo_client()
+    collection = client[settings.mongo_database]["itineraries"]
+    now = datetime.utcnow()
+    positions = [index for index, itinerary in enumerate(itineraries) if isinstance(itinerary, dict)]
+    writes = [_prepare_write(itineraries[index], now) for index in positions]
+    operations = [
+        InsertOne(document) if upsert_filter is None else UpdateOne(upsert_filter, document, upsert=True)
+        for upsert_filter, document in writes
+    ]
+
+    upserted: Dict[int, Any] = {}
+    errors: Dict[int, str] = {}
+    pending = list(range(len(operations)))
+    for attempt in range(2):
+        if not pending:
+            break
+        details = await _bulk_write(collection, [operations[number] for number in pending])
+        upserted.update({pending[item["index"]]: item["_id"] for item in details.get("upserted", [])})
+        retry: List[int] = []
+        for item in details.get("writeErrors", []):
+            number = pending[item["index"]]
+            if attempt == 0 and item.get("code") == DUPLICATE_KEY_ERROR and writes[number][0] is not None:
+                retry.append(number)
+            else:
+                errors[number] = item.get("errmsg", "write failed")
+        pending = retry
+
+    statuses: List[Dict[str, Any]] = [
+        {"index": index, "trip_id": None, "status": "error", "error": "Itinerary must be a JSON object"}
+        for index in range(len(itineraries))
+    ]
+    for number, (index, (upsert_filter, document)) in enumerate(zip(positions, writes)):
+        status: Dict[str, Any] = {"index": index, "trip_id": itineraries[index].get("trip_id")}
+        if number in errors:
+            status.update(status="error", error=errors[number])
+        elif upsert_filter is None:
+            status.update(status="created", itinerary_id=str(document["_id"]))
+        elif number in upserted:
+            status.update(status="created", itinerary_id=str(upserted[number]))
+        else:
+            status.update(status="updated", user_id=upsert_filter["user_id"])
+        statuses[index] = status
+    return statuses
+
+
+async def list_itinerary_page(
+    user_id: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """Return one page of a user's itineraries, newest first, with a keyset cursor.
+
+    Pages are ordered by ``_id`` descending; ``next_cursor`` is the last ``_id``
+    on the page and is ``None`` once the history is exhausted. Summary fields
+    are projected unless ``full`` is set.
+    """
+    query: Dict[str, Any] = {"user_id": user_id}
+    if cursor:
+        if not ObjectId.is_valid(cursor):
+            raise ValueError("Invalid cursor")
+        query["_id"] = {"$lt": ObjectId(cursor)}
+
+    client: AsyncIOMotorClient = get_mongo_client()
+    collection = client[settings.mongo_database]["itineraries"]
+    projection = None if full else SUMMARY_PROJECTION
+    documents = await (
+        collection.find(query, projection).sort("_id", DESCENDING).limit(limit + 1).to_list(length=limit + 1)
+    )
+
+    next_cursor = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        next_cursor = str(documents[-1]["_id"])
+    return {"trips": [_serialize_document(document) for document in documents], "next_cursor": next_cursor}
+
+
+async def get_itinerary(user_id: str, itinerary_id: str) -> Dict[str, Any] | None:
+    """Fetch a single full itinerary owned by ``user_id``."""
+    if not ObjectId.is_valid(itinerary_id):
+        return None
+    client: AsyncIOMotorClient = get_mongo_client()
+    collection = client[settings.mongo_database]["itineraries"]
+    document = await collection.find_one({"_id": ObjectId(itinerary_id), "user_id": user_id})
+    return _serialize_document(document) if document else None
+
+
+async def update_itinerary(user_id: str, itinerary_id: str, changes: Dict[str, Any]) -> bool:
+    """Apply ``changes`` to a saved itinerary and report whether it was found."""
+    if not ObjectId.is_valid(itinerary_id):
+        return False
+    client: AsyncIOMotorClient = get_mongo_client()
+    collection = client[settings.mongo_database]["itineraries"]
+    result = await collection.update_one(
+        {"_id": ObjectId(itinerary_id), "user_id": user_id},
+        {"$set": {**changes, "updated_at": datetime.utcnow()}},
+    )
+    return result.matched_count > 0
+
+
+async def iter_itineraries(
+    *,
+    user_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Stream serialized itineraries from a batched cursor without materializing them.
 
+    Filters by owner when ``user_id`` is given and by ``created_at`` within
+    ``[since, until)`` when either bound is set.
+    """
+    query: Dict[str, Any] = {}
+    if user_id is not None:
+        query["user_id"] = user_id
+    created_at: Dict[str, datetime] = {}
+    if since is not None:
+        created_at["$gte"] = since
+    if until is not None:
+        created_at["$lt"] = until
+    if created_at:
+        query["created_at"] = created_at
 
-async def list_itineraries(user_id: str) -> List[Dict[str, Any]]:
-    """Retrieve itineraries for a given user."""
     client: AsyncIOMotorClient = get_mongo_client()
     collection = client[settings.mongo_database]["itineraries"]
-    cursor = collection.find({"user_id": user_id})
-    return [_serialize_document(document) async for document in cursor]
+    cursor = collection.find(query).batch_size(settings.export_batch_size)
+    async for document in cursor:
+        yield _serialize_document(document)
@@ -0,0 +1,113 @@
+"""Incremental extraction of array items from a streamed JSON document."""
+
+from __future__ import annotations
+
+from typing import List
+
+
+class JSONArrayItemStream:
+    """Emit each complete object of a top-level array field as its JSON text arrives.
+
+    Feed the document in arbitrary chunks; every call returns the raw JSON for
+    the objects in ``key`` that were completed by that chunk. The scanner only
+    tracks string/escape state and nesting depth, and keeps just the chunks of
+    the item or string still open, joining them once when it completes, so it
+    stays linear in the size of the document.
+    """
+
+    def __init__(self, key: str) -> None:
+        self.key = key
+        self._chunks: List[str] = []
+        # Earlier chunks still needed by an open item or string, starting at ``_offset``.
+        self._pending: List[str] = []
+        self._offset = 0
+        self._position = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_top_level_string: str | None = None
+        self._array_depth: int | None = None
+        self._array_closed = False
+        self._item_start: int | None = None
+
+    def feed(self, chunk: str) -> List[str]:
+        """Consume ``chunk`` and return the array items it completed."""
+
+        self._chunks.append(chunk)
+        # Positions are absolute; ``chunk`` starts at ``base``.
+        base = self._position
+        items: List[str] = []
+        for index, char in enumerate(chunk, start=base):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_top_level_string = self._slice(chunk, base, self._string_start + 1, index)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char in "{[":
+                if (
+                    char == "["
+                    and self._array_depth is None
+                    and len(self._stack) == 1
+                    and self._last_top_level_string == self.key
+                ):
+                    self._array_depth = len(self._stack) + 1
+                self._stack.append(char)
+                if char == "{" and self._collecting and len(self._stack) == self._array_depth + 1:
+                    self._item_start = index
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._collecting:
+                    continue
+                if char == "}" and self._item_start is not None and len(self._stack) == self._array_depth:
+                    items.append(self._slice(chunk, base, self._item_start, index + 1))
+                    self._item_start = None
+                elif char == "]" and len(self._stack) == self._array_depth - 1:
+                    self._array_closed = True
+
+        self._position = base + len(chunk)
+        self._trim(chunk, base)
+        return items
+
+    def _slice(self, chunk: str, base: int, start: int, end: int) -> str:
+        """Return the document text from absolute ``start`` to ``end``, which lies within ``chunk``."""
+
+        if start >= base:
+            return chunk[start - base : end - base]
+        return "".join(self._pending)[start - self._offset :] + chunk[: end - base]
+
+    def _trim(self, chunk: str, base: int) -> None:
+        """Keep only the text an open item or string still needs."""
+
+        keep = self._position
+        if self._item_start is not None:
+            keep = min(keep, self._item_start)
+        if self._in_string:
+            keep = min(keep, self._string_start)
+        if keep >= base:
+            self._pending = [chunk[keep - base :]] if keep < self._position else []
+        else:
+            self._pending.append(chunk)
+            if keep > self._offset:
+                self._pending = ["".join(self._pending)[keep - self._offset :]]
+        self._offset = keep
+
+    @property
+    def text(self) -> str:
+        """Return the whole document fed so far."""
+
+        return "".join(self._chunks)
+
+    @property
+    def _collecting(self) -> bool:
+        return self._array_depth is not None and not self._array_closed
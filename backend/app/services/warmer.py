@@ -0,0 +1,181 @@
+"""Background refresh of upstream caches for the most requested destinations."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+
+from app.core.config import settings
+from app.services.cache import normalize_destination
+from app.services.events import warm_city_events
+from app.services.maps import warm_map_points
+from app.services.places import place_query
+from app.services.weather import warm_weather_forecast
+
+LOGGER = logging.getLogger(__name__)
+
+# Scores below this after decay are forgotten so the tracker stays small.
+_MIN_SCORE = 0.05
+
+
+class DestinationPopularity:
+    """Request counts per destination that decay by a factor on every warm cycle."""
+
+    def __init__(self) -> None:
+        self._scores: Dict[str, float] = {}
+        self._names: Dict[str, str] = {}
+
+    def record(self, destination: str) -> None:
+        key = normalize_destination(destination)
+        if not key:
+            return
+        if key not in self._scores:
+            # Make room by forgetting the least requested destinations.
+            while self._scores and len(self._scores) >= max(settings.warmer_max_tracked_destinations, 1):
+                lowest = min(self._scores, key=self._scores.__getitem__)
+                del self._scores[lowest]
+                del self._names[lowest]
+        self._scores[key] = self._scores.get(key, 0.0) + 1.0
+        self._names.setdefault(key, place_query(destination))
+
+    def top(self, count: int) -> List[str]:
+        """Return the display names of the ``count`` highest scoring destinations."""
+
+        ranked = sorted(self._scores, key=self._scores.__getitem__, reverse=True)
+        return [self._names[key] for key in ranked[:count]]
+
+    def decay(self, factor: float) -> None:
+        for key in list(self._scores):
+            self._scores[key] *= factor
+            if self._scores[key] < _MIN_SCORE:
+                del self._scores[key]
+                del self._names[key]
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+popularity = DestinationPopularity()
+
+
+def record_destination(destination: str) -> None:
+    """Count a request for ``destination`` towards cache warming when the warmer is enabled."""
+
+    if settings.warmer_enabled:
+        popularity.record(destination)
+
+
+class CacheWarmer:
+    """Periodically refresh weather, events and map-pin caches for top destinations.
+
+    Each run refreshes entries that are missing or would expire before the next
+    run, with bounded concurrency and a per-minute cap on refresh starts.
+    """
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.refreshed = 0
+        self.failed = 0
+        self.last_run_at: datetime | None = None
+        self.last_destinations: List[str] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def _destinations(self) -> List[str]:
+        """Merge configured seed destinations with the most popular recent ones."""
+
+        limit = settings.warmer_top_destinations
+        selected: Dict[str, str] = {}
+        for destination in [*settings.warmer_seed_destinations, *popularity.top(limit)]:
+            selected.setdefault(normalize_destination(destination), destination)
+        return list(selected.values())[:limit]
+
+    async def _refresh(self, semaphore: asyncio.Semaphore, name: str, warm: Callable[[], Awaitable[bool]]) -> None:
+        async with semaphore:
+            try:
+                if await warm():
+                    self.refreshed += 1
+            except (httpx.HTTPError, asyncio.TimeoutError) as exc:
+                self.failed += 1
+                LOGGER.warning("Cache warm-up %s failed: %s", name, exc)
+
+    async def run_once(self) -> None:
+        """Warm the caches for the current top destinations once."""
+
+        destinations = self._destinations()
+        popularity.decay(settings.warmer_popularity_decay)
+        within = settings.warmer_interval_seconds
+        semaphore = asyncio.Semaphore(settings.warmer_max_concurrency)
+        rate = settings.warmer_refreshes_per_minute
+        spacing = 60.0 / rate if rate > 0 else 0.0
+
+        tasks: List[asyncio.Task[None]] = []
+        try:
+            await self._schedule(destinations, tasks, semaphore, spacing=spacing, within=within)
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        self.runs += 1
+        self.last_run_at = datetime.utcnow()
+        self.last_destinations = destinations
+        LOGGER.info("Cache warmer run %s covered %s destinations", self.runs, len(destinations))
+
+    async def _schedule(
+        self,
+        destinations: List[str],
+        tasks: List[asyncio.Task[None]],
+        semaphore: asyncio.Semaphore,
+        *,
+        spacing: float,
+        within: float,
+    ) -> None:
+        """Start one refresh task per destination and provider, ``spacing`` seconds apart."""
+
+        for destination in destinations:
+            jobs: List[tuple[str, Callable[[], Awaitable[bool]]]] = []
+            if settings.weather_api_key:
+                jobs.append((f"weather:{destination}", lambda d=destination: warm_weather_forecast(d)))
+            if settings.events_api_key:
+                jobs.append((f"events:{destination}", lambda d=destination: warm_city_events(d, within=within)))
+            if settings.maps_api_key:
+                jobs.append((f"maps:{destination}", lambda d=destination: warm_map_points(d, within=within)))
+            for name, warm in jobs:
+                if tasks:
+                    await asyncio.sleep(spacing)
+                tasks.append(asyncio.create_task(self._refresh(semaphore, name, warm)))
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as exc:  # pragma: no cover - keep the warmer alive
+                LOGGER.warning("Cache warmer run failed: %s", exc)
+            await asyncio.sleep(settings.warmer_interval_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "destinations": self.last_destinations,
+            "tracked_destinations": len(popularity),
+        }
+
+
+cache_warmer = CacheWarmer()
@@ -3,19 +3,46 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
 import httpx
+from pymongo.errors import PyMongoError
 
 from app.core.config import settings
+from app.db.session import get_mongo_client
+from app.services.cache import TTLCache, normalize_destination
+from app.services.http import get_http_client
+from app.services.places import place_query, resolve_place
+from app.services.singleflight import SingleFlight
 
 LOGGER = logging.getLogger(__name__)
+GEOCODE_COLLECTION = "geocodes"
+FORECAST_ISSUE_PERIOD_SECONDS = 3 * 3600
+
+geocode_cache: TTLCache[tuple[float, float]] = TTLCache(
+    "geocode",
+    maxsize=settings.geocode_cache_size,
+    ttl=settings.geocode_cache_ttl_seconds,
+)
+geocode_miss_cache: TTLCache[bool] = TTLCache(
+    "geocode_misses",
+    maxsize=settings.geocode_cache_size,
+    ttl=settings.geocode_negative_ttl_seconds,
+)
+forecast_cache: TTLCache[Dict[str, Dict[str, Any]]] = TTLCache(
+    "forecast",
+    maxsize=settings.forecast_cache_size,
+    ttl=FORECAST_ISSUE_PERIOD_SECONDS,
+)
+geocode_flight = SingleFlight("geocode")
+forecast_flight = SingleFlight("weather")
 
 
 async def _geocode_destination(client: httpx.AsyncClient, destination: str) -> tuple[float, float] | None:
-    params = {"q": destination, "limit": 1, "appid": settings.weather_api_key}
+    params = {"q": place_query(destination), "limit": 1, "appid": settings.weather_api_key}
     response = await client.get("https://api.openweathermap.org/geo/1.0/direct", params=params)
     response.raise_for_status()
     data = response.json()
@@ -25,48 +52,98 @@ async def _geocode_destination(client: httpx.AsyncClient, destination: str) -> t
     return float(first["lat"]), float(first["lon"])
 
 
-def _daterange(start: datetime, end: datetime) -> List[str]:
-    days: List[str] = []
-    cursor = start
-    while cursor <= end:
-        days.append(cursor.date().isoformat())
-        cursor += timedelta(days=1)
-    return days
+def _geocode_store_enabled() -> bool:
+    return settings.geocode_cache_persist and bool(settings.mongo_connection_string)
 
 
-async def fetch_weather_forecast(destination: str, start_date: str, end_date: str) -> List[Dict[str, Any]]:
-    """Fetch a five-day forecast and group data by day."""
+async def _load_stored_coordinates(key: str) -> tuple[float, float] | None:
+    if not _geocode_store_enabled():
+        return None
+    collection = get_mongo_client()[settings.mongo_database][GEOCODE_COLLECTION]
+    try:
+        document = await collection.find_one({"_id": key})
+    except PyMongoError as exc:
+        LOGGER.warning("Geocode store lookup failed for %s: %s", key, exc)
+        return None
+    if not document:
+        return None
+    return float(document["lat"]), float(document["lon"])
 
-    if not settings.weather_api_key or not destination:
-        return []
 
+async def _store_coordinates(key: str, coordinates: tuple[float, float]) -> None:
+    if not _geocode_store_enabled():
+        return
+    collection = get_mongo_client()[settings.mongo_database][GEOCODE_COLLECTION]
+    lat, lon = coordinates
     try:
-        start = datetime.fromisoformat(start_date)
-        end = datetime.fromisoformat(end_date)
-    except ValueError:
-        start = datetime.utcnow()
-        end = start + timedelta(days=4)
+        await collection.update_one(
+            {"_id": key},
+            {"$set": {"lat": lat, "lon": lon, "updated_at": datetime.utcnow()}},
+            upsert=True,
+        )
+    except PyMongoError as exc:
+        LOGGER.warning("Geocode store write failed for %s: %s", key, exc)
+
+
+async def _resolve_coordinates(client: httpx.AsyncClient, destination: str) -> tuple[float, float] | None:
+    """Return destination coordinates from the gazetteer, the cache, the shared store, or the geo API.
+
+    Destinations the geocoder cannot find are remembered briefly so repeated
+    requests for them do not call it again.
+    """
+
+    place = resolve_place(destination)
+    if place is not None:
+        return place.lat, place.lon
+
+    key = normalize_destination(destination)
+    coordinates = geocode_cache.get(key)
+    if coordinates is not None:
+        return coordinates
+    if geocode_miss_cache.get(key):
+        return None
+    return await geocode_flight.do(key, lambda: _lookup_coordinates(client, key, destination))
+
+
+async def _lookup_coordinates(
+    client: httpx.AsyncClient,
+    key: str,
+    destination: str,
+) -> tuple[float, float] | None:
+    coordinates = await _load_stored_coordinates(key)
+    if coordinates is None:
+        coordinates = await _geocode_destination(client, destination)
+        if coordinates is None:
+            geocode_miss_cache.set(key, True)
+            return None
+        await _store_coordinates(key, coordinates)
+
+    geocode_cache.set(key, coordinates)
+    return coordinates
+
+
+def _forecast_cache_key(lat: float, lon: float) -> tuple[float, float]:
+    """Round coordinates so nearby lookups for the same city share a forecast."""
+
+    precision = settings.forecast_cache_coordinate_precision
+    return round(lat, precision), round(lon, precision)
+
+
+def _next_forecast_refresh(now: float) -> float:
+    """Return when the provider's next 3-hourly forecast issue should be available.
+
+    Within the grace window after an issue the provider may still serve the
+    previous one, so that issue's own availability time is returned.
+    """
+
+    period = FORECAST_ISSUE_PERIOD_SECONDS
+    grace = settings.forecast_cache_grace_seconds
+    return ((now - grace) // period + 1) * period + grace
+
+
+def _aggregate_forecast(forecast: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Collapse 3-hour forecast entries into one summary per day keyed by ISO date."""
 
-    async with httpx.AsyncClient(timeout=httpx.Timeout(20.0)) as client:
-        try:
-            coordinates = await _geocode_destination(client, destination)
-        except httpx.HTTPError as exc:
-            LOGGER.warning("Failed to geocode destination %s: %s", destination, exc)
-            return []
-
-        if not coordinates:
-            return []
-
-        lat, lon = coordinates
-        params = {"lat": lat, "lon": lon, "appid": settings.weather_api_key, "units": "metric"}
-        try:
-            response = await client.get("https://api.openweathermap.org/data/2.5/forecast", params=params)
-            response.raise_for_status()
-        except httpx.HTTPError as exc:
-            LOGGER.warning("Failed to fetch weather forecast: %s", exc)
-            return []
-
-    forecast = response.json()
     grouped: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"temps": [], "conditions": []})
     for entry in forecast.get("list", []):
         timestamp = entry.get("dt")
@@ -78,23 +155,113 @@ async def fetch_weather_forecast(destination: str, start_date: str, end_date: st
         if condition:
             grouped[day]["conditions"].append(condition)
 
-    results: List[Dict[str, Any]] = []
-    for day in _daterange(start, end):
-        bucket = grouped.get(day)
-        if not bucket or not bucket["temps"]:
-            continue
+    daily: Dict[str, Dict[str, Any]] = {}
+    for day, bucket in grouped.items():
         temps = [temp for temp in bucket["temps"] if temp is not None]
         if not temps:
             continue
         conditions = bucket["conditions"] or ["Clear"]
         dominant_condition = max(set(conditions), key=conditions.count)
-        results.append(
-            {
-                "date": day,
-                "condition": dominant_condition,
-                "temperature_high": round(max(temps)),
-                "temperature_low": round(min(temps)),
-            }
-        )
+        daily[day] = {
+            "date": day,
+            "condition": dominant_condition,
+            "temperature_high": round(max(temps)),
+            "temperature_low": round(min(temps)),
+        }
+    return daily
 
-    return results
+
+def _daterange(start: datetime, end: datetime) -> List[str]:
+    days: List[str] = []
+    cursor = start
+    while cursor <= end:
+        days.append(cursor.date().isoformat())
+        cursor += timedelta(days=1)
+    return days
+
+
+async def fetch_weather_forecast(
+    destination: str,
+    start_date: str,
+    end_date: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> List[Dict[str, Any]]:
+    """Fetch a five-day forecast grouped by day, served from cache between forecast issues.
+
+    Concurrent callers for the same location share one upstream fetch whatever
+    their date windows; each receives its own copy of the days it asked for.
+    """
+
+    if not settings.weather_api_key or not destination:
+        return []
+
+    try:
+        start = datetime.fromisoformat(start_date)
+        end = datetime.fromisoformat(end_date)
+    except ValueError:
+        start = datetime.utcnow()
+        end = start + timedelta(days=4)
+
+    client = client or get_http_client("weather")
+    try:
+        coordinates = await _resolve_coordinates(client, destination)
+    except httpx.HTTPError as exc:
+        LOGGER.warning("Failed to geocode destination %s: %s", destination, exc)
+        return []
+
+    if not coordinates:
+        return []
+
+    daily = await _daily_forecast(client, coordinates)
+    if daily is None:
+        return []
+    return [dict(daily[day]) for day in _daterange(start, end) if day in daily]
+
+
+async def warm_weather_forecast(destination: str) -> bool:
+    """Populate the geocode and forecast caches for ``destination``.
+
+    Forecasts only change at each provider issue, so an upstream call is made
+    only when no forecast is cached. Returns whether one was made.
+    """
+
+    if not settings.weather_api_key or not destination:
+        return False
+    client = get_http_client("weather")
+    coordinates = await _resolve_coordinates(client, destination)
+    if not coordinates or forecast_cache.expires_in(_forecast_cache_key(*coordinates)) is not None:
+        return False
+    await _daily_forecast(client, coordinates)
+    return True
+
+
+async def _daily_forecast(
+    client: httpx.AsyncClient,
+    coordinates: tuple[float, float],
+) -> Dict[str, Dict[str, Any]] | None:
+    """Return the cached daily forecast for ``coordinates``, fetching it once for concurrent callers."""
+
+    key = _forecast_cache_key(*coordinates)
+    daily = forecast_cache.get(key)
+    if daily is not None:
+        return daily
+    return await forecast_flight.do(key, lambda: _fetch_daily_forecast(client, key, coordinates))
+
+
+async def _fetch_daily_forecast(
+    client: httpx.AsyncClient,
+    key: tuple[float, float],
+    coordinates: tuple[float, float],
+) -> Dict[str, Dict[str, Any]] | None:
+    lat, lon = coordinates
+    params = {"lat": lat, "lon": lon, "appid": settings.weather_api_key, "units": "metric"}
+    try:
+        response = await client.get("https://api.openweathermap.org/data/2.5/forecast", params=params)
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        LOGGER.warning("Failed to fetch weather forecast: %s", exc)
+        return None
+    daily = _aggregate_forecast(response.json())
+    forecast_cache.set(key, daily, expires_at=_next_forecast_refresh(time.time()))
+    return daily
@@ -0,0 +1,53 @@
+"""Shared fixtures for the backend test suite."""
+
+import pytest
+
+from app.core.config import settings
+from app.services.cache import CACHE_REGISTRY
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty in-process caches."""
+
+    for cache in CACHE_REGISTRY.values():
+        cache.clear()
+    yield
+
+
+class RecordingCollection:
+    """Collection stand-in that records write calls and serves configured documents."""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.documents = []
+
+    def __getattr__(self, name):
+        async def method(*args, **kwargs):
+            self.calls.append((name, args, kwargs))
+            if name == "find_one":
+                return self.documents[0] if self.documents else None
+            return None
+
+        return method
+
+
+class RecordingDatabase(dict):
+    def __missing__(self, name):
+        self[name] = RecordingCollection()
+        return self[name]
+
+
+@pytest.fixture
+def recording_mongo(monkeypatch):
+    """Route ``get_mongo_client`` in the given modules to in-memory recording collections."""
+
+    database = RecordingDatabase()
+
+    def install(*modules):
+        monkeypatch.setattr(settings, "mongo_connection_string", "mongodb://test")
+        for module in modules:
+            monkeypatch.setattr(module, "get_mongo_client", lambda: {settings.mongo_database: database})
+        return database
+
+    return install
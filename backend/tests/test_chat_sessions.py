@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from fastapi.testclient import TestClient
+
+from app.api.routes import chat as chat_routes
+from app.main import app
+from app.services import chat_sessions, openai_client
+
+
+class _SessionCollection:
+    """Single-session stand-in that applies the push, version check and pull used by chat sessions."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def find_one_and_update(self, query, update, return_document=None):
+        self.session["turns"].extend(update["$push"]["turns"]["$each"])
+        self.session.update(update["$set"])
+        return {**self.session, "turns": list(self.session["turns"])}
+
+    async def update_one(self, query, update):
+        if query["summary_version"] != self.session["summary_version"]:
+            return
+        pulled = set(update["$pull"]["turns"]["id"]["$in"])
+        self.session["turns"] = [turn for turn in self.session["turns"] if turn["id"] not in pulled]
+        self.session.update(update["$set"])
+        self.session["summary_version"] += update["$inc"]["summary_version"]
+
+
+@pytest.fixture
+def session_store(monkeypatch):
+    monkeypatch.setattr(chat_sessions.settings, "chat_history_window", 4)
+    monkeypatch.setattr(chat_sessions.settings, "chat_summary_batch", 2)
+    session = {"_id": ObjectId(), "summary": "", "summary_version": 0, "turns": []}
+    collection = _SessionCollection(session)
+    monkeypatch.setattr(chat_sessions, "_sessions_collection", lambda: collection)
+    summarized = []
+
+    async def summarize(summary, turns):
+        summarized.append(turns)
+        return f"{summary} +{len(turns)}".strip()
+
+    monkeypatch.setattr(chat_sessions, "summarize_conversation", summarize)
+    return session, summarized
+
+
+async def _record(session, count):
+    for number in range(count):
+        await chat_sessions.record_turn(session["_id"], f"question {number}", f"answer {number}")
+    await asyncio.gather(*list(chat_sessions._background_tasks))
+
+
+def test_turns_within_the_window_are_not_compressed(session_store):
+    session, summarized = session_store
+    asyncio.run(_record(session, 3))
+    assert summarized == []
+    assert len(session["turns"]) == 6
+
+
+def test_window_overflow_compresses_only_the_older_turns(session_store):
+    session, summarized = session_store
+    asyncio.run(_record(session, 4))
+
+    assert summarized == [
+        [
+            {"role": "user", "content": "question 0"},
+            {"role": "assistant", "content": "answer 0"},
+            {"role": "user", "content": "question 1"},
+            {"role": "assistant", "content": "answer 1"},
+        ]
+    ]
+    assert [turn["content"] for turn in session["turns"]] == ["question 2", "answer 2", "question 3", "answer 3"]
+    assert session["summary"] == "+4"
+    assert session["summary_version"] == 1
+
+
+def test_compression_that_loses_the_version_race_keeps_the_turns(session_store):
+    session, summarized = session_store
+    asyncio.run(_record(session, 3))
+    stale = {**session, "turns": list(session["turns"])}
+    session["summary_version"] = 1
+
+    asyncio.run(chat_sessions._compress_session(stale))
+    assert len(summarized) == 1
+    assert len(session["turns"]) == 6
+    assert session["summary"] == ""
+
+
+def test_model_summary_is_cut_to_the_configured_length(monkeypatch):
+    monkeypatch.setattr(openai_client.settings, "openai_api_key", "key")
+    monkeypatch.setattr(openai_client.settings, "chat_summary_max_chars", 40)
+
+    async def verbose(messages, **kwargs):
+        return {"choices": [{"message": {"content": "The traveler prefers trains " * 10}}]}
+
+    monkeypatch.setattr(openai_client, "_call_openai_chat", verbose)
+    summary = asyncio.run(openai_client.summarize_conversation("", [{"role": "user", "content": "hi"}]))
+    assert len(summary) <= 40
+    assert summary.endswith("…")
+
+
+def test_chat_with_an_unknown_session_returns_404(monkeypatch):
+    async def missing(session_id):
+        return None
+
+    monkeypatch.setattr(chat_routes, "get_chat_session", missing)
+    response = TestClient(app).post("/api/chat", json={"message": "hi", "session_id": str(ObjectId())})
+    assert response.status_code == 404
@@ -0,0 +1,67 @@
+import asyncio
+import json
+from datetime import date, timedelta
+
+from app.services import openai_client
+
+
+def _chunk_response(messages):
+    preferences = json.loads(messages[1]["content"])["trip_preferences"]
+    start = date.fromisoformat(preferences["start_date"])
+    end = date.fromisoformat(preferences["end_date"])
+    days = []
+    cursor = start
+    while cursor <= end:
+        days.append(
+            {
+                "date": cursor.isoformat(),
+                "activities": [
+                    {"name": f"Visit {cursor.isoformat()}", "description": "x", "category": "Explore"},
+                    {"name": "Old Town tour", "description": "x", "category": "Explore"},
+                ],
+            }
+        )
+        cursor += timedelta(days=1)
+    itinerary = {"destination": "Prague", "summary": f"Highlights from {start.isoformat()}.", "daily_plans": days}
+    return {"choices": [{"message": {"function_call": {"arguments": json.dumps(itinerary)}}}]}
+
+
+def test_chunks_are_sent_together_with_shared_constraints(monkeypatch):
+    monkeypatch.setattr(openai_client.settings, "openai_api_key", "key")
+    monkeypatch.setattr(openai_client.settings, "itinerary_chunk_threshold_days", 5)
+    monkeypatch.setattr(openai_client.settings, "itinerary_chunk_days", 3)
+    requests = []
+
+    async def fake_call(messages, **kwargs):
+        requests.append(messages)
+        # Every chunk must be in flight before any of them answers.
+        while len(requests) < 3:
+            await asyncio.sleep(0)
+        return _chunk_response(messages)
+
+    monkeypatch.setattr(openai_client, "_call_openai_chat", fake_call)
+    payload = {
+        "destination": "Prague",
+        "persona": "Historian",
+        "budget": "2000 EUR",
+        "start_date": "2026-09-01",
+        "end_date": "2026-09-08",
+    }
+    context = {"events": [{"title": "Jazz night", "start_time": "2026-09-05T20:00:00"}]}
+
+    itinerary = asyncio.run(openai_client.generate_itinerary(payload, context=context))
+
+    assert len(requests) == 3
+    constraints = [json.loads(messages[-1]["content"])["trip_constraints"] for messages in requests]
+    assert sorted(item["this_part"] for item in constraints) == [1, 2, 3]
+    for item in constraints:
+        assert item["budget"] == "2000 EUR"
+        assert item["persona"] == "Historian"
+        assert [part.get("events", []) for part in item["parts"]] == [[], ["Jazz night"], []]
+
+    assert len(itinerary["daily_plans"]) == 8
+    assert itinerary["fallback"] is False
+    for start in ("2026-09-01", "2026-09-04", "2026-09-07"):
+        assert f"Highlights from {start}." in itinerary["summary"]
+    later_names = [a["name"] for day in itinerary["daily_plans"][3:] for a in day["activities"]]
+    assert "Old Town tour" not in later_names
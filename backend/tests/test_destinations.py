@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+def test_suggest_returns_ranked_places():
+    response = TestClient(app).get("/api/destinations/suggest", params={"q": "par", "limit": 2})
+    assert response.status_code == 200
+    suggestions = response.json()["suggestions"]
+    assert len(suggestions) <= 2
+    assert suggestions[0] == {
+        "id": "paris-fr",
+        "name": "Paris",
+        "country": "France",
+        "country_code": "FR",
+        "label": "Paris, France",
+        "coordinates": {"lat": 48.8566, "lng": 2.3522},
+    }
+
+
+def test_suggest_validates_its_query():
+    client = TestClient(app)
+    assert client.get("/api/destinations/suggest", params={"q": ""}).status_code == 422
+    assert client.get("/api/destinations/suggest", params={"q": "par", "limit": 50}).status_code == 422
+    assert client.get("/api/destinations/suggest", params={"q": "zzzz"}).json() == {"suggestions": []}
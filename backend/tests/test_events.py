@@ -0,0 +1,57 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.services import events
+
+
+@pytest.fixture
+def ticketmaster(monkeypatch):
+    monkeypatch.setattr(events.settings, "mongo_connection_string", "")
+    monkeypatch.setattr(events.settings, "events_api_key", "key")
+    monkeypatch.setattr(events.settings, "events_page_size", 2)
+
+    def install(days, *, max_pages):
+        monkeypatch.setattr(events.settings, "events_max_pages", max_pages)
+        today = datetime.utcnow().date()
+        items = [
+            {"name": f"Show {index}", "dates": {"start": {"localDate": (today + timedelta(days=day)).isoformat()}}}
+            for index, day in enumerate(days)
+        ]
+        requested = []
+
+        def handler(request):
+            page = int(request.url.params["page"])
+            requested.append(page)
+            size = int(request.url.params["size"])
+            return httpx.Response(
+                200,
+                json={
+                    "_embedded": {"events": items[page * size : (page + 1) * size]},
+                    "page": {"totalPages": -(-len(items) // size)},
+                },
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return client, requested, today
+
+    return install
+
+
+def test_complete_horizon_keeps_the_configured_end(ticketmaster):
+    client, requested, today = ticketmaster([1, 2, 3], max_pages=5)
+    document = asyncio.run(events.refresh_city_events("Rome", client=client))
+    assert requested == [0, 1]
+    assert len(document["events"]) == 3
+    assert document["horizon_end"] == (today + timedelta(days=events.settings.events_horizon_days)).isoformat()
+
+
+def test_page_cap_shortens_the_horizon_to_fully_covered_days(ticketmaster):
+    client, requested, today = ticketmaster([1, 2, 5, 5, 5, 9], max_pages=2)
+    document = asyncio.run(events.refresh_city_events("Rome", client=client))
+    assert requested == [0, 1]
+    assert len(document["events"]) == 4
+    # Day 5 may continue on the unfetched page, so only days up to 4 are served from the store.
+    assert document["horizon_end"] == (today + timedelta(days=4)).isoformat()
@@ -0,0 +1,63 @@
+import asyncio
+
+from app.services import generation
+from app.services.openai_client import _fallback_itinerary
+
+PAYLOAD = {"destination": "Rome", "persona": "Foodie", "start_date": "2026-03-01", "end_date": "2026-03-02"}
+
+
+def _generator(itinerary, delay=0.0):
+    async def generate(payload, *, context):
+        await asyncio.sleep(delay)
+        return itinerary
+
+    return generate
+
+
+def _run_with_recorder(itinerary, monkeypatch, delay=0.0):
+    monkeypatch.setattr(generation, "generate_itinerary", _generator(itinerary, delay))
+    completed = []
+
+    async def on_complete(result):
+        completed.append(result)
+
+    result = asyncio.run(generation.generate_itinerary_within_slo(PAYLOAD, on_complete=on_complete))
+    return result, completed
+
+
+def test_on_complete_runs_for_model_results(monkeypatch):
+    model = {**_fallback_itinerary(PAYLOAD), "fallback": False}
+    result, completed = _run_with_recorder(model, monkeypatch)
+    assert result is model
+    assert completed == [model]
+
+
+def test_on_complete_skips_fallback_results(monkeypatch):
+    result, completed = _run_with_recorder(_fallback_itinerary(PAYLOAD), monkeypatch)
+    assert result["fallback"] is True
+    assert completed == []
+
+
+def test_shutdown_cancels_background_completions(monkeypatch, recording_mongo):
+    database = recording_mongo(generation)
+    monkeypatch.setattr(generation.settings, "openai_api_key", "key")
+    monkeypatch.setattr(generation.settings, "itinerary_latency_slo_seconds", 0.01)
+    monkeypatch.setattr(generation, "generate_itinerary", _generator({"fallback": False}, delay=10))
+    completed = []
+
+    async def on_complete(result):
+        completed.append(result)
+
+    async def run():
+        provisional = await generation.generate_itinerary_within_slo(PAYLOAD, on_complete=on_complete)
+        assert len(generation._background_tasks) == 1
+        await generation.shutdown_generations()
+        return provisional
+
+    provisional = asyncio.run(run())
+    assert provisional["provisional"] is True
+    assert not generation._background_tasks
+    assert completed == []
+    calls = database[generation.GENERATIONS_COLLECTION].calls
+    assert [name for name, _, _ in calls] == ["insert_one", "update_one"]
+    assert calls[1][1][1]["$set"]["status"] == "failed"
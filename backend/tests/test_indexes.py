@@ -0,0 +1,27 @@
+import asyncio
+import time
+
+from app.db import indexes
+
+
+class _SlowCollection:
+    def __init__(self, created):
+        self.created = created
+
+    async def create_index(self, keys, **options):
+        await asyncio.sleep(0.05)
+        self.created.append(keys)
+        if keys == [("created_at", 1)]:
+            raise indexes.PyMongoError("unreachable")
+
+
+def test_indexes_are_created_concurrently_and_failures_are_tolerated(monkeypatch):
+    created = []
+    database = {name: _SlowCollection(created) for name in {spec[0] for spec in indexes.INDEXES}}
+    monkeypatch.setattr(indexes, "get_mongo_client", lambda: {indexes.settings.mongo_database: database})
+
+    started = time.monotonic()
+    asyncio.run(indexes.ensure_indexes())
+    assert time.monotonic() - started < 0.05 * 3
+    assert len(created) == len(indexes.INDEXES)
+
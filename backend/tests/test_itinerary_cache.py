@@ -0,0 +1,43 @@
+import asyncio
+from datetime import date
+
+from app.services import itinerary_cache
+from app.services.openai_client import _fallback_itinerary
+
+PAYLOAD = {"destination": "Rome", "persona": "Foodie", "start_date": "2026-03-01", "end_date": "2026-03-03"}
+
+
+def _enable_cache(monkeypatch, recording_mongo):
+    monkeypatch.setattr(itinerary_cache.settings, "openai_api_key", "key")
+    return recording_mongo(itinerary_cache)[itinerary_cache.ITINERARY_CACHE_COLLECTION]
+
+
+def test_fingerprint_ignores_spelling_and_start_date():
+    moved = {**PAYLOAD, "destination": " rome, italy ", "start_date": "2026-04-01", "end_date": "2026-04-03"}
+    assert itinerary_cache.itinerary_fingerprint(PAYLOAD, {}) == itinerary_cache.itinerary_fingerprint(moved, {})
+    longer = {**PAYLOAD, "end_date": "2026-03-04"}
+    assert itinerary_cache.itinerary_fingerprint(PAYLOAD, {}) != itinerary_cache.itinerary_fingerprint(longer, {})
+
+
+def test_redate_shifts_days_and_activity_times():
+    itinerary = _fallback_itinerary(PAYLOAD)
+    moved = itinerary_cache.redate_itinerary(itinerary, date(2026, 4, 10))
+    assert [day["date"] for day in moved["daily_plans"]] == ["2026-04-10", "2026-04-11", "2026-04-12"]
+    assert moved["daily_plans"][1]["activities"][0]["start_time"].startswith("2026-04-11T")
+    assert moved["end_date"] == "2026-04-12"
+
+
+def test_model_results_are_cached(monkeypatch, recording_mongo):
+    collection = _enable_cache(monkeypatch, recording_mongo)
+    itinerary = {**_fallback_itinerary(PAYLOAD), "fallback": False}
+    asyncio.run(itinerary_cache.store_cached_itinerary(PAYLOAD, {}, itinerary))
+    assert [name for name, _, _ in collection.calls] == ["replace_one"]
+
+
+def test_fallback_and_provisional_results_are_not_cached(monkeypatch, recording_mongo):
+    collection = _enable_cache(monkeypatch, recording_mongo)
+    fallback = _fallback_itinerary(PAYLOAD)
+    provisional = {**fallback, "fallback": False, "provisional": True}
+    asyncio.run(itinerary_cache.store_cached_itinerary(PAYLOAD, {}, fallback))
+    asyncio.run(itinerary_cache.store_cached_itinerary(PAYLOAD, {}, provisional))
+    assert collection.calls == []
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+from app.services import openai_client
+from app.services.itinerary_patch import apply_itinerary_patch, patch_outline
+
+DATE = "2026-06-01"
+
+
+def _activity(name):
+    return {"name": name, "description": name, "category": "Explore"}
+
+
+def _itinerary(*names):
+    return {
+        "destination": "Kyoto",
+        "daily_plans": [
+            {"date": DATE, "activities": [_activity(name) for name in names]},
+            {"date": "2026-06-02", "activities": [_activity("Z")]},
+        ],
+    }
+
+
+def _names(itinerary, day=0):
+    return [activity["name"] for activity in itinerary["daily_plans"][day]["activities"]]
+
+
+def _op(op, index=None, name=None):
+    operation = {"op": op, "date": DATE, "index": index}
+    if name:
+        operation["activity"] = _activity(name)
+    return operation
+
+
+def test_removes_use_original_indices():
+    patched = apply_itinerary_patch(_itinerary("A", "B", "C", "D"), [_op("remove", 0), _op("remove", 1)])
+    assert _names(patched) == ["C", "D"]
+
+
+def test_add_does_not_shift_later_replace():
+    operations = [_op("add", 1, "N"), _op("replace", 2, "C2")]
+    patched = apply_itinerary_patch(_itinerary("A", "B", "C", "D"), operations)
+    assert _names(patched) == ["A", "N", "B", "C2", "D"]
+
+
+def test_mixed_operations_in_any_order():
+    operations = [
+        _op("replace", 3, "D2"),
+        _op("add", None, "End"),
+        _op("remove", 1),
+        _op("add", 0, "Start"),
+        _op("add", 2, "BeforeC"),
+        _op("remove", 2),
+    ]
+    patched = apply_itinerary_patch(_itinerary("A", "B", "C", "D"), operations)
+    assert _names(patched) == ["Start", "A", "BeforeC", "D2", "End"]
+
+
+def test_name_lookup_unknown_targets_and_untouched_days():
+    operations = [
+        {"op": "remove", "date": DATE, "activity": _activity("B")},
+        _op("replace", 9, "X"),
+        {"op": "remove", "date": "2030-01-01", "index": 0},
+    ]
+    original = _itinerary("A", "B", "C")
+    patched = apply_itinerary_patch(original, operations)
+    assert _names(patched) == ["A", "C"]
+    assert _names(patched, day=1) == ["Z"]
+    assert _names(original) == ["A", "B", "C"]
+
+
+def test_outline_indexes_match_patch_indices():
+    outline = patch_outline(_itinerary("A", "B"))
+    assert outline["days"][0]["activities"][1][:2] == [1, "B"]
+
+
+def test_repeated_customizations_replace_the_change_note(monkeypatch):
+    monkeypatch.setattr(openai_client.settings, "openai_api_key", "key")
+    notes = iter(["Added a tea ceremony.", "Swapped the museum for a garden."])
+
+    async def fake_chat(messages, **kwargs):
+        patch = {"operations": [], "summary_note": next(notes)}
+        return {"choices": [{"message": {"function_call": {"arguments": json.dumps(patch)}}}]}
+
+    monkeypatch.setattr(openai_client, "_call_openai_chat", fake_chat)
+    itinerary = {
+        **_itinerary("A"),
+        "start_date": DATE,
+        "end_date": "2026-06-02",
+        "persona": "Culture",
+        "summary": "Two days in Kyoto.",
+    }
+    for _ in range(2):
+        itinerary = asyncio.run(openai_client.adjust_itinerary(itinerary, "more culture", mode="patch"))
+
+    assert itinerary["summary"] == "Two days in Kyoto."
+    assert itinerary["change_note"] == "Swapped the museum for a garden."
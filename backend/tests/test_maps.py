@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services import maps
+
+
+@pytest.fixture
+def places_api(monkeypatch):
+    monkeypatch.setattr(maps.settings, "maps_api_key", "key")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {"name": "Pantheon", "geometry": {"location": {"lat": 41.8986, "lng": 12.4769}}},
+                ]
+            },
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), requests
+
+
+def test_coalesced_callers_get_independent_pins(places_api):
+    client, requests = places_api
+
+    async def fetch_twice():
+        return await asyncio.gather(
+            maps.fetch_map_points("Rome", ["Explore"], client=client),
+            maps.fetch_map_points("Rome", ["Explore"], client=client),
+        )
+
+    first, second = asyncio.run(fetch_twice())
+    assert len(requests) == 1
+    first[0]["coordinates"]["lat"] = 0.0
+    assert second[0]["coordinates"]["lat"] == 41.8986
+
+
+def test_changing_a_result_does_not_change_the_cache(places_api):
+    client, requests = places_api
+    pins = asyncio.run(maps.fetch_map_points("Rome", ["Explore"], client=client))
+    pins[0]["coordinates"]["lat"] = 0.0
+    pins[0]["name"] = "Changed"
+
+    cached = asyncio.run(maps.fetch_map_points("Rome", ["Explore"], client=client))
+    assert len(requests) == 1
+    assert cached[0]["name"] == "Pantheon"
+    assert cached[0]["coordinates"] == {"lat": 41.8986, "lng": 12.4769}
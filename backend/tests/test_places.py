@@ -0,0 +1,60 @@
+import pytest
+
+from app.services import places
+from app.services.places import fold, get_place_index, place_query, resolve_place
+
+
+@pytest.fixture(autouse=True)
+def fresh_resolution():
+    resolve_place.cache_clear()
+    yield
+    resolve_place.cache_clear()
+
+
+def test_fold_strips_case_accents_and_punctuation():
+    assert fold("  São   Paulo! ") == "sao paulo"
+    assert fold("ZÜRICH") == "zurich"
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Paris", "paris", "Paris, FR", "Paris, France", "Paris France", "City of Light", "Pariss"],
+)
+def test_spellings_of_paris_resolve_to_one_place(text):
+    assert resolve_place(text).id == "paris-fr"
+
+
+def test_aliases_and_accents_resolve():
+    assert resolve_place("München").id == "munich-de"
+    assert resolve_place("Muenchen, Germany").id == "munich-de"
+    assert resolve_place("NYC").id == "new-york-us"
+    assert resolve_place("Zürich").id == "zurich-ch"
+
+
+def test_conflicting_or_unverifiable_qualifiers_do_not_resolve():
+    assert resolve_place("Paris, Germany") is None
+    assert resolve_place("Paris, Texas") is None
+    assert resolve_place("Atlantis") is None
+    assert resolve_place("") is None
+
+
+def test_country_aliases_are_understood():
+    assert resolve_place("London, UK").id == "london-gb"
+    assert resolve_place("Portland USA").id == "portland-us"
+
+
+def test_place_query_uses_the_canonical_label(monkeypatch):
+    assert place_query("new york city") == "New York, United States"
+    assert place_query("  Some   Village ") == "Some Village"
+    monkeypatch.setattr(places.settings, "places_index_enabled", False)
+    resolve_place.cache_clear()
+    assert resolve_place("Paris") is None
+
+
+def test_suggest_ranks_name_starts_before_later_words():
+    index = get_place_index()
+    assert index.suggest("par", 3)[0].id == "paris-fr"
+    assert [place.id for place in index.suggest("york", 5)] == ["new-york-us"]
+    assert index.suggest("sao p", 5)[0].id == "sao-paulo-br"
+    assert index.suggest("!!", 5) == []
+    assert len(index.suggest("s", 4)) == 4
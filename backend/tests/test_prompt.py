@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services import prompt
+
+
+@pytest.fixture(autouse=True)
+def heuristic_tokens(monkeypatch):
+    monkeypatch.setattr(prompt, "_ENCODING", None)
+
+
+def _document(count):
+    return {
+        "destination": "Rome",
+        "events": [{"title": f"Event {index}", "description": "x" * 80} for index in range(count)],
+        "weather": [{"date": f"2026-03-{index + 1:02d}", "summary": "sunny"} for index in range(10)],
+    }
+
+
+def test_trims_events_before_weather_to_fit_the_budget():
+    full = prompt.build_user_content(_document(40), budget=100_000)
+    trimmed = prompt.build_user_content(_document(40), budget=prompt.estimate_tokens(full) // 2)
+    assert prompt.estimate_tokens(trimmed) <= prompt.estimate_tokens(full) // 2
+    assert '"Event 0"' in trimmed and '"Event 39"' not in trimmed
+    assert trimmed.count('"sunny"') == 10
+
+
+def test_whole_document_is_serialized_at_most_twice(monkeypatch):
+    serialized = []
+    compact_json = prompt.compact_json
+
+    def counting(value):
+        if isinstance(value, dict) and "destination" in value:
+            serialized.append(value)
+        return compact_json(value)
+
+    monkeypatch.setattr(prompt, "compact_json", counting)
+    prompt.build_user_content(_document(200), budget=50)
+    assert len(serialized) == 2
+
+
+def test_encoding_loads_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def load():
+        threads.append(threading.current_thread())
+        return "encoding"
+
+    monkeypatch.setattr(prompt, "_load_encoding", load)
+    asyncio.run(prompt.load_encoding())
+    assert prompt._ENCODING == "encoding"
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import resilience
+from app.services.resilience import CircuitBreaker, CircuitOpenError, RateLimiter, send_with_resilience
+
+
+@pytest.fixture(autouse=True)
+def fresh_policies(monkeypatch):
+    monkeypatch.setattr(resilience.settings, "openai_max_retries", 2)
+    monkeypatch.setattr(resilience.settings, "openai_backoff_base_seconds", 0.0)
+    monkeypatch.setattr(resilience.settings, "openai_backoff_max_seconds", 0.0)
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60.0)
+    monkeypatch.setattr(resilience, "openai_breaker", breaker)
+    monkeypatch.setattr(
+        resilience, "openai_limiter", RateLimiter(requests_per_minute=10_000, tokens_per_minute=10_000_000)
+    )
+    return breaker
+
+
+def _responder(*statuses, calls=None):
+    statuses = list(statuses)
+
+    async def send():
+        if calls is not None:
+            calls.append(1)
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        return httpx.Response(status, request=httpx.Request("POST", "https://api.openai.com"))
+
+    return send
+
+
+def _force_half_open(breaker):
+    breaker.failures = breaker.failure_threshold
+    breaker.opened_at = time.monotonic() - breaker.reset_timeout
+
+
+def test_retryable_statuses_are_retried_until_success(fresh_policies):
+    calls = []
+    response = asyncio.run(send_with_resilience(_responder(503, 429, 200, calls=calls), estimated_tokens=10))
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert fresh_policies.failures == 0
+
+
+def test_client_errors_are_not_retried_and_count_as_healthy(fresh_policies):
+    calls = []
+    fresh_policies.failures = 2
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(send_with_resilience(_responder(400, calls=calls), estimated_tokens=10))
+    assert len(calls) == 1
+    assert fresh_policies.failures == 0
+
+
+def test_one_failure_is_counted_per_call_not_per_attempt(fresh_policies):
+    calls = []
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(send_with_resilience(_responder(500, calls=calls), estimated_tokens=10))
+    assert len(calls) == 3
+    assert fresh_policies.failures == 1
+    assert fresh_policies.state == "closed"
+
+
+def test_circuit_opens_after_threshold_and_rejects_calls(fresh_policies):
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            asyncio.run(send_with_resilience(_responder(500), estimated_tokens=10))
+    assert fresh_policies.state == "open"
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(send_with_resilience(_responder(200, calls=calls), estimated_tokens=10))
+    assert calls == []
+
+
+def test_transport_errors_are_retried_then_raised(fresh_policies):
+    attempts = []
+
+    async def send():
+        attempts.append(1)
+        raise httpx.ConnectError("refused")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(send_with_resilience(send, estimated_tokens=10))
+    assert len(attempts) == 3
+    assert fresh_policies.failures == 1
+
+
+def test_half_open_trial_admits_one_call_and_closes_on_success(fresh_policies):
+    _force_half_open(fresh_policies)
+    assert fresh_policies.allow() is True
+    assert fresh_policies.allow() is False
+    fresh_policies.release_trial()
+
+    response = asyncio.run(send_with_resilience(_responder(200), estimated_tokens=10))
+    assert response.status_code == 200
+    assert fresh_policies.state == "closed"
+
+
+def test_failed_trial_reopens_the_circuit(fresh_policies):
+    _force_half_open(fresh_policies)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(send_with_resilience(_responder(503), estimated_tokens=10))
+    assert fresh_policies.state == "open"
+
+
+def test_cancelled_trial_frees_the_trial_slot(fresh_policies):
+    _force_half_open(fresh_policies)
+
+    async def slow_send():
+        await asyncio.sleep(10)
+
+    async def cancel_trial():
+        task = asyncio.create_task(send_with_resilience(slow_send, estimated_tokens=10))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_trial())
+    assert fresh_policies.state == "half-open"
+    assert fresh_policies.allow() is True
+
+
+def test_rate_limiter_waits_for_budget(monkeypatch):
+    limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+
+    async def burst():
+        started = time.monotonic()
+        for _ in range(602):
+            await limiter.acquire(1)
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(burst())
+    assert limiter.throttled >= 1
+    assert 0.1 <= elapsed < 1.0
+
+
+def test_rate_limit_headers_pause_new_calls():
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+    limiter.update(httpx.Headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1.5s"}))
+    assert 1.0 < limiter.blocked_until - time.monotonic() <= 1.5
+    assert resilience._parse_duration("6m0s") == 360.0
+    assert resilience._parse_duration("20ms") == 0.02
@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from app.services import routing
+from app.services.routing import activity_key, optimize_day_route, order_stops, travel_time_matrix
+
+
+def _line(count):
+    """Return a matrix for stops one minute apart along a straight line."""
+
+    positions = np.arange(count, dtype=float)
+    return np.abs(positions[:, None] - positions[None, :])
+
+
+def _route_length(matrix, order):
+    return sum(matrix[a, b] for a, b in zip(order, order[1:]))
+
+
+def _activity(name, lng, **extra):
+    return {"name": name, "category": "Explore", "coordinates": {"lat": 38.7, "lng": lng}, **extra}
+
+
+def test_travel_time_matrix_scales_great_circle_distance(monkeypatch):
+    monkeypatch.setattr(routing.settings, "routing_detour_factor", 1.0)
+    monkeypatch.setattr(routing.settings, "routing_speed_kmh", 60.0)
+    matrix = travel_time_matrix(np.array([[48.8566, 2.3522], [51.5074, -0.1278]]))
+    assert matrix[0, 0] == 0.0
+    assert matrix[0, 1] == pytest.approx(matrix[1, 0])
+    # Paris to London is about 344 km, i.e. 344 minutes at 60 km/h.
+    assert matrix[0, 1] == pytest.approx(344, abs=3)
+
+
+def test_free_stops_are_ordered_along_the_shortest_path():
+    matrix = _line(6)
+    scrambled = [0, 4, 1, 5, 2, 3]
+    shuffled = matrix[np.ix_(scrambled, scrambled)]
+    order = order_stops(shuffled, [False] * 6)
+    assert _route_length(shuffled, order) == pytest.approx(5.0)
+    assert sorted(order) == list(range(6))
+
+
+def test_two_opt_removes_a_crossing():
+    points = np.array([[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]])
+    matrix = np.sqrt(((points[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+    padded = np.zeros((5, 5))
+    padded[:4, :4] = matrix
+    improved = routing._two_opt([0, 3, 1, 2], padded, 4, 4)
+    assert _route_length(matrix, improved) < _route_length(matrix, [0, 3, 1, 2])
+
+
+def test_anchored_stops_keep_their_positions():
+    matrix = _line(5)
+    anchored = [False, False, True, False, False]
+    order = order_stops(matrix[np.ix_([4, 0, 2, 3, 1], [4, 0, 2, 3, 1])], anchored)
+    assert order[2] == 2
+    assert sorted(order) == list(range(5))
+
+
+def test_flexible_activities_are_reordered_around_anchors():
+    day = {
+        "date": "2026-05-01",
+        "activities": [
+            _activity("Far west", -9.30),
+            _activity("Far east", -9.00),
+            _activity("Lunch", -9.10, category="Eat"),
+            _activity("Middle", -9.15),
+            _activity("West", -9.25),
+        ],
+    }
+    optimize_day_route(day, destination="Lisbon")
+    names = [activity["name"] for activity in day["activities"]]
+    assert names[2] == "Lunch"
+    assert names == ["Far west", "West", "Lunch", "Middle", "Far east"]
+    assert day["travel_minutes"] > 0
+
+
+def test_timed_zig_zag_day_is_shortened_and_keeps_its_slots():
+    slots = [(f"2026-05-01T{hour:02d}:00:00", f"2026-05-01T{hour + 1:02d}:30:00") for hour in (9, 11, 13)]
+    slots.append(("2026-05-01T15:00:00", "2026-05-01T16:30:00"))
+    stops = [("A", -9.30), ("B", -9.00), ("C", -9.28), ("D", -9.02)]
+    day = {
+        "date": "2026-05-01",
+        "activities": [
+            _activity(name, lng, start_time=start, end_time=end)
+            for (name, lng), (start, end) in zip(stops, slots)
+        ],
+    }
+    matrix = travel_time_matrix(np.array([[38.7, lng] for _, lng in stops]))
+    planned_minutes = _route_length(matrix, [0, 1, 2, 3])
+
+    optimize_day_route(day, destination="Lisbon")
+    names = [activity["name"] for activity in day["activities"]]
+    assert names in (["A", "C", "D", "B"], ["B", "D", "C", "A"])
+    assert day["travel_minutes"] < planned_minutes / 2
+    assert [(a["start_time"], a["end_time"]) for a in day["activities"]] == slots
+
+
+def test_timed_events_keep_their_time_and_position():
+    events = [
+        {"title": "Fado show", "start_time": "2026-05-01T13:00:00", "coordinates": {"lat": 38.7, "lng": -9.0}}
+    ]
+    day = {
+        "date": "2026-05-01",
+        "activities": [
+            _activity("A", -9.30, start_time="2026-05-01T09:00:00"),
+            _activity("B", -9.00, start_time="2026-05-01T11:00:00"),
+            _activity("Fado show", -9.00, start_time="2026-05-01T13:00:00"),
+            _activity("C", -9.28, start_time="2026-05-01T15:00:00"),
+        ],
+    }
+    optimize_day_route(day, destination="Lisbon", events=events)
+    assert day["activities"][2]["name"] == "Fado show"
+    assert day["activities"][2]["start_time"] == "2026-05-01T13:00:00"
+
+
+def test_unplaced_activities_route_from_the_destination_without_being_pinned():
+    day = {
+        "date": "2026-05-01",
+        "activities": [_activity("Belem", -9.21), {"name": "Somewhere", "category": "Explore"}],
+    }
+    optimize_day_route(day, destination="Lisbon")
+    assert "coordinates" not in day["activities"][1]
+    assert day["travel_minutes"] is not None
+
+
+def test_routing_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(routing.settings, "routing_enabled", False)
+    day = {"date": "2026-05-01", "activities": [_activity("East", -9.0), _activity("West", -9.3)]}
+    optimize_day_route(day, destination="Lisbon")
+    assert "travel_minutes" not in day
+
+
+def test_activity_key_ignores_case_and_spacing():
+    assert activity_key("  Old  Town tour ") == activity_key("old town TOUR") == "old town tour"
+    assert activity_key(None) == ""
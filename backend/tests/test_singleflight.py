@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight("test-shared")
+    started = []
+
+    async def lookup():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    async def run():
+        return await asyncio.gather(*(group.do("key", lookup) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert started == [1]
+    assert all(result == {"value": 42} for result in results)
+    assert group.stats() == {"calls": 5, "coalesced": 4, "in_flight": 0}
+
+
+def test_distinct_keys_run_separately_and_errors_reach_every_waiter():
+    group = SingleFlight("test-errors")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(
+            group.do("a", failing), group.do("a", failing), group.do("b", failing), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert group.stats()["coalesced"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    group = SingleFlight("test-cancel")
+
+    async def lookup():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(group.do("key", lookup))
+        second = asyncio.create_task(group.do("key", lookup))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+
+from app.services import storage
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self._documents = documents
+
+    def sort(self, field, direction):
+        self._documents.sort(key=lambda document: document[field], reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self._documents = self._documents[:count]
+        return self
+
+    async def to_list(self, length):
+        return self._documents[:length]
+
+
+class _TripCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection=None):
+        bound = query.get("_id", {}).get("$lt")
+        matches = [
+            {key: value for key, value in document.items() if projection is None or key in {"_id", *projection}}
+            for document in self.documents
+            if document["user_id"] == query["user_id"] and (bound is None or document["_id"] < bound)
+        ]
+        return _Cursor(matches)
+
+
+@pytest.fixture
+def trips(monkeypatch):
+    documents = [
+        {"_id": ObjectId(), "user_id": "ana", "destination": f"City {index}", "daily_plans": []}
+        for index in range(7)
+    ]
+    documents.append({"_id": ObjectId(), "user_id": "bo", "destination": "Elsewhere", "daily_plans": []})
+    collection = _TripCollection(documents)
+    client = {storage.settings.mongo_database: {"itineraries": collection}}
+    monkeypatch.setattr(storage, "get_mongo_client", lambda: client)
+    return documents
+
+
+def test_keyset_pages_cover_history_newest_first_without_repeats(trips):
+    async def walk():
+        pages, cursor = [], None
+        while True:
+            page = await storage.list_itinerary_page("ana", limit=3, cursor=cursor)
+            pages.append(page["trips"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return pages
+
+    pages = asyncio.run(walk())
+    assert [len(page) for page in pages] == [3, 3, 1]
+    destinations = [trip["destination"] for page in pages for trip in page]
+    assert destinations == [f"City {index}" for index in reversed(range(7))]
+    assert "daily_plans" not in pages[0][0]
+
+
+def test_exact_final_page_has_no_cursor(trips):
+    page = asyncio.run(storage.list_itinerary_page("ana", limit=7))
+    assert len(page["trips"]) == 7
+    assert page["next_cursor"] is None
+
+
+def test_full_documents_and_invalid_cursor(trips):
+    page = asyncio.run(storage.list_itinerary_page("ana", limit=1, full=True))
+    assert page["trips"][0]["daily_plans"] == []
+    with pytest.raises(ValueError):
+        asyncio.run(storage.list_itinerary_page("ana", limit=1, cursor="not-an-id"))
+
+
+class _BulkCollection:
+    """Simulates a concurrent writer that inserted ``raced`` trips just before this bulk write."""
+
+    def __init__(self, raced):
+        self.raced = set(raced)
+        self.ids = {}
+        self.batches = []
+
+    async def bulk_write(self, operations, ordered):
+        self.batches.append(len(operations))
+        details = {"upserted": [], "writeErrors": []}
+        for index, operation in enumerate(operations):
+            document = operation._doc
+            if isinstance(operation, storage.InsertOne):
+                continue
+            key = (operation._filter["user_id"], operation._filter["trip_id"])
+            if key in self.raced:
+                self.raced.discard(key)
+                self.ids[key] = ObjectId()
+                details["writeErrors"].append({"index": index, "code": 11000, "errmsg": "E11000 duplicate key"})
+            elif key not in self.ids:
+                self.ids[key] = ObjectId()
+                details["upserted"].append({"index": index, "_id": self.ids[key]})
+            assert "$set" in document
+        if details["writeErrors"]:
+            raise storage.BulkWriteError(details)
+        return type("Result", (), {"bulk_api_result": details})()
+
+
+def test_bulk_save_retries_races_and_reports_keys_per_item(monkeypatch):
+    collection = _BulkCollection(raced=[("ana", "raced")])
+    collection.ids[("ana", "known")] = ObjectId()
+    client = {storage.settings.mongo_database: {"itineraries": collection}}
+    monkeypatch.setattr(storage, "get_mongo_client", lambda: client)
+
+    items = [
+        {"user_id": "ana", "trip_id": "new"},
+        "not an itinerary",
+        {"user_id": "ana", "trip_id": "raced"},
+        {"user_id": "ana", "trip_id": "known"},
+        {"user_id": "ana"},
+    ]
+    statuses = asyncio.run(storage.bulk_save_itineraries(items))
+
+    assert collection.batches == [4, 1]
+    assert [status["status"] for status in statuses] == ["created", "error", "updated", "updated", "created"]
+    assert statuses[1]["index"] == 1
+    assert statuses[0]["itinerary_id"] == str(collection.ids[("ana", "new")])
+    assert statuses[4]["itinerary_id"]
+    for status in statuses[2:4]:
+        assert (status["user_id"], status["trip_id"]) in collection.ids
+        assert "itinerary_id" not in status
+
+
+def test_save_retries_a_duplicate_key_race(monkeypatch):
+    saved_id = ObjectId()
+    attempts = []
+
+    class _Collection:
+        async def find_one_and_update(self, *args, **kwargs):
+            attempts.append(args[0])
+            if len(attempts) == 1:
+                raise storage.DuplicateKeyError("E11000 duplicate key")
+            return {"_id": saved_id}
+
+    client = {storage.settings.mongo_database: {"itineraries": _Collection()}}
+    monkeypatch.setattr(storage, "get_mongo_client", lambda: client)
+
+    assert asyncio.run(storage.save_itinerary({"user_id": "ana", "trip_id": "t1"})) == str(saved_id)
+    assert len(attempts) == 2
@@ -0,0 +1,46 @@
+from fastapi.testclient import TestClient
+
+from app.api.routes import storage
+from app.main import app
+
+
+def test_export_filename_is_header_safe(monkeypatch):
+    async def one_trip(**filters):
+        yield {"id": "1", "user_id": filters["user_id"]}
+
+    monkeypatch.setattr(storage, "iter_itineraries", one_trip)
+    response = TestClient(app).get("/api/export/trips/a%22b%0D%0AX:%20y")
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="trips-a_b_X_y.ndjson"'
+    assert response.text.count("\n") == 1
+
+
+def test_plain_user_ids_are_unchanged():
+    assert storage._safe_filename_part("user-42.test") == "user-42.test"
+    assert storage._safe_filename_part("../") == "user"
+
+
+def _all_trips(monkeypatch):
+    async def every_trip(**filters):
+        yield {"id": "1", "user_id": "ana"}
+
+    monkeypatch.setattr(storage, "iter_itineraries", every_trip)
+
+
+def test_all_users_export_is_hidden_without_a_token(monkeypatch):
+    _all_trips(monkeypatch)
+    monkeypatch.setattr(storage.settings, "export_admin_token", "")
+    assert TestClient(app).get("/api/export/trips").status_code == 404
+
+
+def test_all_users_export_requires_the_admin_token(monkeypatch):
+    _all_trips(monkeypatch)
+    monkeypatch.setattr(storage.settings, "export_admin_token", "nightly-secret")
+    client = TestClient(app)
+    assert client.get("/api/export/trips").status_code == 403
+    assert client.get("/api/export/trips", headers={"Authorization": "Bearer wrong"}).status_code == 403
+
+    response = client.get("/api/export/trips", headers={"Authorization": "Bearer nightly-secret"})
+    assert response.status_code == 200
+    assert response.text == '{"id": "1", "user_id": "ana"}\n'
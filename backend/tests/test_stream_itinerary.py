@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from app.services import openai_client
+
+
+def _model_itinerary():
+    stops = [
+        ("Belem Tower", 38.6916, -9.2160),
+        ("Alfama walk", 38.7115, -9.1300),
+        ("Jeronimos Monastery", 38.6979, -9.2068),
+        ("Castelo de Sao Jorge", 38.7139, -9.1335),
+    ]
+    return {
+        "destination": "Lisbon",
+        "summary": "Lisbon highlights",
+        "daily_plans": [
+            {
+                "date": "2026-05-01",
+                "activities": [
+                    {
+                        "name": name,
+                        "description": name,
+                        "category": "Explore",
+                        "start_time": f"2026-05-01T{9 + 2 * index:02d}:00:00",
+                        "coordinates": {"lat": lat, "lng": lng},
+                    }
+                    for index, (name, lat, lng) in enumerate(stops)
+                ],
+            }
+        ],
+    }
+
+
+def test_streamed_days_match_the_final_itinerary(monkeypatch):
+    monkeypatch.setattr(openai_client.settings, "openai_api_key", "key")
+    arguments = json.dumps(_model_itinerary())
+
+    async def fake_stream(*args, **kwargs):
+        for start in range(0, len(arguments), 40):
+            yield {"function_call": {"arguments": arguments[start : start + 40]}}
+
+    monkeypatch.setattr(openai_client, "_stream_openai_chat", fake_stream)
+
+    async def collect():
+        payload = {"destination": "Lisbon", "persona": "Explorer", "start_date": "2026-05-01"}
+        return [item async for item in openai_client.stream_itinerary(payload, context={})]
+
+    results = asyncio.run(collect())
+    days = [data for kind, data in results if kind == "day"]
+    kind, final = results[-1]
+    assert kind == "itinerary"
+    assert len(days) == 1
+    streamed = [activity.name for activity in days[0].activities]
+    assert streamed == [activity["name"] for activity in final["daily_plans"][0]["activities"]]
+    assert streamed != [activity["name"] for activity in _model_itinerary()["daily_plans"][0]["activities"]]
+    assert days[0].travel_minutes == final["daily_plans"][0]["travel_minutes"]
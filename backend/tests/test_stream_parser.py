@@ -0,0 +1,62 @@
+import json
+
+from app.services.stream_parser import JSONArrayItemStream
+
+DOCUMENT = json.dumps(
+    {
+        "destination": "Lisbon",
+        "summary": 'Days with "quotes", {braces} and [brackets]',
+        "daily_plans": [
+            {"date": "2026-05-01", "activities": [{"name": "Tram 28 \\\\ ride", "tags": ["a", "b"]}]},
+            {"date": "2026-05-02", "activities": []},
+        ],
+        "notes": [{"ignored": True}],
+    }
+)
+
+
+def _feed_in_chunks(size):
+    parser = JSONArrayItemStream("daily_plans")
+    items = []
+    for start in range(0, len(DOCUMENT), size):
+        items.extend(parser.feed(DOCUMENT[start : start + size]))
+    return parser, items
+
+
+def test_items_are_emitted_whole_for_any_chunking():
+    expected = [json.dumps(day) for day in json.loads(DOCUMENT)["daily_plans"]]
+    for size in (1, 3, 7, len(DOCUMENT)):
+        parser, items = _feed_in_chunks(size)
+        assert items == expected
+        assert parser.text == DOCUMENT
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    parser = JSONArrayItemStream("daily_plans")
+    assert parser.feed('{"daily_plans": [{"date": "2026-05-01"}') == ['{"date": "2026-05-01"}']
+    assert parser.feed(', {"date": "2026-05-02", "x": "}"') == []
+    assert parser.feed("}]}") == ['{"date": "2026-05-02", "x": "}"}']
+
+
+def test_other_arrays_and_nested_keys_are_ignored():
+    parser = JSONArrayItemStream("daily_plans")
+    document = '{"meta": {"daily_plans": [{"nested": 1}]}, "daily_plans": [{"top": 2}]}'
+    assert parser.feed(document) == ['{"top": 2}']
+
+
+def test_consumed_text_is_not_retained():
+    parser = JSONArrayItemStream("daily_plans")
+    parser.feed('{"summary": "' + "x" * 10_000 + '", "daily_plans": [')
+    for _ in range(100):
+        parser.feed('{"date": "2026-05-01"},')
+    assert sum(map(len, parser._pending)) < 100
+
+
+def test_open_item_is_joined_once_when_it_completes():
+    parser = JSONArrayItemStream("daily_plans")
+    parser.feed('{"daily_plans": [{"name": "')
+    for _ in range(1000):
+        assert parser.feed("ab") == []
+    assert len(parser._pending) == 1001
+    assert parser.feed('"}]}') == ['{"name": "' + "ab" * 1000 + '"}']
+    assert parser._pending == []
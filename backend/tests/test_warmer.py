@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app.services import warmer
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = warmer.DestinationPopularity()
+    monkeypatch.setattr(warmer, "popularity", tracker)
+    return tracker
+
+
+def test_destinations_are_not_tracked_when_the_warmer_is_disabled(monkeypatch, tracker):
+    monkeypatch.setattr(warmer.settings, "warmer_enabled", False)
+    warmer.record_destination("Rome")
+    assert len(tracker) == 0
+
+    monkeypatch.setattr(warmer.settings, "warmer_enabled", True)
+    warmer.record_destination("Rome")
+    assert len(tracker) == 1
+
+
+def test_tracker_evicts_the_least_requested_destination(monkeypatch, tracker):
+    monkeypatch.setattr(warmer.settings, "warmer_max_tracked_destinations", 2)
+    for destination in ["Rome", "Rome", "Paris", "Paris", "Paris", "Oslo"]:
+        tracker.record(destination)
+    tracker.record("Lima")
+
+    assert len(tracker) == 2
+    assert tracker.top(5) == ["Paris, France", "Lima, Peru"]
+
+
+def test_zero_refresh_rate_disables_spacing(monkeypatch, tracker):
+    monkeypatch.setattr(warmer.settings, "warmer_refreshes_per_minute", 0.0)
+    monkeypatch.setattr(warmer.settings, "warmer_seed_destinations", ["Rome"])
+    monkeypatch.setattr(warmer.settings, "weather_api_key", "key")
+    refreshed = []
+
+    async def warm(destination):
+        refreshed.append(destination)
+        return True
+
+    monkeypatch.setattr(warmer, "warm_weather_forecast", warm)
+    cache_warmer = warmer.CacheWarmer()
+    asyncio.run(cache_warmer.run_once())
+    assert refreshed == ["Rome"]
+    assert cache_warmer.refreshed == 1
@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+
+from app.services import weather
+
+
+def _geocoder(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json=[])
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_unknown_destination_is_negatively_cached(monkeypatch):
+    monkeypatch.setattr(weather.settings, "weather_api_key", "key")
+    calls = []
+
+    async def resolve_twice():
+        async with _geocoder(calls) as client:
+            first = await weather._resolve_coordinates(client, "Atlantis Nowhere")
+            second = await weather._resolve_coordinates(client, "atlantis  nowhere")
+        return first, second
+
+    assert asyncio.run(resolve_twice()) == (None, None)
+    assert len(calls) == 1
+
+
+def test_forecast_refresh_follows_next_issue():
+    period = weather.FORECAST_ISSUE_PERIOD_SECONDS
+    grace = weather.settings.forecast_cache_grace_seconds
+    issue = 100 * period
+
+    assert weather._next_forecast_refresh(issue + grace + 1) == issue + period + grace
+    assert weather._next_forecast_refresh(issue - 1) == issue + grace
+
+
+def test_fetch_inside_grace_window_expires_when_new_issue_is_available():
+    period = weather.FORECAST_ISSUE_PERIOD_SECONDS
+    grace = weather.settings.forecast_cache_grace_seconds
+    issue = 100 * period
+
+    assert weather._next_forecast_refresh(issue + grace / 2) == issue + grace
+
+
+def _forecast_payload():
+    day = 24 * 3600
+    base = 1_767_225_600  # 2026-01-01T00:00:00Z
+    return {
+        "list": [
+            {"dt": base + offset * day, "main": {"temp": 10 + offset}, "weather": [{"main": "Clear"}]}
+            for offset in range(5)
+        ]
+    }
+
+
+def test_concurrent_windows_share_one_forecast_fetch(monkeypatch):
+    monkeypatch.setattr(weather.settings, "weather_api_key", "key")
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=_forecast_payload())
+
+    async def fetch_windows():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            return await asyncio.gather(
+                weather.fetch_weather_forecast("Paris", "2026-01-01", "2026-01-02", client=client),
+                weather.fetch_weather_forecast("paris, fr", "2026-01-03", "2026-01-05", client=client),
+            )
+
+    first, second = asyncio.run(fetch_windows())
+    assert calls == ["/data/2.5/forecast"]
+    assert [day["date"] for day in first] == ["2026-01-01", "2026-01-02"]
+    assert [day["date"] for day in second] == ["2026-01-03", "2026-01-04", "2026-01-05"]
+
+    first[0]["condition"] = "Snow"
+    again = asyncio.run(weather.fetch_weather_forecast("Paris", "2026-01-01", "2026-01-01"))
+    assert again[0]["condition"] == "Clear"